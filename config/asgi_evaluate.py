@@ -0,0 +1,35 @@
+"""
+ASGI config for evaluation-only processes.
+
+Serves ``config.urls_evaluate`` and the evaluation websocket with the
+trimmed ``config.settings.evaluate`` profile, e.g.::
+
+    uvicorn config.asgi_evaluate:application
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "rule_engine_api"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.evaluate")
+
+django_application = get_asgi_application()
+
+# Import websocket application here, so apps from django_application are loaded first
+from config.websocket import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http":
+        await django_application(scope, receive, send)
+    elif scope["type"] == "websocket":
+        await websocket_application(scope, receive, send)
+    else:
+        msg = f"Unknown scope type {scope['type']}"
+        raise NotImplementedError(msg)
@@ -48,6 +48,13 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Optional read replica, used for evaluation and rule listing.
+if env("DATABASE_REPLICA_URL", default=""):
+    DATABASES["replica"] = env.db("DATABASE_REPLICA_URL")
+RULES_READ_DATABASE = "replica" if "replica" in DATABASES else "default"
+# Seconds reads stay on the primary after a rule write.
+RULES_REPLICA_LAG = env.int("RULES_REPLICA_LAG", default=5)
+DATABASE_ROUTERS = ["rule_engine_api.rules.routers.ReplicaRouter"]
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -338,6 +345,13 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+# https://django-rest-framework-simplejwt.readthedocs.io/en/latest/settings.html
+SIMPLE_JWT = {
+    # Embeds the role so evaluation can authorize without loading the user.
+    "TOKEN_OBTAIN_SERIALIZER": "rule_engine_api.users.api.serializers.RoleTokenObtainPairSerializer",
+}
+# Seconds a process trusts its copy of a user's token revocation mark.
+AUTH_REVOCATION_CACHE_TTL = env.int("AUTH_REVOCATION_CACHE_TTL", default=5)
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
@@ -353,3 +367,47 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Rules engine
+# ------------------------------------------------------------------------------
+# Decisions are cached in the default cache (Redis in production) per ruleset
+# version and payload, concurrent identical requests wait for the first one.
+RULES_DECISION_CACHE_ENABLED = env.bool("RULES_DECISION_CACHE_ENABLED", default=True)
+# Seconds a decision stays cached.
+RULES_DECISION_CACHE_TIMEOUT = env.int("RULES_DECISION_CACHE_TIMEOUT", default=30)
+# Seconds a request waits for an identical in-flight request before computing.
+RULES_DECISION_CACHE_WAIT = env.float("RULES_DECISION_CACHE_WAIT", default=0.5)
+# Fail-fast evaluation runs the cheapest, most often failing rules first,
+# from failure rates over the latest RULES_STATS_SAMPLE_SIZE audited
+# decisions. They are recomputed every RULES_STATS_TIMEOUT seconds by a
+# beat task and re-read from the cache by each process every
+# RULES_STATS_LOCAL_TIMEOUT; requests never compute them.
+RULES_STATS_SAMPLE_SIZE = env.int("RULES_STATS_SAMPLE_SIZE", default=10_000)
+RULES_STATS_TIMEOUT = env.int("RULES_STATS_TIMEOUT", default=600)
+RULES_STATS_LOCAL_TIMEOUT = env.int("RULES_STATS_LOCAL_TIMEOUT", default=60)
+CELERY_BEAT_SCHEDULE = {
+    "refresh-rule-failure-rates": {
+        "task": "rule_engine_api.rules.tasks.refresh_failure_rates_task",
+        "schedule": RULES_STATS_TIMEOUT,
+    },
+}
+# Seconds a partial evaluation can be continued after its last step.
+RULES_PARTIAL_STATE_TIMEOUT = env.int("RULES_PARTIAL_STATE_TIMEOUT", default=3600)
+# Size limits for rule conditions, enforced when rules are saved. Evaluation
+# copes with any depth, but normalizing and JSON-encoding a condition recurse
+# about twice per level, so keep the depth well below the recursion limit.
+RULES_MAX_CONDITION_DEPTH = env.int("RULES_MAX_CONDITION_DEPTH", default=200)
+RULES_MAX_CONDITION_NODES = env.int("RULES_MAX_CONDITION_NODES", default=10_000)
+# Decisions are audited through a per-process buffer flushed with bulk_create,
+# see rule_engine_api.rules.audit for the available modes and overflow policies.
+RULES_AUDIT_LOG_MODE = env("RULES_AUDIT_LOG_MODE", default="thread")
+RULES_AUDIT_LOG_BATCH_SIZE = env.int("RULES_AUDIT_LOG_BATCH_SIZE", default=2000)
+# Decisions buffered per process before RULES_AUDIT_LOG_OVERFLOW applies.
+RULES_AUDIT_LOG_QUEUE_SIZE = env.int("RULES_AUDIT_LOG_QUEUE_SIZE", default=100_000)
+# Seconds between flushes of a partial batch.
+RULES_AUDIT_LOG_FLUSH_INTERVAL = env.float(
+    "RULES_AUDIT_LOG_FLUSH_INTERVAL",
+    default=1.0,
+)
+RULES_AUDIT_LOG_OVERFLOW = env("RULES_AUDIT_LOG_OVERFLOW", default="drop_newest")
+# Seconds a request waits for room in the buffer with the "block" policy.
+RULES_AUDIT_LOG_BLOCK_TIMEOUT = env.float("RULES_AUDIT_LOG_BLOCK_TIMEOUT", default=0.05)
@@ -0,0 +1,66 @@
+"""
+Settings for evaluation-only processes, served by ``config.asgi_evaluate``.
+
+They extend the production settings (or the module named by
+``DJANGO_EVALUATE_BASE_SETTINGS``, e.g. ``config.settings.local`` to compare
+both apps on a workstation) and keep only what evaluation needs: the auth
+and rules apps, JWT authentication and a one-middleware chain. There is no
+admin, allauth, session, template, static file or API schema machinery.
+"""
+
+import importlib
+import typing as typ
+
+import environ
+
+env = environ.Env()
+
+_base = importlib.import_module(
+    env("DJANGO_EVALUATE_BASE_SETTINGS", default="config.settings.production"),
+)
+globals().update({name: value for name, value in vars(_base).items() if name.isupper()})
+
+# APPS
+# ------------------------------------------------------------------------------
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "rest_framework",
+    "rule_engine_api.users",
+    "rule_engine_api.rules",
+]
+
+# AUTHENTICATION
+# ------------------------------------------------------------------------------
+AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+
+# MIDDLEWARE
+# ------------------------------------------------------------------------------
+# Clients are services calling with a bearer token: no sessions, CSRF,
+# messages, locale or CORS. SecurityMiddleware keeps the HTTPS settings.
+MIDDLEWARE = ["django.middleware.security.SecurityMiddleware"]
+
+# URLS
+# ------------------------------------------------------------------------------
+ROOT_URLCONF = "config.urls_evaluate"
+
+# TEMPLATES
+# ------------------------------------------------------------------------------
+# Responses are JSON only; error pages fall back to Django's plain ones.
+TEMPLATES: list[dict[str, typ.Any]] = []
+
+# django-rest-framework
+# ------------------------------------------------------------------------------
+# drf-spectacular is not installed: its schema class goes too.
+REST_FRAMEWORK = {
+    **{
+        key: value
+        for key, value in _base.REST_FRAMEWORK.items()
+        if key != "DEFAULT_SCHEMA_CLASS"
+    },
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "rest_framework_simplejwt.authentication.JWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_PARSER_CLASSES": ("rest_framework.parsers.JSONParser",),
+}
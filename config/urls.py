@@ -11,6 +11,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from rule_engine_api.rules.api.viewsets import EvaluateRulesView
+from rule_engine_api.rules.api.viewsets import PartialEvaluateRulesView
 
 urlpatterns = [
     # Django Admin, use {% url 'admin:index' %}
@@ -18,6 +19,11 @@ urlpatterns = [
     # User management
     # Your stuff: custom urls includes go here
     path("api/evaluate/", EvaluateRulesView.as_view(), name="evaluate"),
+    path(
+        "api/evaluate/partial/",
+        PartialEvaluateRulesView.as_view(),
+        name="evaluate-partial",
+    ),
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -0,0 +1,19 @@
+"""URLs served by ``config.asgi_evaluate``: evaluation and tokens only."""
+
+from django.urls import path
+from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from rule_engine_api.rules.api.viewsets import EvaluateRulesView
+from rule_engine_api.rules.api.viewsets import PartialEvaluateRulesView
+
+urlpatterns = [
+    path("api/evaluate/", EvaluateRulesView.as_view(), name="evaluate"),
+    path(
+        "api/evaluate/partial/",
+        PartialEvaluateRulesView.as_view(),
+        name="evaluate-partial",
+    ),
+    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+]
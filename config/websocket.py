@@ -1,13 +1,181 @@
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+
+from rule_engine_api.rules.api.serializers import EvaluateRulesRequestSerializer
+from rule_engine_api.rules.audit import get_decision_log
+from rule_engine_api.rules.incremental import IncrementalSession
+from rule_engine_api.rules.routers import replica_reads
+from rule_engine_api.users.authentication import StatelessRoleJWTAuthentication
+
+User = get_user_model()
+
+# Close codes in the 4000-4999 range left to applications.
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+EVALUATE_ROLES = (User.RoleChoice.ADMIN.value, User.RoleChoice.CLIENT.value)
+
+
+def _authenticate(scope):
+    # Same token and authentication as ``EvaluateRulesView``, passed as
+    # ``?token=`` since browsers cannot set headers on a websocket.
+    raw = parse_qs(scope.get("query_string", b"").decode()).get("token")
+    if not raw:
+        return None
+    authentication = StatelessRoleJWTAuthentication()
+    try:
+        token = authentication.get_validated_token(raw[0].encode())
+        return authentication.get_user(token)
+    except AuthenticationFailed:
+        return None
+
+
+def _open_session(message):
+    serializer = EvaluateRulesRequestSerializer(data=message)
+    with replica_reads():
+        if not serializer.is_valid():
+            return None, serializer.errors
+    compiled = serializer.compiled_ruleset
+    session = IncrementalSession(compiled.rules, serializer.validated_data["payload"])
+    return (serializer.validated_data["rules"], session, compiled), None
+
+
+def _record(user, names, session):
+    outcomes = session.outcomes()
+    failed = [name for name, passed in outcomes.items() if not passed]
+    get_decision_log().record(
+        user_id=user.pk,
+        rules=names,
+        payload=session.payload,
+        result="APPROVED" if not failed else "REJECTED",
+        passed_rules=[name for name, passed in outcomes.items() if passed],
+        failed_rules=failed,
+    )
+
+
+def _result(session):
+    return "APPROVED" if session.all_passed else "REJECTED"
+
+
+def _outcomes_message(kind, session, outcomes):
+    return {
+        "type": kind,
+        "result": _result(session),
+        "passed_rules": [name for name, passed in outcomes.items() if passed],
+        "failed_rules": [name for name, passed in outcomes.items() if not passed],
+    }
+
+
+async def _send_json(send, data):
+    await send({"type": "websocket.send", "text": json.dumps(data)})
+
+
+async def _send_errors(send, errors):
+    await _send_json(send, {"type": "error", "errors": errors})
+
+
+class _Connection:
+    """The user and open incremental session of one websocket."""
+
+    def __init__(self, send):
+        self.send = send
+        self.user = None
+        self.names = self.session = self.compiled = None
+
+    async def connect(self, scope):
+        """Accept the websocket, or close it and return False."""
+        self.user = await sync_to_async(_authenticate)(scope)
+        if self.user is None:
+            await self.send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+            return False
+        if self.user.user_role not in EVALUATE_ROLES:
+            await self.send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+            return False
+        await self.send({"type": "websocket.accept"})
+        return True
+
+    async def close(self):
+        if self.session is not None:
+            await sync_to_async(_record)(self.user, self.names, self.session)
+
+    async def receive(self, text):
+        if text == "ping":
+            await self.send({"type": "websocket.send", "text": "pong!"})
+            return
+        try:
+            message = json.loads(text or "")
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            await _send_errors(self.send, ["Expected a JSON object."])
+        elif message.get("type") == "open":
+            await self._open(message)
+        elif message.get("type") == "delta":
+            await self._delta(message)
+        else:
+            await _send_errors(self.send, ["Unknown message type."])
+
+    async def _open(self, message):
+        opened, errors = await sync_to_async(_open_session)(message)
+        if errors is not None:
+            await _send_errors(self.send, errors)
+            return
+        await self.close()
+        self.names, self.session, self.compiled = opened
+        await _send_json(
+            self.send,
+            _outcomes_message("opened", self.session, self.session.outcomes()),
+        )
+
+    async def _delta(self, message):
+        changes, removed = message.get("set", {}), message.get("unset", [])
+        if self.session is None or self.compiled is None:
+            await _send_errors(self.send, ["Open a session first."])
+            return
+        if not isinstance(changes, dict) or not isinstance(removed, list):
+            await _send_errors(
+                self.send,
+                ["'set' must be an object and 'unset' a list."],
+            )
+            return
+        # Keys no rule reads are dropped, as in ``project``.
+        removed = [
+            key
+            for key in removed
+            if isinstance(key, str) and key in self.compiled.referenced_fields
+        ]
+        flipped = self.session.apply(self.compiled.project(changes), removed)
+        await _send_json(self.send, _outcomes_message("changed", self.session, flipped))
+
+
 async def websocket_application(scope, receive, send):
+    """
+    Besides ``ping``, serves incremental evaluation sessions as JSON messages:
+
+    - ``{"type": "open", "rules": [...], "payload": {...}}``, or with
+      ``"ruleset"``, evaluates the rules like ``EvaluateRulesView`` and keeps
+      their state for the connection;
+    - ``{"type": "delta", "set": {...}, "unset": [...]}`` changes top-level
+      payload keys and answers with only the rules whose outcome flipped.
+
+    A session evaluates the rules as they were when it was opened. Its final
+    decision is recorded when it is replaced or the connection closes.
+    """
+    connection = _Connection(send)
     while True:
         event = await receive()
+        kind = event["type"]
 
-        if event["type"] == "websocket.connect":
-            await send({"type": "websocket.accept"})
+        if kind == "websocket.connect" and not await connection.connect(scope):
+            break
 
-        if event["type"] == "websocket.disconnect":
+        if kind == "websocket.disconnect":
+            await connection.close()
             break
 
-        if event["type"] == "websocket.receive":
-            if event["text"] == "ping":
-                await send({"type": "websocket.send", "text": "pong!"})
+        if kind == "websocket.receive":
+            await connection.receive(event.get("text"))
@@ -1,6 +1,9 @@
 from django.contrib import admin
 
+from rule_engine_api.rules.models import Decision
 from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.models import RuleSet
+from rule_engine_api.rules.models import RuleSetMembership
 
 
 @admin.register(Rule)
@@ -13,4 +16,34 @@ class RuleAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     ]
-    list_display = ["id", *__fields]
+    list_display = ["id", *__fields, "node_count", "max_depth"]
+    readonly_fields = Rule.DERIVED_FIELDS
+    search_fields = ["name", "condition_hash"]
+
+
+class RuleSetMembershipInline(admin.TabularInline):
+    model = RuleSetMembership
+    fields = ["position", "rule"]
+    autocomplete_fields = ["rule"]
+    extra = 1
+
+
+@admin.register(RuleSet)
+class RuleSetAdmin(admin.ModelAdmin):
+    list_display = ["id", "name", "created_by", "created_at", "updated_at"]
+    search_fields = ["name"]
+    inlines = [RuleSetMembershipInline]
+
+
+@admin.register(Decision)
+class DecisionAdmin(admin.ModelAdmin):
+    list_display = ["id", "created_at", "user", "result", "rules"]
+    list_filter = ["result"]
+    list_select_related = ["user"]
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,26 @@
+"""
+``drf_spectacular`` decorators for the rules API.
+
+Processes that do not install ``drf_spectacular``, such as the ones running
+``config.settings.evaluate``, get no-ops instead: the views then import
+without loading the schema machinery.
+"""
+
+import typing as typ
+
+from django.apps import apps
+
+if typ.TYPE_CHECKING or apps.is_installed("drf_spectacular"):
+    from drf_spectacular.utils import OpenApiParameter
+    from drf_spectacular.utils import extend_schema
+else:
+
+    class OpenApiParameter:
+        def __init__(self, *args: typ.Any, **kwargs: typ.Any) -> None:
+            pass
+
+    def extend_schema(
+        *args: typ.Any,
+        **kwargs: typ.Any,
+    ) -> typ.Callable[[typ.Any], typ.Any]:
+        return lambda target: target
@@ -1,8 +1,16 @@
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.fields import CurrentUserDefault
 from rest_framework.fields import HiddenField
 
+from rule_engine_api.rules.compiler import resolve_rule_names
+from rule_engine_api.rules.compiler import resolve_ruleset
 from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.normalize import normalize_condition
+from rule_engine_api.rules.rule_engine import condition_errors
+
+BULK_MAX_ITEMS = 10_000
+SUMMARY_FIELDS = ("id", "name", "is_active", "condition_hash", "updated_at")
 
 
 class RuleSerializer(serializers.ModelSerializer):
@@ -13,29 +21,174 @@ class RuleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Rule
-        fields = (
+        fields: tuple[str, ...] = (
+            "id",
             "name",
             "condition",
             "is_active",
             "created_by",
+            "updated_at",
+        )
+        read_only_fields: tuple[str, ...] = ("id", "updated_at")
+
+    def validate_condition(self, value):
+        errors = condition_errors(
+            value,
+            max_depth=settings.RULES_MAX_CONDITION_DEPTH,
+            max_nodes=settings.RULES_MAX_CONDITION_NODES,
         )
+        if errors:
+            raise serializers.ValidationError(errors)
+        # Store the normalized form: the smallest tree with the same outcomes.
+        return normalize_condition(value)
+
+
+class RuleImportSerializer(RuleSerializer):
+    """A rule as exchanged by ``export_rules``/``import_rules``."""
+
+    created_by = None  # type: ignore[assignment]
+    is_active = serializers.BooleanField(default=True)
+
+    class Meta(RuleSerializer.Meta):
+        fields = ("name", "condition", "is_active")
+        read_only_fields = ()
+
+
+class RuleSummarySerializer(serializers.ModelSerializer):
+    """List representation without the condition, for cheap table syncs."""
+
+    class Meta:
+        model = Rule
+        fields = SUMMARY_FIELDS
+        read_only_fields = SUMMARY_FIELDS
+
+
+class BulkRuleUpdateSerializer(RuleSerializer):
+    id = serializers.IntegerField()
+
+    class Meta(RuleSerializer.Meta):
+        read_only_fields = ("updated_at",)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Between one and ``BULK_MAX_ITEMS`` items of ``child``."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("allow_empty", False)
+        kwargs.setdefault("max_length", BULK_MAX_ITEMS)
+        super().__init__(*args, **kwargs)
+
+
+class BulkRuleIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+
+class BulkRuleActivateSerializer(BulkRuleIdsSerializer):
+    is_active = serializers.BooleanField()
+
+
+class ProjectedPayloadField(serializers.DictField):
+    """
+    Payload reduced to the keys the selected rules reference, before the
+    DictField copy, so unreferenced fields are never validated or copied.
+    """
+
+    def to_internal_value(self, data):
+        compiled = getattr(self.parent, "compiled_ruleset", None)
+        if compiled is not None and isinstance(data, dict):
+            data = compiled.project(data)
+        return super().to_internal_value(data)
+
+
+EVALUATION_MODES = ["full", "fail_fast"]
 
 
 class EvaluateRulesRequestSerializer(serializers.Serializer):
-    rules = serializers.ListField(child=serializers.CharField())
-    payload = serializers.DictField()
+    """Evaluate a list of ``rules``, or the rules of a named ``ruleset``."""
+
+    # ``rules`` and ``ruleset`` must stay declared before ``payload``:
+    # validating them resolves the compiled ruleset that the payload is
+    # projected with.
+    rules = serializers.ListField(child=serializers.CharField(), required=False)
+    ruleset = serializers.CharField(required=False)
+    payload = ProjectedPayloadField()
+    mode = serializers.ChoiceField(
+        choices=EVALUATION_MODES,
+        default="full",
+        help_text=(
+            "'fail_fast' stops at the first failing rule, running the cheapest and "
+            "most often failing rules first: 'failed_rules' then holds only that "
+            "rule and 'passed_rules' the rules run before it. 'full' evaluates "
+            "every rule."
+        ),
+    )
 
     def validate_rules(self, value: str) -> str:
-        # Get all rules
-        valid_names = set(Rule.objects.values_list("name", flat=True))
+        self.compiled_ruleset, unknown = resolve_rule_names(value)
         # Find invalid rules
-        invalid = [name for name in value if name not in valid_names]
+        invalid = [name for name in value if name in unknown]
         if invalid:
             raise serializers.ValidationError(f"Invalid rule names: {invalid}")  # noqa: TRY003, EM102
         return value
 
+    def validate_ruleset(self, value: str) -> str:
+        resolved = resolve_ruleset(value)
+        if resolved is None:
+            raise serializers.ValidationError(f"Unknown ruleset: {value}")  # noqa: TRY003, EM102
+        self.compiled_ruleset, self.ruleset_rules = resolved
+        return value
+
+    def validate(self, attrs):
+        if ("rules" in attrs) == ("ruleset" in attrs):
+            raise serializers.ValidationError("Send either 'rules' or 'ruleset'.")  # noqa: TRY003, EM101
+        if "ruleset" in attrs:
+            attrs["rules"] = list(self.ruleset_rules)
+        return attrs
+
 
 class EvaluateRulesResponseSerializer(serializers.Serializer):
     result = serializers.CharField()
     passed_rules = serializers.ListField(child=serializers.CharField())
     failed_rules = serializers.ListField(child=serializers.CharField())
+
+
+class PartialEvaluateRulesRequestSerializer(serializers.Serializer):
+    """Start a partial evaluation with ``rules``, or continue one with ``state``."""
+
+    rules = serializers.ListField(child=serializers.CharField(), required=False)
+    state = serializers.CharField(required=False)
+    payload = serializers.DictField()
+    complete = serializers.BooleanField(
+        default=False,
+        help_text="No more fields will come: decide every rule, absent ones included.",
+    )
+
+    def validate_rules(self, value):
+        _, unknown = resolve_rule_names(value)
+        invalid = [name for name in value if name in unknown]
+        if invalid:
+            raise serializers.ValidationError(f"Invalid rule names: {invalid}")  # noqa: TRY003, EM102
+        return value
+
+    def validate(self, attrs):
+        if ("rules" in attrs) == ("state" in attrs):
+            raise serializers.ValidationError("Send either 'rules' or 'state'.")  # noqa: TRY003, EM101
+        return attrs
+
+
+class PartialEvaluateRulesResponseSerializer(serializers.Serializer):
+    result = serializers.ChoiceField(choices=["APPROVED", "REJECTED", "PENDING"])
+    passed_rules = serializers.ListField(child=serializers.CharField())
+    failed_rules = serializers.ListField(child=serializers.CharField())
+    residuals = serializers.DictField(
+        help_text="Remaining condition of each undecided rule.",
+    )
+    missing_fields = serializers.ListField(child=serializers.CharField())
+    state = serializers.CharField(
+        allow_null=True,
+        help_text="Send back with the next fields.",
+    )
@@ -1,16 +1,50 @@
+from collections import Counter
+
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema
+from django.db import IntegrityError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from rule_engine_api.rules import bulk
+from rule_engine_api.rules.api.pagination import RuleKeysetPagination
+from rule_engine_api.rules.api.schema import OpenApiParameter
+from rule_engine_api.rules.api.schema import extend_schema
+from rule_engine_api.rules.api.serializers import SUMMARY_FIELDS
+from rule_engine_api.rules.api.serializers import BulkListSerializer
+from rule_engine_api.rules.api.serializers import BulkRuleActivateSerializer
+from rule_engine_api.rules.api.serializers import BulkRuleIdsSerializer
+from rule_engine_api.rules.api.serializers import BulkRuleUpdateSerializer
 from rule_engine_api.rules.api.serializers import EvaluateRulesRequestSerializer
 from rule_engine_api.rules.api.serializers import EvaluateRulesResponseSerializer
+from rule_engine_api.rules.api.serializers import PartialEvaluateRulesRequestSerializer
+from rule_engine_api.rules.api.serializers import PartialEvaluateRulesResponseSerializer
 from rule_engine_api.rules.api.serializers import RuleSerializer
+from rule_engine_api.rules.api.serializers import RuleSummarySerializer
+from rule_engine_api.rules.audit import get_decision_log
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.compiler import resolve_rule_names
+from rule_engine_api.rules.decision_cache import get_or_compute_decision
 from rule_engine_api.rules.models import Rule
-from rule_engine_api.rules.rule_engine import evaluate_condition
+from rule_engine_api.rules.partial import PartialResult
+from rule_engine_api.rules.partial import delete_partial_state
+from rule_engine_api.rules.partial import evaluate_partially
+from rule_engine_api.rules.partial import load_partial_state
+from rule_engine_api.rules.partial import save_partial_state
+from rule_engine_api.rules.routers import replica_reads
+from rule_engine_api.rules.stats import failure_rates
+from rule_engine_api.rules.versioning import get_ruleset_version
+from rule_engine_api.users.authentication import StatelessRoleJWTAuthentication
 
 User = get_user_model()
 
@@ -37,11 +71,154 @@ class RuleViewSet(viewsets.ModelViewSet):
     serializer_class = RuleSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [RulePermission]
+    pagination_class = RuleKeysetPagination
+
+    def _is_summary(self) -> bool:
+        return (
+            self.action == "list" and self.request.query_params.get("view") == "summary"
+        )
+
+    def get_serializer_class(self):
+        if self._is_summary():
+            return RuleSummarySerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+        if self._is_summary():
+            queryset = queryset.only(*SUMMARY_FIELDS)
+        updated_since = self.request.query_params.get("updated_since")
+        if updated_since:
+            try:
+                since = parse_datetime(updated_since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError(
+                    {"updated_since": "Expected an ISO 8601 datetime."},
+                )
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since, timezone.get_default_timezone())
+            queryset = queryset.filter(updated_at__gte=since)
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "updated_since",
+                str,
+                description="Only rules updated at or after this ISO 8601 datetime.",
+            ),
+            OpenApiParameter(
+                "view",
+                str,
+                enum=["summary"],
+                description="`summary` omits `condition`.",
+            ),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        with replica_reads():
+            return super().list(request, *args, **kwargs)
+
+    def _check_names(self, names, exclude_ids=()):
+        duplicated = sorted(name for name, count in Counter(names).items() if count > 1)
+        if duplicated:
+            raise ValidationError({"name": f"Duplicated rule names: {duplicated}"})
+        taken = sorted(
+            Rule.objects.filter(name__in=names)
+            .exclude(pk__in=exclude_ids)
+            .values_list("name", flat=True),
+        )
+        if taken:
+            raise ValidationError({"name": f"Rule names already exist: {taken}"})
+
+    def _bulk_response(self, rules, status_code=status.HTTP_200_OK):
+        return Response(
+            {
+                "count": len(rules),
+                "results": RuleSummarySerializer(rules, many=True).data,
+            },
+            status=status_code,
+        )
+
+    @extend_schema(
+        request=RuleSerializer(many=True),
+        responses=RuleSummarySerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_create(self, request):
+        serializer = BulkListSerializer(
+            child=RuleSerializer(),
+            data=request.data,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        self._check_names([item["name"] for item in serializer.validated_data])
+        try:
+            rules = bulk.create_rules(serializer.validated_data)
+        except IntegrityError as exc:
+            raise ValidationError({"name": "Rule names must be unique."}) from exc
+        return self._bulk_response(rules, status.HTTP_201_CREATED)
+
+    @extend_schema(
+        request=BulkRuleUpdateSerializer(many=True),
+        responses=RuleSummarySerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-update")
+    def bulk_update(self, request):
+        serializer = BulkListSerializer(
+            child=BulkRuleUpdateSerializer(partial=True),
+            data=request.data,
+            partial=True,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        changes = {item.pop("id"): item for item in serializer.validated_data}
+        if len(changes) != len(serializer.validated_data):
+            raise ValidationError({"id": "Each rule may only appear once."})
+        rules = Rule.objects.in_bulk(list(changes))
+        missing = sorted(set(changes) - set(rules))
+        if missing:
+            raise ValidationError({"id": f"Invalid rule ids: {missing}"})
+        names = [values["name"] for values in changes.values() if "name" in values]
+        if names:
+            self._check_names(names, exclude_ids=changes)
+        try:
+            updated = bulk.update_rules(
+                (rules[pk], values) for pk, values in changes.items()
+            )
+        except IntegrityError as exc:
+            raise ValidationError({"name": "Rule names must be unique."}) from exc
+        return self._bulk_response(updated)
+
+    @extend_schema(request=BulkRuleActivateSerializer)
+    @action(detail=False, methods=["post"], url_path="bulk-activate")
+    def bulk_activate(self, request):
+        serializer = BulkRuleActivateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = bulk.set_rules_active(
+            serializer.validated_data["ids"],
+            is_active=serializer.validated_data["is_active"],
+        )
+        return Response({"count": count})
+
+    @extend_schema(request=BulkRuleIdsSerializer)
+    @action(detail=False, methods=["post"], url_path="bulk-delete")
+    def bulk_delete(self, request):
+        serializer = BulkRuleIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({"count": bulk.delete_rules(serializer.validated_data["ids"])})
 
 
 # ChatGPT solution.
+# Evaluation only reads: skip the ATOMIC_REQUESTS transaction.
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class EvaluateRulesView(APIView):
-    authentication_classes = [JWTAuthentication]
+    # Authorizes from the token's role claim: no user query per evaluation.
+    authentication_classes = [StatelessRoleJWTAuthentication]
     permission_classes = [EvaluatePermission]
 
     @extend_schema(
@@ -51,23 +228,35 @@ class EvaluateRulesView(APIView):
     )
     def post(self, request):
         serializer = EvaluateRulesRequestSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        rule_names = serializer.validated_data["rules"]
+        with replica_reads():
+            serializer.is_valid(raise_exception=True)
         payload = serializer.validated_data["payload"]
+        mode = serializer.validated_data["mode"]
+        compiled = serializer.compiled_ruleset
 
-        passed_rules = []
-        failed_rules = []
+        def compute():
+            if mode == "full":
+                return compiled.evaluate(payload)
+            with replica_reads():
+                rates = failure_rates.get()
+            return compiled.evaluate_fail_fast(payload, rates)
 
-        for rule in Rule.objects.filter(name__in=rule_names, is_active=True):
-            try:
-                if evaluate_condition(rule.condition, payload):
-                    passed_rules.append(rule.name)
-                else:
-                    failed_rules.append(rule.name)
-            except Exception:  # noqa: BLE001
-                failed_rules.append(rule.name)
+        passed_rules, failed_rules = get_or_compute_decision(
+            serializer.validated_data["rules"],
+            payload,
+            compute,
+            mode,
+        )
 
         result = "APPROVED" if not failed_rules else "REJECTED"
+        get_decision_log().record(
+            user_id=request.user.pk,
+            rules=serializer.validated_data["rules"],
+            payload=payload,
+            result=result,
+            passed_rules=passed_rules,
+            failed_rules=failed_rules,
+        )
 
         return Response(
             {
@@ -76,3 +265,100 @@ class EvaluateRulesView(APIView):
                 "failed_rules": failed_rules,
             },
         )
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class PartialEvaluateRulesView(APIView):
+    """
+    Evaluate rules against an incomplete payload, over several requests.
+
+    Rules the payload already decides are returned as passed or failed, the
+    others as residual conditions with the fields they still need. The
+    returned ``state`` continues from there: later requests send only the
+    new fields and evaluate only the residuals. If the rules were edited
+    meanwhile, the state is re-evaluated from the original rules.
+    """
+
+    authentication_classes = [StatelessRoleJWTAuthentication]
+    permission_classes = [EvaluatePermission]
+
+    @extend_schema(
+        request=PartialEvaluateRulesRequestSerializer,
+        responses=PartialEvaluateRulesResponseSerializer,
+        tags=["Rules"],
+    )
+    def post(self, request):
+        serializer = PartialEvaluateRulesRequestSerializer(data=request.data)
+        with replica_reads():
+            serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        version = get_ruleset_version()
+
+        state_id = data.get("state")
+        state = None
+        if state_id is not None:
+            state = load_partial_state(state_id)
+            if state is None or state["user_id"] != request.user.pk:
+                raise NotFound("Unknown or expired state.")  # noqa: TRY003, EM101
+        names = state["rules"] if state else data["rules"]
+        with replica_reads():
+            compiled, _ = resolve_rule_names(names)
+        payload = compiled.project(
+            {**(state["payload"] if state else {}), **data["payload"]},
+        )
+
+        if state and state["version"] == version:
+            passed, failed = list(state["passed"]), list(state["failed"])
+            rules = state["residuals"].items()
+        else:
+            passed, failed = [], []
+            rules = compiled.rules
+        if data["complete"]:
+            step = PartialResult(*CompiledRuleSet(rules).evaluate(payload), {})
+        else:
+            step = evaluate_partially(rules, payload)
+        passed.extend(step.passed)
+        failed.extend(step.failed)
+
+        if failed:
+            result = "REJECTED"
+        elif step.residuals:
+            result = "PENDING"
+        else:
+            result = "APPROVED"
+        if step.residuals:
+            state_id = save_partial_state(
+                {
+                    "user_id": request.user.pk,
+                    "version": version,
+                    "rules": names,
+                    "payload": payload,
+                    "passed": passed,
+                    "failed": failed,
+                    "residuals": step.residuals,
+                },
+                state_id,
+            )
+        else:
+            if state_id is not None:
+                delete_partial_state(state_id)
+            state_id = None
+            get_decision_log().record(
+                user_id=request.user.pk,
+                rules=names,
+                payload=payload,
+                result=result,
+                passed_rules=passed,
+                failed_rules=failed,
+            )
+
+        return Response(
+            {
+                "result": result,
+                "passed_rules": passed,
+                "failed_rules": failed,
+                "residuals": step.residuals,
+                "missing_fields": step.missing_fields,
+                "state": state_id,
+            },
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rule_engine_api.rules'
+
+    def ready(self):
+        import rule_engine_api.rules.signals  # noqa: F401, PLC0415
@@ -0,0 +1,255 @@
+import atexit
+import logging
+import os
+import threading
+import typing as typ
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from rule_engine_api.rules.models import Decision
+
+logger = logging.getLogger(__name__)
+
+Row = dict[str, typ.Any]
+
+# Where buffered decisions go:
+# - thread: a background thread in each process runs ``bulk_create``
+# - celery: the same thread hands each batch to the ``write_decisions_task`` task
+# - sync: written in the request itself (tests and debugging)
+# - off: not recorded
+MODES = ("thread", "celery", "sync", "off")
+# What ``submit`` does when the buffer is full:
+# - block: wait up to RULES_AUDIT_LOG_BLOCK_TIMEOUT for room, then drop
+# - drop_newest: drop the decision being submitted
+# - drop_oldest: drop the oldest buffered decision to make room
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+def write_decisions(rows: typ.Iterable[Row], batch_size: int) -> int:
+    """Insert decision rows with ``bulk_create``, return how many were written."""
+    return len(
+        Decision.objects.bulk_create(
+            [Decision(**row) for row in rows],
+            batch_size=batch_size,
+        ),
+    )
+
+
+def rows_to_json(rows: typ.Iterable[Row]) -> list[Row]:
+    return [{**row, "created_at": row["created_at"].isoformat()} for row in rows]
+
+
+def rows_from_json(rows: typ.Iterable[Row]) -> list[Row]:
+    return [{**row, "created_at": parse_datetime(row["created_at"])} for row in rows]
+
+
+class DecisionLog:
+    """
+    Bounded in-memory buffer of decisions flushed in batches off the
+    request path, so ``EvaluateRulesView`` never waits on the audit insert.
+
+    Decisions still buffered when a process dies are lost; the flush on
+    interpreter exit covers orderly shutdowns only.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        mode: str = "thread",
+        batch_size: int = 2000,
+        queue_size: int = 100_000,
+        flush_interval: float = 1.0,
+        overflow: str = "drop_newest",
+        block_timeout: float = 0.05,
+        autostart: bool = True,
+    ) -> None:
+        if mode not in MODES:
+            msg = f"RULES_AUDIT_LOG_MODE must be one of {MODES}, got {mode!r}"
+            raise ImproperlyConfigured(msg)
+        if overflow not in OVERFLOW_POLICIES:
+            msg = (
+                f"RULES_AUDIT_LOG_OVERFLOW must be one of {OVERFLOW_POLICIES}, "
+                f"got {overflow!r}"
+            )
+            raise ImproperlyConfigured(msg)
+        self.mode = mode
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        # Without the writer thread, batches are only written by ``flush()``.
+        self.autostart = autostart
+        # Decisions lost to overflow or failed writes, for monitoring.
+        self.dropped = 0
+        self._buffer: deque[Row] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._closed = False
+
+    def record(  # noqa: PLR0913
+        self,
+        *,
+        user_id: int | None,
+        rules: list[str],
+        payload: dict[str, typ.Any],
+        result: str,
+        passed_rules: list[str],
+        failed_rules: list[str],
+    ) -> bool:
+        """Queue one decision. Returns ``False`` if it was dropped."""
+        if self.mode == "off":
+            return True
+        row = {
+            "created_at": timezone.now(),
+            "user_id": user_id,
+            "rules": rules,
+            "payload": payload,
+            "result": result,
+            "passed_rules": passed_rules,
+            "failed_rules": failed_rules,
+        }
+        if self.mode == "sync":
+            write_decisions([row], self.batch_size)
+            return True
+        return self.submit(row)
+
+    def submit(self, row: Row) -> bool:
+        self._ensure_worker()
+        with self._cond:
+            if len(self._buffer) >= self.queue_size:
+                if self.overflow == "drop_oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                elif not (
+                    self.overflow == "block"
+                    and self._cond.wait_for(
+                        lambda: len(self._buffer) < self.queue_size,
+                        timeout=self.block_timeout,
+                    )
+                ):
+                    self.dropped += 1
+                    return False
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self) -> None:
+        """Write everything buffered so far from the calling thread."""
+        while batch := self._take(wait=False):
+            self._write(batch)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def _ensure_worker(self) -> None:
+        # Started lazily, and again in a forked child, which inherits the
+        # buffer but not the thread.
+        if (
+            not self.autostart
+            or self._pid == os.getpid()
+            or self.mode not in ("thread", "celery")
+        ):
+            return
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._buffer.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="decision-log-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _take(self, *, wait: bool) -> list[Row]:
+        with self._cond:
+            if wait:
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= self.batch_size or self._closed,
+                    timeout=self.flush_interval,
+                )
+            count = min(len(self._buffer), self.batch_size)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            if batch:
+                # Wake up submitters blocked on a full buffer.
+                self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while not self._closed:
+            batch = self._take(wait=True)
+            if batch:
+                close_old_connections()
+                self._write(batch)
+
+    def _write(self, batch: list[Row]) -> None:
+        try:
+            if self.mode == "celery":
+                # The tasks module imports this one.
+                from rule_engine_api.rules.tasks import (  # noqa: PLC0415
+                    write_decisions_task,
+                )
+
+                write_decisions_task.delay(rows_to_json(batch))
+            else:
+                write_decisions(batch, self.batch_size)
+        except Exception:
+            with self._cond:
+                self.dropped += len(batch)
+            logger.exception("Dropped %d decisions: audit log write failed", len(batch))
+
+
+_log: DecisionLog | None = None
+_log_lock = threading.Lock()
+
+
+def get_decision_log() -> DecisionLog:
+    """The process-wide ``DecisionLog`` configured by ``RULES_AUDIT_LOG_*``."""
+    global _log  # noqa: PLW0603
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = DecisionLog(
+                    mode=settings.RULES_AUDIT_LOG_MODE,
+                    batch_size=settings.RULES_AUDIT_LOG_BATCH_SIZE,
+                    queue_size=settings.RULES_AUDIT_LOG_QUEUE_SIZE,
+                    flush_interval=settings.RULES_AUDIT_LOG_FLUSH_INTERVAL,
+                    overflow=settings.RULES_AUDIT_LOG_OVERFLOW,
+                    block_timeout=settings.RULES_AUDIT_LOG_BLOCK_TIMEOUT,
+                )
+    return _log
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    if _log is not None:
+        _log.close()
+
+
+@receiver(setting_changed)
+def _reset_decision_log(*, setting, **kwargs) -> None:
+    global _log  # noqa: PLW0603
+    if setting.startswith("RULES_AUDIT_LOG_") and _log is not None:
+        with _log_lock:
+            _log.close()
+            _log = None
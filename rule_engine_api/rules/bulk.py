@@ -0,0 +1,84 @@
+import typing as typ
+
+from django.db import transaction
+from django.utils import timezone
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.versioning import batched_version_bump
+
+BULK_BATCH_SIZE = 1000
+
+
+def create_rules(items: typ.Iterable[dict[str, typ.Any]]) -> list[Rule]:
+    """
+    Insert already validated rules in one transaction.
+    ``bulk_create`` skips ``save()``, so the derived columns are filled here.
+    """
+    rules = [Rule(**item) for item in items]
+    for rule in rules:
+        rule.refresh_derived_fields()
+    with transaction.atomic(), batched_version_bump():
+        return Rule.objects.bulk_create(rules, batch_size=BULK_BATCH_SIZE)
+
+
+def update_rules(changes: typ.Iterable[tuple[Rule, dict[str, typ.Any]]]) -> list[Rule]:
+    """Apply validated ``(rule, changed values)`` pairs in one transaction."""
+    rules = []
+    update_fields = {"updated_at"}
+    now = timezone.now()
+    for rule, values in changes:
+        for attr, value in values.items():
+            setattr(rule, attr, value)
+        if "condition" in values:
+            rule.refresh_derived_fields()
+            update_fields.update(Rule.DERIVED_FIELDS)
+        update_fields.update(values)
+        rule.updated_at = now
+        rules.append(rule)
+    with transaction.atomic(), batched_version_bump():
+        Rule.objects.bulk_update(
+            rules,
+            sorted(update_fields),
+            batch_size=BULK_BATCH_SIZE,
+        )
+    return rules
+
+
+def set_rules_active(ids: typ.Iterable[int], *, is_active: bool) -> int:
+    with transaction.atomic(), batched_version_bump():
+        return Rule.objects.filter(pk__in=ids).update(
+            is_active=is_active,
+            updated_at=timezone.now(),
+        )
+
+
+def delete_rules(ids: typ.Iterable[int]) -> int:
+    with transaction.atomic(), batched_version_bump():
+        _, deleted = Rule.objects.filter(pk__in=ids).delete()
+    return deleted.get(Rule._meta.label, 0)  # noqa: SLF001
+
+
+def upsert_rules(items: typ.Iterable[dict[str, typ.Any]], created_by) -> list[Rule]:
+    """
+    Insert validated rules, overwriting the condition and status of existing
+    rules with the same name. ``created_by`` only applies to new rows.
+    """
+    rules = {}
+    for item in items:
+        rule = Rule(created_by=created_by, **item)
+        rule.refresh_derived_fields()
+        # ON CONFLICT cannot touch one row twice, so the last item wins.
+        rules[rule.name] = rule
+    with transaction.atomic(), batched_version_bump():
+        return Rule.objects.bulk_create(
+            list(rules.values()),
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=[
+                "condition",
+                "is_active",
+                "updated_at",
+                *Rule.DERIVED_FIELDS,
+            ],
+        )
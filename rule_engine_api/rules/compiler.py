@@ -0,0 +1,233 @@
+import threading
+import typing as typ
+from collections import OrderedDict
+
+from rule_engine_api.rules.contains_index import ContainsIndex
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.models import RuleSet
+from rule_engine_api.rules.normalize import condition_stats
+from rule_engine_api.rules.normalize import referenced_fields
+from rule_engine_api.rules.paths import root_key
+from rule_engine_api.rules.rule_engine import Predicate
+from rule_engine_api.rules.rule_engine import compile_condition
+from rule_engine_api.rules.rule_engine import compile_merged
+from rule_engine_api.rules.rule_engine import shared_subexpressions
+from rule_engine_api.rules.versioning import get_ruleset_version
+
+COMPILED_CACHE_SIZE = 128
+# Failure rate assumed for rules without statistics yet.
+DEFAULT_FAILURE_RATE = 0.5
+
+
+class CompiledRuleSet:
+    """
+    A group of rules prepared for repeated evaluation.
+    Work that only depends on the rules, such as the ``contains`` index,
+    is done once here instead of on every request.
+
+    When rules share sub-conditions, they are compiled into one merged
+    program that computes each shared one once per payload. Otherwise each
+    rule keeps its own predicate, which is faster without sharing.
+    """
+
+    def __init__(self, rules: typ.Iterable[tuple[str, typ.Any]]) -> None:
+        self.rules = list(rules)
+        self.predicates = [
+            (name, _compile_rule(condition)) for name, condition in self.rules
+        ]
+        shared = shared_subexpressions(condition for _, condition in self.rules)
+        self.merged = compile_merged(self.rules, shared) if shared else None
+        # Node counts, the evaluation cost estimate used by fail-fast.
+        self.costs = [condition_stats(condition)[0] for _, condition in self.rules]
+        self._fail_fast: tuple[typ.Any, list] | None = None
+        self.contains_index = ContainsIndex(condition for _, condition in self.rules)
+        # Payload keys any of the rules can read; everything else is ignored.
+        # A nested path needs its root key, and also the literal key in case
+        # the client sent an already flattened payload.
+        self.referenced_fields = frozenset(
+            key
+            for _, condition in self.rules
+            for field in referenced_fields(condition)
+            for key in (field, root_key(field))
+            if key is not None
+        )
+
+    def project(self, payload: dict[str, typ.Any]) -> dict[str, typ.Any]:
+        """Drop the payload keys that no rule reads."""
+        return {key: payload[key] for key in self.referenced_fields if key in payload}
+
+    def evaluate(
+        self,
+        payload: dict[str, typ.Any],
+    ) -> tuple[list[str], list[str]]:
+        """Return the ``(passed, failed)`` rule names for ``payload``."""
+        contains_hits = (
+            self.contains_index.search(payload) if self.contains_index else None
+        )
+        if self.merged is not None:
+            return self.merged(payload, contains_hits)
+        passed_rules: list[str] = []
+        failed_rules = []
+        for name, predicate in self.predicates:
+            try:
+                if predicate(payload, contains_hits):
+                    passed_rules.append(name)
+                else:
+                    failed_rules.append(name)
+            except Exception:  # noqa: BLE001
+                failed_rules.append(name)
+        return passed_rules, failed_rules
+
+    def fail_fast_order(
+        self,
+        failure_rates: dict[str, float],
+    ) -> list[tuple[str, Predicate]]:
+        """
+        Predicates by increasing cost per failure, so that the first failing
+        rule is expected to be reached with the least work. Cached for as
+        long as the same ``failure_rates`` object is passed.
+        """
+        cached = self._fail_fast
+        if cached is not None and cached[0] is failure_rates:
+            return cached[1]
+        order = [
+            predicate
+            for _, predicate in sorted(
+                zip(self.costs, self.predicates, strict=True),
+                key=lambda item: item[0]
+                / failure_rates.get(item[1][0], DEFAULT_FAILURE_RATE),
+            )
+        ]
+        self._fail_fast = (failure_rates, order)
+        return order
+
+    def evaluate_fail_fast(
+        self,
+        payload: dict[str, typ.Any],
+        failure_rates: dict[str, float],
+    ) -> tuple[list[str], list[str]]:
+        """
+        Like ``evaluate``, but stop at the first failing rule: ``failed``
+        holds only that rule and ``passed`` the rules run before it. Without
+        a failure the result is the same as ``evaluate``, in another order.
+        """
+        contains_hits = (
+            self.contains_index.search(payload) if self.contains_index else None
+        )
+        passed_rules: list[str] = []
+        for name, predicate in self.fail_fast_order(failure_rates):
+            try:
+                if not predicate(payload, contains_hits):
+                    return passed_rules, [name]
+            except Exception:  # noqa: BLE001
+                return passed_rules, [name]
+            passed_rules.append(name)
+        return passed_rules, []
+
+
+def _compile_rule(condition: typ.Any) -> Predicate:
+    try:
+        return compile_condition(condition)
+    except Exception as exc:  # noqa: BLE001
+        error = exc
+
+        # Malformed conditions keep failing their rule at evaluation time.
+        def malformed(payload, contains_hits):
+            raise error
+
+        return malformed
+
+
+_compiled_cache: OrderedDict[tuple, typ.Any] = OrderedDict()
+_compiled_cache_lock = threading.Lock()
+
+
+def _cache_get(key: tuple) -> typ.Any:
+    with _compiled_cache_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is not None:
+            _compiled_cache.move_to_end(key)
+        return compiled
+
+
+def _cache_put(key: tuple, value: typ.Any) -> None:
+    with _compiled_cache_lock:
+        _compiled_cache[key] = value
+        while len(_compiled_cache) > COMPILED_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+
+
+def get_compiled_ruleset(rules: typ.Sequence[Rule]) -> CompiledRuleSet:
+    """
+    Return a ``CompiledRuleSet`` for ``rules``, reusing an earlier one for the
+    same names and update times. Rules are evaluated as written, not in
+    their canonical order.
+    """
+    key = tuple((rule.name, rule.updated_at) for rule in rules)
+    compiled = _cache_get(key)
+    if compiled is None:
+        compiled = CompiledRuleSet((rule.name, rule.condition) for rule in rules)
+        _cache_put(key, compiled)
+    return compiled
+
+
+def resolve_rule_names(
+    names: typ.Iterable[str],
+) -> tuple[CompiledRuleSet, frozenset[str]]:
+    """
+    Return the ``CompiledRuleSet`` of the active rules called ``names`` and
+    the subset of ``names`` that match no rule at all.
+
+    While the ruleset version is unchanged this needs no database query.
+    After a bump, the names and update times are read first (an index-only
+    scan on ``rule_active_name_idx``) and conditions are only loaded when
+    that exact combination has not been compiled before.
+    """
+    key = ("names", get_ruleset_version(), frozenset(names))
+    resolved = _cache_get(key)
+    if resolved is None:
+        active = Rule.objects.filter(name__in=key[2], is_active=True).order_by("name")
+        versions = tuple(active.values_list("name", "updated_at"))
+        compiled = _cache_get(versions)
+        if compiled is None:
+            rules = list(active.only("name", "condition", "updated_at"))
+            compiled = get_compiled_ruleset(rules)
+
+        unknown = key[2].difference(name for name, _ in versions)
+        if unknown:
+            # Inactive rules are valid names, they are just not evaluated.
+            unknown = unknown.difference(
+                Rule.objects.filter(name__in=unknown).values_list("name", flat=True),
+            )
+        resolved = (compiled, frozenset(unknown))
+        _cache_put(key, resolved)
+    return resolved
+
+
+def resolve_ruleset(
+    name: str,
+) -> tuple[CompiledRuleSet, tuple[str, ...]] | None:
+    """
+    Return the ``CompiledRuleSet`` of the active rules of the ruleset called
+    ``name``, in membership order, with the names of all its rules; ``None``
+    for an unknown ruleset.
+
+    Cached per ruleset version, which ruleset and membership changes bump
+    too, so a repeated ruleset costs no query and no compilation.
+    """
+    key = ("ruleset", get_ruleset_version(), name)
+    resolved = _cache_get(key)
+    if resolved is None:
+        ruleset = RuleSet.objects.filter(name=name).first()
+        if ruleset is None:
+            resolved = (None, ())
+        else:
+            rules = list(
+                Rule.objects.filter(memberships__ruleset=ruleset)
+                .order_by("memberships__position", "memberships__id")
+                .only("name", "is_active", "condition", "updated_at"),
+            )
+            compiled = get_compiled_ruleset([rule for rule in rules if rule.is_active])
+            resolved = (compiled, tuple(rule.name for rule in rules))
+        _cache_put(key, resolved)
+    return None if resolved[0] is None else resolved
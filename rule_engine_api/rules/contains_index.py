@@ -0,0 +1,147 @@
+import typing as typ
+from collections import deque
+
+from rule_engine_api.rules.paths import MISSING
+from rule_engine_api.rules.paths import make_accessor
+
+LeafKey = tuple[str, str]
+
+# Fields with fewer string patterns than this are scanned with plain ``in``,
+# building an automaton only pays off once many patterns share a field.
+AUTOMATON_MIN_PATTERNS = 8
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed set of string patterns.
+    A single scan of the text reports every pattern occurring in it.
+    """
+
+    __slots__ = ("_fail", "_goto", "_outputs", "_patterns")
+
+    def __init__(self, patterns: typ.Iterable[str]) -> None:
+        self._patterns = list(dict.fromkeys(patterns))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+
+        for index, pattern in enumerate(self._patterns):
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = nxt
+            self._outputs[node].append(index)
+
+        # Breadth-first pass to wire failure links and merge outputs.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child].extend(self._outputs[self._fail[child]])
+
+    def search(self, text: str) -> set[str]:
+        """Return the patterns that occur anywhere in ``text``."""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found: set[int] = set(outputs[0])
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return {self._patterns[index] for index in found}
+
+
+class _FieldPatterns:
+    __slots__ = ("accessor", "automaton", "patterns")
+
+    def __init__(self, field: str, patterns: set[str]) -> None:
+        self.accessor = make_accessor(field)
+        self.patterns = frozenset(patterns)
+        self.automaton = (
+            AhoCorasick(self.patterns)
+            if len(self.patterns) >= AUTOMATON_MIN_PATTERNS
+            else None
+        )
+
+    def search(self, actual: typ.Any) -> typ.Iterable[str]:
+        if isinstance(actual, str):
+            if self.automaton is not None:
+                return self.automaton.search(actual)
+            return [pattern for pattern in self.patterns if pattern in actual]
+        if isinstance(actual, list):
+            return self.patterns.intersection(
+                item for item in actual if isinstance(item, str)
+            )
+        return ()
+
+
+class ContainsIndex:
+    """
+    Index of every ``contains`` leaf with a string value, grouped by field.
+
+    ``search`` looks at each indexed payload value once and returns the
+    ``(field, value)`` keys of all leaves that hold: substring matching via
+    an Aho-Corasick automaton for string values, set intersection for lists.
+    """
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, conditions: typ.Iterable[typ.Any]) -> None:
+        grouped: dict[str, set[str]] = {}
+        for condition in conditions:
+            for field, value in iter_contains_leaves(condition):
+                grouped.setdefault(field, set()).add(value)
+        self._fields = {}
+        for field, patterns in grouped.items():
+            try:
+                self._fields[field] = _FieldPatterns(field, patterns)
+            except ValueError:
+                # Invalid path: the leaf itself reports the error when evaluated.
+                continue
+
+    def __bool__(self) -> bool:
+        return bool(self._fields)
+
+    def search(self, payload: dict[str, typ.Any]) -> set[LeafKey]:
+        hits: set[LeafKey] = set()
+        for field, patterns in self._fields.items():
+            actual = patterns.accessor(payload)
+            if actual is MISSING:
+                continue
+            hits.update((field, value) for value in patterns.search(actual))
+        return hits
+
+
+def iter_contains_leaves(condition: typ.Any) -> typ.Iterator[LeafKey]:
+    """Yield ``(field, value)`` for each indexable ``contains`` leaf."""
+    stack = [condition]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if "AND" in node:
+            stack.extend(node["AND"])
+        elif "OR" in node:
+            stack.extend(node["OR"])
+        elif (
+            node.get("operator") == "contains"
+            and isinstance(node.get("field"), str)
+            and isinstance(node.get("value"), str)
+        ):
+            yield node["field"], node["value"]
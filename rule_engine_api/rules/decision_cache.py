@@ -0,0 +1,77 @@
+import hashlib
+import json
+import time
+import typing as typ
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rule_engine_api.rules.versioning import get_ruleset_version
+
+Decision = tuple[list[str], list[str]]
+
+DECISION_KEY_PREFIX = "rules:decision"
+# Upper bound on how long a crashed worker can keep others waiting.
+LOCK_TIMEOUT = 5
+POLL_INTERVAL = 0.005
+
+
+def decision_key(
+    names: typ.Iterable[str],
+    payload: dict[str, typ.Any],
+    mode: str = "full",
+) -> str:
+    """Cache key of a decision: ruleset version, rule names, payload and mode."""
+    digest = hashlib.sha256(
+        json.dumps(
+            [sorted(names), payload, mode],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        ).encode(),
+    ).hexdigest()
+    return f"{DECISION_KEY_PREFIX}:{get_ruleset_version()}:{digest}"
+
+
+def get_or_compute_decision(
+    names: typ.Iterable[str],
+    payload: dict[str, typ.Any],
+    compute: typ.Callable[[], Decision],
+    mode: str = "full",
+) -> Decision:
+    """
+    Return the cached decision for ``names`` and ``payload``, computing it
+    at most once across workers.
+
+    The first request takes a short lock and computes. Identical requests
+    arriving meanwhile poll for its result for up to
+    ``RULES_DECISION_CACHE_WAIT`` seconds, then compute on their own.
+    Each evaluation ``mode`` has its own cached decisions.
+    """
+    if not settings.RULES_DECISION_CACHE_ENABLED:
+        return compute()
+
+    key = decision_key(names, payload, mode)
+    decision = cache.get(key)
+    if decision is not None:
+        return decision
+
+    lock_key = f"{key}:lock"
+    acquired = cache.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+    # ``None`` means the cache backend is down and swallowed the error.
+    if acquired or acquired is None:
+        try:
+            decision = compute()
+            cache.set(key, decision, timeout=settings.RULES_DECISION_CACHE_TIMEOUT)
+        finally:
+            if acquired:
+                cache.delete(lock_key)
+        return decision
+
+    deadline = time.monotonic() + settings.RULES_DECISION_CACHE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        decision = cache.get(key)
+        if decision is not None:
+            return decision
+    return compute()
@@ -0,0 +1,128 @@
+"""
+Decision tables: a condition node of their own, usable wherever a leaf is::
+
+    {"table": {
+        "columns": ["country", "product", "channel"],
+        "rows": [["TH", "loan", "web", true], ["TH", "card", "app", false]],
+        "default": false,
+    }}
+
+Each row holds one value per column followed by the outcome when the
+payload has exactly those values. Payloads matching no row, including
+those missing a column, get ``default`` (false when omitted).
+"""
+
+import json
+import typing as typ
+
+from rule_engine_api.rules.paths import make_accessor
+
+TABLE = "table"
+
+
+def is_table(node: typ.Any) -> bool:
+    return isinstance(node, dict) and TABLE in node
+
+
+def table_columns(node: typ.Any) -> list[str]:
+    """Field paths a table node reads; empty for anything else."""
+    table = node.get(TABLE) if isinstance(node, dict) else None
+    columns = table.get("columns") if isinstance(table, dict) else None
+    if not isinstance(columns, list):
+        return []
+    return [column for column in columns if isinstance(column, str)]
+
+
+def _is_key(value: typ.Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _column_errors(columns: list[str]) -> list[str]:
+    errors = []
+    if len(set(columns)) != len(columns):
+        errors.append("table: duplicate columns")
+    for column in columns:
+        try:
+            make_accessor(column)
+        except ValueError as exc:
+            errors.append(f"table: {column}: {exc}")
+    return errors
+
+
+def _row_error(row: typ.Any, width: int) -> str | None:
+    if not isinstance(row, list) or len(row) != width + 1:
+        return "must hold one value per column and an outcome"
+    if not all(map(_is_key, row[:-1])):
+        return "values must be strings, numbers, booleans or null"
+    if not isinstance(row[-1], bool):
+        return "outcome must be a boolean"
+    return None
+
+
+def table_errors(table: typ.Any) -> list[str]:
+    """Problems that would make ``compile_table`` raise, as messages."""
+    if not isinstance(table, dict):
+        return ["table: expected an object with 'columns' and 'rows'"]
+    columns, rows = table.get("columns"), table.get("rows")
+    if (
+        not isinstance(columns, list)
+        or not columns
+        or not all(isinstance(c, str) for c in columns)
+    ):
+        return ["table: 'columns' must be a non-empty list of field names"]
+    errors = _column_errors(columns)
+    if not isinstance(table.get("default", False), bool):
+        errors.append("table: 'default' must be a boolean")
+    if not isinstance(rows, list):
+        errors.append("table: 'rows' must be a list")
+        return errors
+
+    # Keyed like the dicts of ``compile_table``, where equal values such as
+    # ``1``, ``1.0`` and ``true`` select the same row.
+    outcomes: dict[tuple, bool] = {}
+    for number, row in enumerate(rows, start=1):
+        error = _row_error(row, len(columns))
+        if error is not None:
+            errors.append(f"table: row {number} {error}")
+        elif outcomes.setdefault(tuple(row[:-1]), row[-1]) != row[-1]:
+            errors.append(f"table: row {number} contradicts an earlier row")
+    return errors
+
+
+def canonical_table(table: dict[str, typ.Any]) -> dict[str, typ.Any]:
+    """Rows deduplicated and sorted, so equal tables hash equal."""
+    rows = table.get("rows")
+    if not isinstance(rows, list):
+        return table
+    unique = {json.dumps(row, sort_keys=True, default=str): row for row in rows}
+    return {**table, "rows": [unique[key] for key in sorted(unique)]}
+
+
+def compile_table(
+    table: dict[str, typ.Any],
+) -> typ.Callable[[typ.Any, typ.Any], bool]:
+    """
+    Compile a valid table into nested dicts, one level per column: a lookup
+    costs one dict access per column, whatever the number of rows, and
+    stops at the first column without a matching value.
+    """
+    accessors = [make_accessor(column) for column in table["columns"]]
+    default = table.get("default", False)
+    index: dict[typ.Any, typ.Any] = {}
+    for row in table["rows"]:
+        level = index
+        for value in row[:-2]:
+            level = level.setdefault(value, {})
+        level[row[-2]] = row[-1]
+
+    def lookup(payload, contains_hits):
+        level = index
+        for accessor in accessors:
+            try:
+                level = level[accessor(payload)]
+            except (KeyError, TypeError):
+                # No such row, or an unhashable value such as a list.
+                return default
+        return level
+
+    return lookup
@@ -0,0 +1,148 @@
+"""
+Memory footprint of the ways a rule population can be held in a worker.
+
+Each representation is built from the same ``(name, condition)`` pairs,
+freshly decoded from JSON as if just read from the database, and measured
+with ``tracemalloc`` as the bytes still allocated once it is built.
+"""
+
+import gc
+import json
+import random
+import time
+import tracemalloc
+import typing as typ
+
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.normalize import condition_hash
+from rule_engine_api.rules.normalize import condition_stats
+from rule_engine_api.rules.normalize import normalize_condition
+from rule_engine_api.rules.normalize import referenced_fields
+from rule_engine_api.rules.packed import PackedRuleSet
+
+RuleSource = typ.Sequence[tuple[str, typ.Any]]
+
+
+class Footprint(typ.NamedTuple):
+    representation: str
+    rules: int
+    bytes: int
+    build_seconds: float
+
+
+def _decoded(rules: RuleSource) -> list[tuple[str, typ.Any]]:
+    return [(name, json.loads(condition)) for name, condition in rules]
+
+
+def _models(rules: RuleSource) -> list[Rule]:
+    models = []
+    for name, condition in _decoded(rules):
+        node_count, max_depth = condition_stats(condition)
+        models.append(
+            Rule(
+                name=name,
+                condition=condition,
+                canonical_condition=json.loads(json.dumps(condition)),
+                condition_hash=condition_hash(condition),
+                fields=referenced_fields(condition),
+                node_count=node_count,
+                max_depth=max_depth,
+            ),
+        )
+    return models
+
+
+REPRESENTATIONS: dict[str, typ.Callable[[RuleSource], typ.Any]] = {
+    # Rule instances as loaded for evaluation before compilation.
+    "models": _models,
+    # Only the decoded condition dicts.
+    "conditions": _decoded,
+    # What ``get_compiled_ruleset`` caches: closures plus the conditions.
+    "compiled": lambda rules: CompiledRuleSet(_decoded(rules)),
+    "packed": lambda rules: PackedRuleSet(_decoded(rules)),
+}
+
+
+def measure(representation: str, rules: typ.Iterable[tuple[str, typ.Any]]) -> Footprint:
+    """Build ``representation`` of ``rules`` and measure what it holds."""
+    # Conditions are kept encoded until the build, so that only the
+    # representation's own objects are counted.
+    encoded = [(name, json.dumps(condition)) for name, condition in rules]
+    build = REPRESENTATIONS[representation]
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        built = build(encoded)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    del built
+    return Footprint(representation, len(encoded), size, elapsed)
+
+
+def footprint_report(footprints: typ.Sequence[Footprint]) -> str:
+    """Table of footprints, with the ratio to the smallest one."""
+    smallest = min(footprint.bytes for footprint in footprints) or 1
+    lines = [
+        f"{'Representation':<16}{'MiB':>10}{'Bytes/rule':>12}"
+        f"{'Ratio':>8}{'Build s':>10}",
+    ]
+    lines.extend(
+        f"{footprint.representation:<16}{footprint.bytes / 2**20:>10.1f}"
+        f"{footprint.bytes / max(footprint.rules, 1):>12,.0f}"
+        f"{footprint.bytes / smallest:>8.1f}{footprint.build_seconds:>10.2f}"
+        for footprint in footprints
+    )
+    return "\n".join(lines)
+
+
+def synthetic_rules(
+    count: int,
+    *,
+    fields: int = 50,
+    seed: int | None = None,
+) -> list[tuple[str, typ.Any]]:
+    """
+    ``count`` normalized conditions shaped like typical rules: an ``AND`` of
+    two to six leaves, sometimes with an ``OR`` of equalities, over
+    ``fields`` payload fields.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    names = [
+        f"field_{index}" if index % 5 else f"applicant.field_{index}"
+        for index in range(fields)
+    ]
+
+    def leaf() -> dict[str, typ.Any]:
+        field = rng.choice(names)
+        roll = rng.random()
+        if roll < 0.6:  # noqa: PLR2004
+            operator = rng.choice((">", ">=", "<", "<=", "==", "!="))
+            return {"field": field, "operator": operator, "value": rng.randrange(1000)}
+        if roll < 0.8:  # noqa: PLR2004
+            values = [f"v{rng.randrange(100)}" for _ in range(rng.randint(2, 5))]
+            return {"field": field, "operator": "in", "value": values}
+        if roll < 0.9:  # noqa: PLR2004
+            return {"field": field, "operator": "==", "value": f"v{rng.randrange(100)}"}
+        low = rng.randrange(1000)
+        return {
+            "field": field,
+            "operator": "between",
+            "value": [low, low + rng.randrange(1, 100)],
+        }
+
+    rules = []
+    for index in range(count):
+        children: list[typ.Any] = [leaf() for _ in range(rng.randint(2, 6))]
+        if rng.random() < 0.3:  # noqa: PLR2004
+            children.append({"OR": [leaf() for _ in range(rng.randint(2, 3))]})
+        rules.append((f"rule-{index:07d}", normalize_condition({"AND": children})))
+    return rules
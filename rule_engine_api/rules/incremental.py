@@ -0,0 +1,184 @@
+import typing as typ
+
+from rule_engine_api.rules.normalize import leaf_fields
+from rule_engine_api.rules.paths import MISSING
+from rule_engine_api.rules.paths import root_key
+from rule_engine_api.rules.rule_engine import compile_leaf
+from rule_engine_api.rules.rule_engine import group_kind
+
+_LEAF = 0
+_AND = 1
+_OR = 2
+
+# Node values. A leaf that raises is an error; like in ``evaluate_condition``
+# the error propagates when the group reaches it before a deciding child.
+_FALSE = 0
+_TRUE = 1
+_ERROR = 2
+
+
+class IncrementalSession:
+    """
+    Keeps the value of every node of a set of rules for one payload, and
+    updates them from payload deltas.
+
+    The rules are flattened into one node graph. Each leaf is registered
+    under the top-level payload keys it reads, and each group counts the
+    children that keep it from its default: the non-true children of an
+    ``AND``, the non-false ones of an ``OR``. A delta re-tests only the
+    leaves of the changed keys and walks up from the leaves whose value
+    changed, stopping at the first node whose own value does not move, so
+    the cost follows the size of the change, not of the rules. Only groups
+    with a failing child are rescanned in order, to find whether the error
+    or a deciding child comes first.
+
+    Outcomes are the ones of ``CompiledRuleSet.evaluate``: a rule passes when
+    its condition is true, and fails when it is false or raises.
+    """
+
+    __slots__ = (
+        "_children",
+        "_counts",
+        "_errors",
+        "_failing",
+        "_kinds",
+        "_leaves_by_key",
+        "_parents",
+        "_predicates",
+        "_values",
+        "payload",
+        "roots",
+    )
+
+    def __init__(
+        self,
+        rules: typ.Iterable[tuple[str, typ.Any]],
+        payload: dict[str, typ.Any],
+    ) -> None:
+        self.payload = dict(payload)
+        self.roots: dict[str, int] = {}
+        self._kinds: list[int] = []
+        self._parents: list[int] = []
+        self._children: list[list[int]] = []
+        self._predicates: list[typ.Any] = []
+        # Per group: children away from the default, and children in error.
+        self._counts: list[int] = []
+        self._errors: list[int] = []
+        self._values: list[int] = []
+        self._leaves_by_key: dict[str, list[int]] = {}
+
+        for name, condition in rules:
+            self.roots[name] = self._add_tree(condition)
+        # Children were added after their parents: settle bottom-up.
+        for node in reversed(range(len(self._kinds))):
+            if self._kinds[node] == _LEAF:
+                self._values[node] = self._test(node)
+            else:
+                self._values[node] = self._group_value(node)
+            parent = self._parents[node]
+            if parent >= 0:
+                self._count(parent, self._values[node], 1)
+        self._failing = sum(self._values[root] != _TRUE for root in self.roots.values())
+
+    def _add_tree(self, condition: typ.Any) -> int:
+        root = len(self._kinds)
+        # Children are pushed reversed so they are numbered in order.
+        stack = [(condition, -1)]
+        while stack:
+            node, parent = stack.pop()
+            index = len(self._kinds)
+            kind = group_kind(node)
+            children = node[kind] if kind is not None else None
+            self._parents.append(parent)
+            if parent >= 0:
+                self._children[parent].append(index)
+            self._counts.append(0)
+            self._errors.append(0)
+            self._values.append(_FALSE)
+            if isinstance(children, list):
+                self._kinds.append(_AND if kind == "AND" else _OR)
+                self._children.append([])
+                self._predicates.append(None)
+                stack.extend((child, index) for child in reversed(children))
+                continue
+            self._kinds.append(_LEAF)
+            self._children.append([])
+            self._predicates.append(compile_leaf(node))
+            keys = set(leaf_fields(node))
+            keys |= {key for key in map(root_key, keys) if key is not None}
+            for key in keys:
+                self._leaves_by_key.setdefault(key, []).append(index)
+        return root
+
+    def _test(self, leaf: int) -> int:
+        try:
+            return _TRUE if self._predicates[leaf](self.payload, None) else _FALSE
+        except Exception:  # noqa: BLE001
+            return _ERROR
+
+    def _count(self, group: int, value: int, step: int) -> None:
+        # Default value of the group: true for AND, false for OR.
+        default = _TRUE if self._kinds[group] == _AND else _FALSE
+        if value != default:
+            self._counts[group] += step
+        if value == _ERROR:
+            self._errors[group] += step
+
+    def _group_value(self, group: int) -> int:
+        default = _TRUE if self._kinds[group] == _AND else _FALSE
+        if not self._counts[group]:
+            return default
+        if not self._errors[group]:
+            return _FALSE if default == _TRUE else _TRUE
+        for child in self._children[group]:
+            if self._values[child] != default:
+                return self._values[child]
+        return default  # pragma: no cover
+
+    def outcomes(self) -> dict[str, bool]:
+        """Current outcome of every rule."""
+        return {name: self._values[root] == _TRUE for name, root in self.roots.items()}
+
+    @property
+    def all_passed(self) -> bool:
+        return self._failing == 0
+
+    def apply(
+        self,
+        changes: dict[str, typ.Any],
+        removed: typ.Iterable[str] = (),
+    ) -> dict[str, bool]:
+        """
+        Set the top-level ``changes`` keys, drop the ``removed`` ones, and
+        return the new outcome of the rules that flipped.
+        """
+        keys = set(changes)
+        self.payload.update(changes)
+        for key in removed:
+            if self.payload.pop(key, MISSING) is not MISSING:
+                keys.add(key)
+
+        # Root -> value before the delta; a root can flip back within it.
+        before: dict[int, int] = {}
+        leaves = {leaf for key in keys for leaf in self._leaves_by_key.get(key, ())}
+        for leaf in leaves:
+            value = self._test(leaf)
+            node = leaf
+            while value != self._values[node]:
+                previous, self._values[node] = self._values[node], value
+                parent = self._parents[node]
+                if parent < 0:
+                    before.setdefault(node, previous)
+                    self._failing += (value != _TRUE) - (previous != _TRUE)
+                    break
+                self._count(parent, previous, -1)
+                self._count(parent, value, 1)
+                node = parent
+                value = self._group_value(node)
+
+        return {
+            name: self._values[root] == _TRUE
+            for name, root in self.roots.items()
+            if root in before
+            and (self._values[root] == _TRUE) != (before[root] == _TRUE)
+        }
@@ -0,0 +1,452 @@
+"""
+Open-loop load generator for the evaluate endpoint.
+
+Requests are sent on a fixed schedule at the target rate whether or not
+earlier ones have finished, and latency is measured from the scheduled
+start, so a stalled server shows up in the tail instead of silently
+lowering the request rate (coordinated omission).
+"""
+
+import asyncio
+import contextlib
+import http.client
+import itertools
+import json
+import random
+import threading
+import typing as typ
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+
+EVALUATE_PATH = "/api/evaluate/"
+REPORT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 100.0)
+# Metrics shown by ``compare_runs``, with whether a higher value is better.
+COMPARED_METRICS = (
+    ("throughput", True),
+    ("error_rate", False),
+    ("p50", False),
+    ("p95", False),
+    ("p99", False),
+    ("max", False),
+)
+
+EvaluateBody = dict[str, typ.Any]
+# Sends one request body, returns the HTTP status code.
+Transport = typ.Callable[[bytes], typ.Awaitable[int]]
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of integer microsecond latencies.
+
+    Values below ``2 ** SUB_BUCKET_BITS`` are counted exactly; above that
+    each power of two is split into ``2 ** (SUB_BUCKET_BITS - 1)`` equal
+    buckets, so any recorded value is reported within 1% of its true value
+    whatever its magnitude, in memory proportional to the value range's
+    logarithm.
+    """
+
+    SUB_BUCKET_BITS = 8
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.total = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(value.bit_length() - self.SUB_BUCKET_BITS, 0)
+        return (shift << self.SUB_BUCKET_BITS) + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        shift = index >> self.SUB_BUCKET_BITS
+        sub_bucket = index & ((1 << self.SUB_BUCKET_BITS) - 1)
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        index = self._index(max(int(value), 0))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+
+    def value_at_percentile(self, percentile: float) -> int:
+        if not self.total:
+            return 0
+        threshold = max(1, round(self.total * percentile / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return self._highest_equivalent(index)
+        return self._highest_equivalent(max(self.counts))
+
+    def percentile_table(self) -> list[tuple[float, int, int]]:
+        """``(percentile, value, count at or below)`` rows, as HDR prints them."""
+        rows = []
+        for percentile in REPORT_PERCENTILES:
+            value = self.value_at_percentile(percentile)
+            below = sum(
+                count
+                for index, count in self.counts.items()
+                if self._highest_equivalent(index) <= value
+            )
+            rows.append((percentile, value, below))
+        return rows
+
+    def to_dict(self) -> dict[str, typ.Any]:
+        return {"sub_bucket_bits": self.SUB_BUCKET_BITS, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, typ.Any]) -> "LatencyHistogram":
+        histogram = cls()
+        if data.get("sub_bucket_bits", cls.SUB_BUCKET_BITS) != cls.SUB_BUCKET_BITS:
+            msg = "Histogram was recorded with a different bucket layout"
+            raise ValueError(msg)
+        for index, count in data["counts"].items():
+            histogram.counts[int(index)] = count
+            histogram.total += count
+        return histogram
+
+
+class RunResult:
+    """Outcome of one load run: latency histogram plus request counters."""
+
+    def __init__(self, *, target_rps: float) -> None:
+        self.target_rps = target_rps
+        self.histogram = LatencyHistogram()
+        self.statuses: dict[str, int] = {}
+        self.errors = 0
+        self.elapsed = 0.0
+
+    @property
+    def requests(self) -> int:
+        return self.histogram.total
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def record(self, latency_us: int, status: int | None) -> None:
+        self.histogram.record(latency_us)
+        key = str(status) if status is not None else "exception"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        # 0: the application finished without sending a response.
+        if not status or status >= 400:  # noqa: PLR2004
+            self.errors += 1
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "throughput": self.throughput,
+            "error_rate": self.error_rate,
+            "p50": self.histogram.value_at_percentile(50),
+            "p95": self.histogram.value_at_percentile(95),
+            "p99": self.histogram.value_at_percentile(99),
+            "max": self.histogram.value_at_percentile(100),
+        }
+
+    def to_dict(self) -> dict[str, typ.Any]:
+        return {
+            "target_rps": self.target_rps,
+            "elapsed": self.elapsed,
+            "errors": self.errors,
+            "statuses": self.statuses,
+            "summary": self.summary(),
+            "histogram": self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, typ.Any]) -> "RunResult":
+        result = cls(target_rps=data["target_rps"])
+        result.elapsed = data["elapsed"]
+        result.errors = data["errors"]
+        result.statuses = data["statuses"]
+        result.histogram = LatencyHistogram.from_dict(data["histogram"])
+        return result
+
+    def report(self) -> str:
+        lines = [
+            f"Requests:   {self.requests} in {self.elapsed:.2f}s "
+            f"(target {self.target_rps:g} rps)",
+            f"Throughput: {self.throughput:,.1f} rps",
+            f"Errors:     {self.errors} ({self.error_rate:.2%})  "
+            + " ".join(
+                f"{status}={count}" for status, count in sorted(self.statuses.items())
+            ),
+            "",
+            f"{'Percentile':>10}  {'Latency (ms)':>12}  {'Count':>8}",
+        ]
+        lines.extend(
+            f"{percentile:>10g}  {value / 1000:>12.3f}  {below:>8}"
+            for percentile, value, below in self.histogram.percentile_table()
+        )
+        return "\n".join(lines)
+
+
+def compare_runs(baseline: RunResult, candidate: RunResult) -> str:
+    """Side-by-side table of two runs; latencies in milliseconds."""
+    before = baseline.summary()
+    after = candidate.summary()
+    lines = [f"{'Metric':<12}{'Baseline':>14}{'Candidate':>14}{'Change':>10}"]
+    for metric, higher_is_better in COMPARED_METRICS:
+        old, new = before[metric], after[metric]
+        if metric == "error_rate":
+            shown = f"{old:>14.2%}{new:>14.2%}"
+        elif metric == "throughput":
+            shown = f"{old:>14,.1f}{new:>14,.1f}"
+        else:
+            shown = f"{old / 1000:>14.3f}{new / 1000:>14.3f}"
+        if old:
+            change = (new - old) / old
+            better = change > 0 if higher_is_better else change < 0
+            verdict = "" if not change else (" better" if better else " worse")
+            shown += f"{change:>+10.1%}{verdict}"
+        lines.append(f"{metric:<12}{shown}")
+    return "\n".join(lines)
+
+
+def recorded_requests(path: str | Path) -> list[EvaluateBody]:
+    """
+    Evaluate bodies from a JSON-lines capture. Each line holds the request
+    body, or any object with ``payload`` and either ``rules`` or
+    ``ruleset``, such as an exported ``Decision``; other keys are ignored.
+    """
+    bodies = []
+    with Path(path).open(encoding="utf-8") as stream:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if (
+                not isinstance(item, dict)
+                or "payload" not in item
+                or ("rules" in item) == ("ruleset" in item)
+            ):
+                msg = (
+                    f"Line {line_number}: expected an object with 'payload' and "
+                    "either 'rules' or 'ruleset'"
+                )
+                raise ValueError(msg)
+            key = "rules" if "rules" in item else "ruleset"
+            bodies.append({key: item[key], "payload": item["payload"]})
+    return bodies
+
+
+def _leaf_values(condition: typ.Any) -> typ.Iterator[tuple[str, typ.Any]]:
+    stack = [condition]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if "AND" in node or "OR" in node:
+            children = node.get("AND", node.get("OR"))
+            if isinstance(children, list):
+                stack.extend(children)
+        elif isinstance(node.get("field"), str):
+            yield node["field"], node.get("value")
+
+
+def synthetic_requests(
+    rules: typ.Iterable[tuple[str, typ.Any]],
+    *,
+    count: int,
+    rules_per_request: int,
+    seed: int | None = None,
+) -> list[EvaluateBody]:
+    """
+    Generate evaluate bodies from ``(name, condition)`` pairs. Payloads
+    reuse the literals found in the conditions, nudged for numbers, so the
+    rules both pass and fail.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    rules = list(rules)
+    if not rules:
+        msg = "No rules to generate traffic for"
+        raise ValueError(msg)
+    literals: dict[str, list[typ.Any]] = {}
+    fields_by_rule: dict[str, list[str]] = {}
+    for name, condition in rules:
+        fields = fields_by_rule.setdefault(name, [])
+        for field, value in _leaf_values(condition):
+            fields.append(field)
+            values = value if isinstance(value, list) else [value]
+            literals.setdefault(field, []).extend(values)
+
+    names = [name for name, _ in rules]
+    bodies = []
+    for _ in range(count):
+        chosen = rng.sample(names, min(rules_per_request, len(names)))
+        payload = {}
+        for name in chosen:
+            for field in fields_by_rule[name]:
+                value = rng.choice(literals[field])
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    value += rng.choice((-1, 0, 1))
+                payload[field] = value
+        bodies.append({"rules": chosen, "payload": payload})
+    return bodies
+
+
+def asgi_transport(
+    app,
+    *,
+    token: str,
+    host: str = "localhost",
+    path: str = EVALUATE_PATH,
+) -> Transport:
+    """Send requests straight to an ASGI application, without a server."""
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"authorization", f"Bearer {token}".encode()),
+        (b"host", host.encode()),
+    ]
+
+    async def send_request(body: bytes) -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [*headers, (b"content-length", str(len(body)).encode())],
+            "client": ("127.0.0.1", 0),
+            "server": (host, 80),
+        }
+        sent = False
+        status = 0
+        # Django cancels the response as soon as the client disconnects.
+        finished = asyncio.Event()
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                await finished.wait()
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body",
+            ):
+                finished.set()
+
+        await app(scope, receive, send)
+        return status
+
+    return send_request
+
+
+def http_transport(url: str, *, token: str, executor: ThreadPoolExecutor) -> Transport:
+    """
+    Send requests to a running server (runserver, uvicorn, gunicorn) over
+    keep-alive connections, one per executor thread.
+    """
+    parts = urlsplit(url)
+    connection_class = (
+        http.client.HTTPSConnection
+        if parts.scheme == "https"
+        else http.client.HTTPConnection
+    )
+    path = parts.path if parts.path not in ("", "/") else EVALUATE_PATH
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+    local = threading.local()
+
+    def post(body: bytes) -> int:
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = local.connection = connection_class(parts.netloc, timeout=30)
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            local.connection = None
+            raise
+        return response.status
+
+    async def send_request(body: bytes) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, post, body)
+
+    return send_request
+
+
+async def _run(
+    transport: Transport,
+    bodies: typ.Sequence[bytes],
+    *,
+    rps: float,
+    duration: float,
+    concurrency: int,
+) -> RunResult:
+    result = RunResult(target_rps=rps)
+    slots = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    total = max(1, int(rps * duration))
+    started = loop.time()
+
+    async def one(body: bytes, scheduled: float) -> None:
+        async with slots:
+            status = None
+            # Counted as an error, like a 5xx.
+            with contextlib.suppress(Exception):
+                status = await transport(body)
+            result.record(int((loop.time() - scheduled) * 1_000_000), status)
+
+    tasks = []
+    for number, body in zip(range(total), itertools.cycle(bodies)):
+        scheduled = started + number / rps
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(body, scheduled)))
+    await asyncio.gather(*tasks)
+    result.elapsed = loop.time() - started
+    return result
+
+
+def run_load(
+    transport: Transport,
+    bodies: typ.Iterable[EvaluateBody],
+    *,
+    rps: float,
+    duration: float,
+    concurrency: int = 64,
+) -> RunResult:
+    """
+    Replay ``bodies`` (cycling through them) at ``rps`` for ``duration``
+    seconds, with at most ``concurrency`` requests in flight.
+
+    The loop is driven through ``async_to_sync`` so that Django code called
+    in-process by ``asgi_transport`` runs on the calling thread.
+    """
+    encoded = [json.dumps(body, separators=(",", ":")).encode() for body in bodies]
+    if not encoded:
+        msg = "No requests to send"
+        raise ValueError(msg)
+    return async_to_sync(_run)(
+        transport,
+        encoded,
+        rps=rps,
+        duration=duration,
+        concurrency=concurrency,
+    )
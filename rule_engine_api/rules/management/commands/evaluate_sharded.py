@@ -0,0 +1,126 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.footprint import synthetic_rules
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.sharding import DEFAULT_TIMEOUT
+from rule_engine_api.rules.sharding import PARTITION_KEYS
+from rule_engine_api.rules.sharding import ShardedRuleSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate all active rules against JSON lines payloads, scatter-gather "
+        "over worker processes that each hold one shard of the rules."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "payloads",
+            help="JSON lines file of payload objects, '-' for stdin.",
+        )
+        parser.add_argument("--shards", type=int, default=2)
+        parser.add_argument(
+            "--replicas",
+            type=int,
+            default=1,
+            help="Worker processes per shard.",
+        )
+        parser.add_argument(
+            "--by",
+            choices=PARTITION_KEYS,
+            default="name",
+            help="Key rules are hashed by.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=DEFAULT_TIMEOUT,
+            help="Seconds to wait for the shards.",
+        )
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            help="Evaluate this many generated rules instead of the active ones.",
+        )
+        parser.add_argument("--seed", type=int)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Also evaluate in this process and fail on any difference.",
+        )
+
+    def handle(self, *args, **options):
+        if options["shards"] <= 0 or options["replicas"] <= 0:
+            msg = "--shards and --replicas must be positive"
+            raise CommandError(msg)
+        if options["synthetic"] is not None:
+            rules = synthetic_rules(options["synthetic"], seed=options["seed"])
+        else:
+            rules = list(
+                Rule.objects.filter(is_active=True)
+                .values_list("name", "condition")
+                .iterator(),
+            )
+        if not rules:
+            msg = "There are no active rules; pass --synthetic to generate some."
+            raise CommandError(msg)
+        compiled = CompiledRuleSet(rules) if options["check"] else None
+
+        start = time.perf_counter()
+        with ShardedRuleSet(
+            rules,
+            shards=options["shards"],
+            replicas=options["replicas"],
+            by=options["by"],
+            timeout=options["timeout"],
+        ) as sharded:
+            # The workers have their own copy.
+            del rules
+            self.stderr.write(f"Started in {time.perf_counter() - start:.2f}s")
+            for shard, names in sharded.shard_rules.items():
+                ready = sum(
+                    worker.rule_count is not None for worker in sharded.groups[shard]
+                )
+                self.stderr.write(f"{shard}: {len(names)} rules, {ready} workers ready")
+            if options["payloads"] == "-":
+                self._evaluate(sharded, compiled, sys.stdin)
+            else:
+                with Path(options["payloads"]).open(encoding="utf-8") as lines:
+                    self._evaluate(sharded, compiled, lines)
+
+    def _evaluate(self, sharded, compiled, lines):
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"Line {number}: {exc}") from exc  # noqa: TRY003, EM102
+            if not isinstance(payload, dict):
+                raise CommandError(f"Line {number}: expected a JSON object")  # noqa: TRY003, EM102
+            result = sharded.scatter(payload)
+            if compiled is not None and not result.unavailable:
+                passed, failed = compiled.evaluate(payload)
+                if (sorted(passed), sorted(failed)) != (result.passed, result.failed):
+                    raise CommandError(f"Line {number}: sharded outcomes differ")  # noqa: TRY003, EM102
+            self.stdout.write(
+                json.dumps(
+                    {
+                        # Unavailable rules are not known to pass.
+                        "result": "REJECTED"
+                        if result.failed or result.unavailable
+                        else "APPROVED",
+                        "passed_rules": result.passed,
+                        "failed_rules": result.failed,
+                        "unavailable_rules": result.unavailable,
+                        "errors": result.errors,
+                    },
+                ),
+            )
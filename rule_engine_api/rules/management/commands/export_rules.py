@@ -0,0 +1,64 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from rule_engine_api.rules.models import Rule
+
+
+class Command(BaseCommand):
+    help = "Stream rules as JSON lines (name, condition, is_active)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output",
+            nargs="?",
+            default="-",
+            help="Destination file, '-' (default) writes to stdout.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--active-only",
+            action="store_true",
+            help="Skip inactive rules.",
+        )
+        parser.add_argument(
+            "--progress-every",
+            type=int,
+            default=100_000,
+            help="Report progress on stderr every N rules.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Rule.objects.order_by("id")
+        if options["active_only"]:
+            queryset = queryset.filter(is_active=True)
+        rows = queryset.values_list("name", "condition", "is_active").iterator(
+            chunk_size=options["chunk_size"],
+        )
+
+        if options["output"] == "-":
+            self._export(rows, self.stdout, options["progress_every"])
+        else:
+            with Path(options["output"]).open("w", encoding="utf-8") as stream:
+                self._export(rows, stream, options["progress_every"])
+
+    def _export(self, rows, stream, progress_every):
+        started = time.monotonic()
+        count = 0
+        for name, condition, is_active in rows:
+            line = json.dumps(
+                {"name": name, "condition": condition, "is_active": is_active},
+                separators=(",", ":"),
+            )
+            stream.write(line + "\n")
+            count += 1
+            if count % progress_every == 0:
+                self._report(count, started)
+        self._report(count, started)
+
+    def _report(self, count, started):
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed else 0
+        self.stderr.write(f"Exported {count} rules ({rate:,.0f} rules/s)")
@@ -0,0 +1,99 @@
+import json
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from rule_engine_api.rules.api.serializers import RuleImportSerializer
+from rule_engine_api.rules.bulk import upsert_rules
+from rule_engine_api.rules.versioning import batched_version_bump
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert rules by name from JSON lines as written by export_rules. "
+        "Rows are validated and written chunk by chunk, so memory stays flat."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "input",
+            nargs="?",
+            default="-",
+            help="Source file, '-' (default) reads from stdin.",
+        )
+        parser.add_argument(
+            "--created-by",
+            required=True,
+            help="Username recorded as the creator of new rules.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            created_by = User.objects.get(username=options["created_by"])
+        except User.DoesNotExist as exc:
+            msg = f"Unknown user: {options['created_by']}"
+            raise CommandError(msg) from exc
+
+        source = options["input"]
+        # Entered by the ``with`` below, together with the version bump.
+        opened = (
+            nullcontext(sys.stdin)
+            if source == "-"
+            else Path(source).open(encoding="utf-8")  # noqa: SIM115
+        )
+        self.started = time.monotonic()
+        self.imported = 0
+        self.skipped = 0
+        # One version bump for the whole import, not one per chunk.
+        with opened as stream, batched_version_bump():
+            chunk = []
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                chunk.append((line_number, line))
+                if len(chunk) >= options["chunk_size"]:
+                    self._import_chunk(chunk, created_by)
+                    chunk = []
+            if chunk:
+                self._import_chunk(chunk, created_by)
+
+        if self.skipped:
+            msg = (
+                f"Imported {self.imported} rules, "
+                f"skipped {self.skipped} invalid line(s)."
+            )
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS(f"Imported {self.imported} rules."))
+
+    def _import_chunk(self, chunk, created_by):
+        valid = []
+        for line_number, line in chunk:
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as exc:
+                self._skip(line_number, str(exc))
+                continue
+            serializer = RuleImportSerializer(data=data)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                self._skip(line_number, serializer.errors)
+
+        if valid:
+            upsert_rules(valid, created_by)
+            self.imported += len(valid)
+        elapsed = time.monotonic() - self.started
+        rate = self.imported / elapsed if elapsed else 0
+        self.stderr.write(f"Imported {self.imported} rules ({rate:,.0f} rules/s)")
+
+    def _skip(self, line_number, reason):
+        self.skipped += 1
+        self.stderr.write(f"Line {line_number}: {reason}")
@@ -0,0 +1,175 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from rule_engine_api.rules.loadtest import RunResult
+from rule_engine_api.rules.loadtest import asgi_transport
+from rule_engine_api.rules.loadtest import compare_runs
+from rule_engine_api.rules.loadtest import http_transport
+from rule_engine_api.rules.loadtest import recorded_requests
+from rule_engine_api.rules.loadtest import run_load
+from rule_engine_api.rules.loadtest import synthetic_requests
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.users.api.serializers import RoleTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the evaluate endpoint with recorded or synthetic traffic "
+        "at a target rate, or compare two saved runs."
+    )
+
+    def add_arguments(self, parser):
+        subcommands = parser.add_subparsers(dest="subcommand", required=True)
+
+        run = subcommands.add_parser("run", help="Send traffic and report latency.")
+        run.add_argument(
+            "--url",
+            help="Server to target, e.g. http://127.0.0.1:8000. "
+            "Without it requests go to this project's ASGI app in-process.",
+        )
+        run.add_argument(
+            "--host",
+            default="localhost",
+            help="Host header for in-process requests, must be in ALLOWED_HOSTS.",
+        )
+        auth = run.add_mutually_exclusive_group(required=True)
+        auth.add_argument("--token", help="Access token to send.")
+        auth.add_argument("--user", help="Username to issue an access token for.")
+        run.add_argument(
+            "--requests",
+            help="JSON lines of evaluate bodies to replay. "
+            "Without it traffic is generated from the active rules.",
+        )
+        run.add_argument("--synthetic-count", type=int, default=1000)
+        run.add_argument("--rules-per-request", type=int, default=5)
+        run.add_argument("--max-rules", type=int, default=1000)
+        run.add_argument("--seed", type=int)
+        run.add_argument(
+            "--rps",
+            type=float,
+            default=100.0,
+            help="Target requests per second.",
+        )
+        run.add_argument(
+            "--duration",
+            type=float,
+            default=10.0,
+            help="Seconds to send for.",
+        )
+        run.add_argument(
+            "--concurrency",
+            type=int,
+            default=64,
+            help=(
+                "Requests in flight at most; later ones queue and the wait "
+                "counts as latency."
+            ),
+        )
+        run.add_argument(
+            "--output",
+            help="Save the run as JSON for a later comparison.",
+        )
+        run.add_argument("--baseline", help="Saved run to compare this one with.")
+
+        compare = subcommands.add_parser("compare", help="Compare two saved runs.")
+        compare.add_argument("baseline")
+        compare.add_argument("candidate")
+
+    def handle(self, *args, **options):
+        if options["subcommand"] == "compare":
+            self.stdout.write(
+                compare_runs(
+                    self._load(options["baseline"]),
+                    self._load(options["candidate"]),
+                ),
+            )
+            return
+
+        if (
+            options["rps"] <= 0
+            or options["duration"] <= 0
+            or options["concurrency"] <= 0
+        ):
+            msg = "--rps, --duration and --concurrency must be positive"
+            raise CommandError(msg)
+        baseline = self._load(options["baseline"]) if options["baseline"] else None
+        bodies = self._bodies(options)
+        token = options["token"] or self._issue_token(options["user"])
+
+        executor = None
+        if options["url"]:
+            executor = ThreadPoolExecutor(max_workers=options["concurrency"])
+            transport = http_transport(options["url"], token=token, executor=executor)
+        else:
+            transport = asgi_transport(
+                get_asgi_application(),
+                token=token,
+                host=options["host"],
+            )
+        try:
+            result = run_load(
+                transport,
+                bodies,
+                rps=options["rps"],
+                duration=options["duration"],
+                concurrency=options["concurrency"],
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(result.report())
+        if options["output"]:
+            Path(options["output"]).write_text(
+                json.dumps(result.to_dict()),
+                encoding="utf-8",
+            )
+        if baseline is not None:
+            self.stdout.write("")
+            self.stdout.write(compare_runs(baseline, result))
+
+    def _bodies(self, options):
+        try:
+            if options["requests"]:
+                return recorded_requests(options["requests"])
+            rules = (
+                Rule.objects.filter(is_active=True)
+                .order_by("name")
+                .values_list(
+                    "name",
+                    "condition",
+                )[: options["max_rules"]]
+            )
+            return synthetic_requests(
+                rules,
+                count=options["synthetic_count"],
+                rules_per_request=options["rules_per_request"],
+                seed=options["seed"],
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+    def _issue_token(self, username):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist as exc:
+            msg = f"Unknown user: {username}"
+            raise CommandError(msg) from exc
+        return str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+
+    def _load(self, path):
+        try:
+            return RunResult.from_dict(
+                json.loads(Path(path).read_text(encoding="utf-8")),
+            )
+        except (OSError, ValueError, KeyError) as exc:
+            msg = f"Cannot read run {path}: {exc}"
+            raise CommandError(msg) from exc
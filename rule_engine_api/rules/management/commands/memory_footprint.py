@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from rule_engine_api.rules.footprint import REPRESENTATIONS
+from rule_engine_api.rules.footprint import footprint_report
+from rule_engine_api.rules.footprint import measure
+from rule_engine_api.rules.footprint import synthetic_rules
+from rule_engine_api.rules.models import Rule
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the memory held by the active rules in each representation: "
+        "model instances, condition dicts, compiled and packed rulesets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            help="Measure this many generated rules instead of the active ones.",
+        )
+        parser.add_argument(
+            "--fields",
+            type=int,
+            default=50,
+            help="Payload fields of generated rules.",
+        )
+        parser.add_argument("--seed", type=int)
+        parser.add_argument(
+            "--representation",
+            action="append",
+            choices=list(REPRESENTATIONS),
+            help="Representation to measure, repeatable; all by default.",
+        )
+
+    def handle(self, *args, **options):
+        if options["synthetic"] is not None:
+            if options["synthetic"] <= 0 or options["fields"] <= 0:
+                msg = "--synthetic and --fields must be positive"
+                raise CommandError(msg)
+            rules = synthetic_rules(
+                options["synthetic"],
+                fields=options["fields"],
+                seed=options["seed"],
+            )
+        else:
+            rules = list(
+                Rule.objects.filter(is_active=True)
+                .order_by("name")
+                .values_list("name", "condition"),
+            )
+            if not rules:
+                msg = "There are no active rules; pass --synthetic to generate some."
+                raise CommandError(msg)
+
+        footprints = [
+            measure(representation, rules)
+            for representation in options["representation"] or REPRESENTATIONS
+        ]
+        self.stdout.write(f"{len(rules)} rules")
+        self.stdout.write(footprint_report(footprints))
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.normalize import is_always_false
+from rule_engine_api.rules.normalize import is_always_true
+from rule_engine_api.rules.normalize import normalize_condition
+from rule_engine_api.rules.versioning import batched_version_bump
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite stored rule conditions into their normalized form and "
+        "refresh the columns derived from them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rules written per UPDATE statement.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the rules that would change without saving them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        pending = []
+        changed = 0
+
+        update_fields = ["condition", *Rule.DERIVED_FIELDS, "updated_at"]
+        # One version bump for the whole run, not one per rule.
+        with batched_version_bump():
+            for rule in Rule.objects.iterator(chunk_size=batch_size):
+                normalized = normalize_condition(rule.condition)
+                if is_always_true(normalized):
+                    self.stdout.write(self.style.WARNING(f"{rule.name}: always true"))
+                elif is_always_false(normalized):
+                    self.stdout.write(self.style.WARNING(f"{rule.name}: always false"))
+                stored = [getattr(rule, field) for field in Rule.DERIVED_FIELDS]
+                condition, rule.condition = rule.condition, normalized
+                rule.refresh_derived_fields()
+                # Also backfills derived columns older rows were saved without.
+                if normalized == condition and stored == [
+                    getattr(rule, field) for field in Rule.DERIVED_FIELDS
+                ]:
+                    continue
+
+                changed += 1
+                if dry_run:
+                    continue
+                # bulk_update() skips auto_now, bump it so compiled caches refresh.
+                rule.updated_at = timezone.now()
+                pending.append(rule)
+                if len(pending) >= batch_size:
+                    Rule.objects.bulk_update(pending, update_fields)
+                    pending = []
+
+            if pending:
+                Rule.objects.bulk_update(pending, update_fields)
+
+        verb = "Would normalize" if dry_run else "Normalized"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {changed} rule(s)."))
@@ -0,0 +1,85 @@
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from rule_engine_api.rules.startup import DEFAULT_TARGETS
+from rule_engine_api.rules.startup import StartupProfile
+from rule_engine_api.rules.startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot entry points in fresh interpreters and report per-module import "
+        "time, app registry readiness and first request latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="*",
+            default=list(DEFAULT_TARGETS),
+            help=f"Entry point modules, by default {', '.join(DEFAULT_TARGETS)}.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Probes per target; medians are reported.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Imports listed per ranking.",
+        )
+        parser.add_argument(
+            "--path",
+            default="/api/evaluate/",
+            help="Path of the first request.",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="Host header of the first request, must be in ALLOWED_HOSTS.",
+        )
+        parser.add_argument("--output", help="Save the profiles as JSON.")
+
+    def handle(self, *args, **options):
+        if options["repeat"] <= 0:
+            msg = "--repeat must be positive"
+            raise CommandError(msg)
+        # Probes boot with this command's settings, whatever their default.
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [str(settings.BASE_DIR), os.environ.get("PYTHONPATH")]),
+            ),
+        }
+        profiles: list[StartupProfile] = []
+        for target in options["targets"]:
+            try:
+                profile = profile_startup(
+                    target,
+                    repeat=options["repeat"],
+                    path=options["path"],
+                    host=options["host"],
+                    env=env,
+                    cwd=str(settings.BASE_DIR),
+                )
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+            if profiles:
+                self.stdout.write("")
+            self.stdout.write(profile.report(top=options["top"]))
+            profiles.append(profile)
+
+        if options["output"]:
+            Path(options["output"]).write_text(
+                json.dumps([profile.to_dict() for profile in profiles]),
+                encoding="utf-8",
+            )
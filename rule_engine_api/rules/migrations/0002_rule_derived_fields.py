@@ -0,0 +1,41 @@
+# Generated by Django 5.1.11 on 2026-10-19 14:14
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+# Existing rows are backfilled by ``manage.py normalize_rules``, which uses
+# the current normalizer rather than a copy frozen into this migration.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rule',
+            name='canonical_condition',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='condition_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='fields',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='max_depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='node_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.11 on 2026-10-19 14:18
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0002_rule_derived_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rule',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], include=('updated_at',), name='rule_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rule',
+            index=models.Index(fields=['updated_at', 'id'], name='rule_updated_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rule',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['fields'], name='rule_fields_gin_idx'),
+        ),
+    ]
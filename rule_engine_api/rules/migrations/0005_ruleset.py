@@ -0,0 +1,48 @@
+# Generated by Django 5.1.11 on 2026-10-19 14:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0004_decision'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RuleSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rulesets', related_query_name='ruleset', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RuleSetMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='rules.rule')),
+                ('ruleset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='rules.ruleset')),
+            ],
+            options={
+                'ordering': ['position', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='ruleset',
+            name='rules',
+            field=models.ManyToManyField(related_name='rulesets', related_query_name='ruleset', through='rules.RuleSetMembership', to='rules.rule'),
+        ),
+        migrations.AddConstraint(
+            model_name='rulesetmembership',
+            constraint=models.UniqueConstraint(fields=('ruleset', 'rule'), name='ruleset_rule_unique'),
+        ),
+    ]
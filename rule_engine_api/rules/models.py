@@ -1,13 +1,195 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import JSONField
+from django.utils import timezone
+
+from rule_engine_api.rules.normalize import canonicalize_condition
+from rule_engine_api.rules.normalize import condition_hash
+from rule_engine_api.rules.normalize import condition_stats
+from rule_engine_api.rules.normalize import referenced_fields
+from rule_engine_api.rules.rule_engine import condition_errors
 
 User = get_user_model()
 
+
+class RuleQuerySet(models.QuerySet):
+    def referencing(self, field: str) -> "RuleQuerySet":
+        """Rules whose condition reads ``field``."""
+        return self.filter(fields__contains=[field])
+
+    def duplicates_of(self, condition) -> "RuleQuerySet":
+        """Rules whose condition is equivalent to ``condition``."""
+        return self.filter(
+            condition_hash=condition_hash(canonicalize_condition(condition)),
+        )
+
+
 class Rule(models.Model):
+    # Columns derived from ``condition`` and kept in sync by ``save()``.
+    DERIVED_FIELDS = (
+        "canonical_condition",
+        "condition_hash",
+        "fields",
+        "node_count",
+        "max_depth",
+    )
+
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_query_name="rule", related_name="rules")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     name = models.CharField(max_length=255, unique=True, blank=False)
     condition = JSONField(blank=False)
     is_active = models.BooleanField(default=True)
+
+    # ``condition`` with sorted children, to find equivalent rules. Only
+    # ``condition`` is evaluated: the order of the children decides which
+    # ones are evaluated, and so whether a raising one fails the rule.
+    canonical_condition = JSONField(default=dict, editable=False)
+    condition_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    fields = ArrayField(
+        models.CharField(max_length=255),
+        default=list,
+        blank=True,
+        editable=False,
+    )
+    node_count = models.PositiveIntegerField(default=0, editable=False)
+    max_depth = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = RuleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Evaluation looks up active rules by name and only needs the time
+            # they last changed to hit the compiled-ruleset cache: an
+            # index-only scan.
+            models.Index(
+                fields=["name"],
+                name="rule_active_name_idx",
+                condition=models.Q(is_active=True),
+                include=["updated_at"],
+            ),
+            # Keyset pagination and incremental syncs walk (updated_at, id).
+            models.Index(fields=["updated_at", "id"], name="rule_updated_at_id_idx"),
+            # RuleQuerySet.referencing() filters with ``fields @> ARRAY[...]``.
+            GinIndex(fields=["fields"], name="rule_fields_gin_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "condition" in update_fields:
+            self.refresh_derived_fields()
+            if update_fields is not None:
+                # ``updated_at`` keys the compiled rulesets.
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    *self.DERIVED_FIELDS,
+                    "updated_at",
+                }
+        super().save(*args, **kwargs)
+
+    def clean(self) -> None:
+        errors = condition_errors(
+            self.condition,
+            max_depth=settings.RULES_MAX_CONDITION_DEPTH,
+            max_nodes=settings.RULES_MAX_CONDITION_NODES,
+        )
+        if errors:
+            raise ValidationError({"condition": errors})
+
+    def refresh_derived_fields(self) -> None:
+        """Recompute the ``DERIVED_FIELDS`` from ``condition``."""
+        self.canonical_condition = canonicalize_condition(self.condition)
+        self.condition_hash = condition_hash(self.canonical_condition)
+        self.fields = referenced_fields(self.canonical_condition)
+        self.node_count, self.max_depth = condition_stats(self.canonical_condition)
+
+
+class RuleSet(models.Model):
+    """A named, ordered group of rules that can be evaluated by its name."""
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_query_name="ruleset",
+        related_name="rulesets",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    name = models.CharField(max_length=255, unique=True, blank=False)
+    description = models.TextField(blank=True)
+    rules = models.ManyToManyField(  # type: ignore[var-annotated]
+        Rule,
+        through="RuleSetMembership",
+        related_query_name="ruleset",
+        related_name="rulesets",
+    )
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class RuleSetMembership(models.Model):
+    ruleset = models.ForeignKey(
+        RuleSet,
+        on_delete=models.CASCADE,
+        related_name="memberships",
+    )
+    rule = models.ForeignKey(
+        Rule,
+        on_delete=models.CASCADE,
+        related_name="memberships",
+    )
+    # Rules are evaluated and reported in this order.
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["position", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ruleset", "rule"],
+                name="ruleset_rule_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.ruleset_id}: {self.rule_id} at {self.position}"
+
+
+class Decision(models.Model):
+    """Audit record of one evaluation, written in batches by ``audit.DecisionLog``."""
+
+    class ResultChoice(models.TextChoices):
+        APPROVED = "APPROVED"
+        REJECTED = "REJECTED"
+
+    # Set when the decision is made, not when the batch is flushed.
+    created_at = models.DateTimeField(default=timezone.now)
+    user = models.ForeignKey(
+        User,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_query_name="decision",
+        related_name="decisions",
+    )
+    rules = ArrayField(models.CharField(max_length=255), default=list)
+    payload = JSONField(default=dict)
+    result = models.CharField(max_length=8, choices=ResultChoice.choices)
+    passed_rules = ArrayField(models.CharField(max_length=255), default=list)
+    failed_rules = ArrayField(models.CharField(max_length=255), default=list)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="decision_created_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.result} at {self.created_at:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,419 @@
+import hashlib
+import json
+import math
+import re
+import typing as typ
+
+from rule_engine_api.rules.decision_table import canonical_table
+from rule_engine_api.rules.decision_table import is_table
+from rule_engine_api.rules.decision_table import table_columns
+from rule_engine_api.rules.paths import parse_field_path
+
+# An empty AND holds for every payload and an empty OR for none, so the
+# existing evaluator already understands both constants.
+ALWAYS_TRUE: dict[str, list] = {"AND": []}
+ALWAYS_FALSE: dict[str, list] = {"OR": []}
+
+RANGE_OPERATORS = frozenset({">", ">=", "<", "<="})
+
+
+def is_always_true(condition: typ.Any) -> bool:
+    return condition == ALWAYS_TRUE
+
+
+def is_always_false(condition: typ.Any) -> bool:
+    return condition == ALWAYS_FALSE
+
+
+def normalize_condition(condition: typ.Any) -> typ.Any:
+    """
+    Rewrite a condition into a smaller form with the same outcome for every
+    payload, including which payloads make its evaluation raise.
+
+    - nested ``AND``/``OR`` nodes of the same kind are flattened and
+      single-child groups are replaced by their child
+    - duplicate sub-conditions are dropped
+    - numeric ``>``/``>=``/``<``/``<=`` leaves on one field inside an ``AND``
+      are merged into a single interval
+    - ``field == a`` and ``field in [b]`` leaves inside an ``OR`` are merged
+      into one ``in`` leaf
+    - contradictions collapse to ``{"OR": []}`` (always false) and
+      tautologies to ``{"AND": []}`` (always true)
+
+    A raising sub-condition fails the whole rule, even where an ``OR``
+    sibling would have held. So leaves are only moved across, and only
+    dropped in favour of a constant, sub-conditions that cannot raise.
+
+    Anything that is not a condition tree (e.g. a bare list) is returned
+    unchanged.
+    """
+    normalized = _normalize(condition)
+    # A rule fails alike whether its condition is false or raises: at the
+    # root, an AND reaching a contradiction never passes.
+    children = normalized.get("AND") if isinstance(normalized, dict) else None
+    if isinstance(children, list) and children and children[-1] == ALWAYS_FALSE:
+        return ALWAYS_FALSE
+    return normalized
+
+
+def _normalize(condition: typ.Any) -> typ.Any:
+    if not isinstance(condition, dict):
+        return condition
+    if "AND" in condition:
+        return _normalize_group("AND", condition["AND"])
+    if "OR" in condition:
+        return _normalize_group("OR", condition["OR"])
+    return dict(condition)
+
+
+def _condition_key(condition: typ.Any) -> str:
+    return json.dumps(condition, sort_keys=True, default=str)
+
+
+def _normalize_group(kind: str, children: typ.Any) -> typ.Any:
+    if not isinstance(children, list):
+        return {kind: children}
+
+    identity, absorbing = (
+        (ALWAYS_TRUE, ALWAYS_FALSE) if kind == "AND" else (ALWAYS_FALSE, ALWAYS_TRUE)
+    )
+    flat = _flatten(kind, children, identity, absorbing)
+    flat = _complement_equalities(flat, absorbing)
+    flat = _merge_and_leaves(flat) if kind == "AND" else _merge_or_equalities(flat)
+    if absorbing in flat:
+        # Nothing after the constant is evaluated, and safe sub-conditions
+        # right before it cannot change the outcome.
+        flat = flat[: flat.index(absorbing)]
+        while flat and is_safe(flat[-1]):
+            flat.pop()
+        flat.append(absorbing)
+
+    if not flat:
+        return identity
+    if len(flat) == 1:
+        return flat[0]
+    return {kind: flat}
+
+
+def _flatten(
+    kind: str,
+    children: list[typ.Any],
+    identity: typ.Any,
+    absorbing: typ.Any,
+) -> list[typ.Any]:
+    """Normalized children, nested groups of the same ``kind`` inlined."""
+    flat: list[typ.Any] = []
+    seen: set[str] = set()
+    for child in map(_normalize, children):
+        if child == identity:
+            continue
+        nested = child.get(kind) if isinstance(child, dict) else None
+        for grandchild in nested if isinstance(nested, list) else [child]:
+            # A repeated sub-condition is only reached with the outcome its
+            # first occurrence let through: it can be dropped.
+            key = _condition_key(grandchild)
+            if key not in seen:
+                seen.add(key)
+                flat.append(grandchild)
+        if absorbing in flat:
+            break
+    return flat
+
+
+def _is_leaf(condition: typ.Any) -> bool:
+    return (
+        isinstance(condition, dict)
+        and "AND" not in condition
+        and "OR" not in condition
+        and isinstance(condition.get("field"), str)
+    )
+
+
+def _is_number(value: typ.Any) -> bool:
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+# Leaf tests that never raise, whatever the payload holds, given a literal
+# accepted by the operator.
+_SAFE_OPERATORS: dict[str, typ.Callable[[typ.Any], bool]] = {
+    "==": lambda value: True,
+    "!=": lambda value: True,
+    "in": lambda value: isinstance(value, list),
+    "not_in": lambda value: isinstance(value, list),
+    "exists": lambda value: True,
+    "is_null": lambda value: True,
+    # ``5 in "abc"`` raises, a string literal is found in strings and lists.
+    "contains": lambda value: isinstance(value, str),
+    "startswith": lambda value: isinstance(value, str),
+    "endswith": lambda value: isinstance(value, str),
+    "regex": lambda value: isinstance(value, str) and _compiles(value),
+}
+
+
+def _compiles(pattern: str) -> bool:
+    try:
+        re.compile(pattern)
+    except re.error:
+        return False
+    return True
+
+
+def is_safe(condition: typ.Any) -> bool:
+    """
+    Whether evaluating ``condition`` can never raise: its leaves are all
+    equality, membership, presence or string tests on valid field paths.
+    Range comparisons raise on values that do not order with the literal.
+    """
+    stack = [condition]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            return False
+        if "AND" in node or "OR" in node:
+            children = node["AND"] if "AND" in node else node["OR"]
+            if not isinstance(children, list):
+                return False
+            stack.extend(children)
+            continue
+        allowed = _SAFE_OPERATORS.get(str(node.get("operator")))
+        if allowed is None or not allowed(node.get("value")):
+            return False
+        field = node.get("field")
+        if isinstance(field, str) and not _is_valid_path(field):
+            return False
+    return True
+
+
+def _is_valid_path(field: str) -> bool:
+    try:
+        parse_field_path(field)
+    except ValueError:
+        return False
+    return True
+
+
+def _complement_equalities(
+    children: list[typ.Any],
+    absorbing: typ.Any,
+) -> list[typ.Any]:
+    """
+    Replace the second of ``field == v`` and ``field != v`` by ``absorbing``:
+    it is only reached when the first did not decide the group, which
+    decides the second one. Under ``AND`` that is always false, under
+    ``OR`` always true, whatever the payload contains.
+    """
+    seen = set()
+    for index, child in enumerate(children):
+        operator = child.get("operator") if _is_leaf(child) else None
+        if operator not in {"==", "!="}:
+            continue
+        key = (child["field"], _condition_key(child.get("value")))
+        if (key, "!=" if operator == "==" else "==") in seen:
+            return [*children[:index], absorbing]
+        seen.add((key, operator))
+    return children
+
+
+def _merge_or_equalities(children: list[typ.Any]) -> list[typ.Any]:
+    """
+    Replace ``field == a OR field == b OR field in [c]`` by one
+    ``field in [a, b, c]`` leaf, which is a single set lookup to evaluate.
+    Later leaves are moved to the first one, so they are only merged over
+    siblings that cannot raise.
+    """
+    result: list[typ.Any] = []
+    # Field -> position in ``result`` of the leaf later ones merge into.
+    open_fields: dict[str, int] = {}
+    for child in children:
+        if not _is_membership_leaf(child):
+            if not is_safe(child):
+                open_fields.clear()
+            result.append(child)
+            continue
+        field = child["field"]
+        index = open_fields.get(field)
+        if index is None:
+            open_fields[field] = len(result)
+            result.append(child)
+            continue
+        values = [*_members(result[index]), *_members(child)]
+        result[index] = {
+            "field": field,
+            "operator": "in",
+            "value": list(dict.fromkeys(values)),
+        }
+    return result
+
+
+def _members(leaf: dict[str, typ.Any]) -> list[typ.Any]:
+    return leaf["value"] if leaf["operator"] == "in" else [leaf["value"]]
+
+
+def _is_membership_leaf(condition: typ.Any) -> bool:
+    if not _is_leaf(condition) or not is_safe(condition):
+        return False
+    operator, value = condition.get("operator"), condition.get("value")
+    if operator == "==":
+        return _is_hashable_scalar(value)
+    return operator == "in" and all(map(_is_hashable_scalar, value))
+
+
+def _is_hashable_scalar(value: typ.Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _is_range_leaf(condition: typ.Any) -> bool:
+    return (
+        _is_leaf(condition)
+        and condition.get("operator") in RANGE_OPERATORS
+        and _is_number(condition.get("value"))
+        and _is_valid_path(condition["field"])
+    )
+
+
+class _Interval:
+    """Bounds collected from the range leaves of one field."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.lower: tuple[typ.Any, bool] | None = None
+        self.upper: tuple[typ.Any, bool] | None = None
+
+    def add(self, operator: str, value: typ.Any) -> None:
+        if operator in {">", ">="}:
+            inclusive = operator == ">="
+            tighter = (value, not inclusive)
+            if self.lower is None or tighter > (self.lower[0], not self.lower[1]):
+                self.lower = (value, inclusive)
+        else:
+            inclusive = operator == "<="
+            if self.upper is None or (value, inclusive) < self.upper:
+                self.upper = (value, inclusive)
+
+    def _leaf(
+        self,
+        bound: tuple[typ.Any, bool],
+        operators: tuple[str, str],
+    ) -> dict[str, typ.Any]:
+        value, inclusive = bound
+        return {"field": self.field, "operator": operators[inclusive], "value": value}
+
+    def leaves(self) -> list[dict[str, typ.Any]]:
+        """
+        The merged leaves. When no number satisfies them, one bound is kept
+        before ``{"OR": []}``: like the original leaves, it raises on values
+        that do not order with numbers.
+        """
+        leaves = []
+        if self.lower is not None:
+            leaves.append(self._leaf(self.lower, (">", ">=")))
+        if self.upper is not None:
+            leaves.append(self._leaf(self.upper, ("<", "<=")))
+        if self.lower is not None and self.upper is not None:
+            (low, low_inclusive), (high, high_inclusive) = self.lower, self.upper
+            if low > high or (low == high and not (low_inclusive and high_inclusive)):
+                return [leaves[0], ALWAYS_FALSE]
+        return leaves
+
+
+def _merge_and_leaves(children: list[typ.Any]) -> list[typ.Any]:
+    """
+    Merge the numeric comparison leaves of an ``AND`` field by field. A
+    leaf joins the earlier leaves of its field only over siblings that
+    cannot raise: they all raise or none do, for a given payload.
+    """
+    merged: list[typ.Any] = []
+    interval: _Interval | None = None
+    for child in children:
+        if _is_range_leaf(child):
+            if interval is None or interval.field != child["field"]:
+                # The interval doubles as a placeholder so the merged leaves
+                # end up where the field first appeared.
+                interval = _Interval(child["field"])
+                merged.append(interval)
+            interval.add(child["operator"], child["value"])
+            continue
+        if not is_safe(child):
+            interval = None
+        merged.append(child)
+
+    result: list[typ.Any] = []
+    for child in merged:
+        result.extend(child.leaves() if isinstance(child, _Interval) else [child])
+    return result
+
+
+def canonicalize_condition(condition: typ.Any) -> typ.Any:
+    """
+    Normalize ``condition`` and sort the children of every ``AND``/``OR``,
+    so that equivalent conditions written in a different order compare equal.
+    """
+    return _sort_children(normalize_condition(condition))
+
+
+def _sort_children(condition: typ.Any) -> typ.Any:
+    if not isinstance(condition, dict):
+        return condition
+    for kind in ("AND", "OR"):
+        children = condition.get(kind)
+        if isinstance(children, list):
+            return {kind: sorted(map(_sort_children, children), key=_condition_key)}
+    if is_table(condition) and isinstance(condition["table"], dict):
+        return {**condition, "table": canonical_table(condition["table"])}
+    operator, value = condition.get("operator"), condition.get("value")
+    if operator in {"in", "not_in"} and isinstance(value, list):
+        # Set semantics: literal order does not matter.
+        return {**condition, "value": sorted(value, key=_condition_key)}
+    return condition
+
+
+def condition_hash(canonical: typ.Any) -> str:
+    """Content hash of an already canonical condition."""
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def leaf_fields(node: typ.Any) -> list[str]:
+    """Fields a leaf reads: its ``field``, or the columns of a decision table."""
+    if _is_leaf(node):
+        return [node["field"]]
+    return table_columns(node)
+
+
+def referenced_fields(condition: typ.Any) -> list[str]:
+    """Sorted names of the payload fields a condition reads."""
+    fields = set()
+    for node, _ in _walk(condition):
+        fields.update(leaf_fields(node))
+    return sorted(fields)
+
+
+def condition_stats(condition: typ.Any) -> tuple[int, int]:
+    """Return the ``(node_count, max_depth)`` of a condition tree."""
+    node_count = 0
+    max_depth = 0
+    for _, depth in _walk(condition):
+        node_count += 1
+        max_depth = max(max_depth, depth)
+    return node_count, max_depth
+
+
+def _walk(condition: typ.Any) -> typ.Iterator[tuple[typ.Any, int]]:
+    """Yield ``(node, depth)`` for every node, without recursing."""
+    if not isinstance(condition, dict):
+        return
+    stack = [(condition, 1)]
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+        for kind in ("AND", "OR"):
+            children = node.get(kind)
+            if isinstance(children, list):
+                stack.extend(
+                    (child, depth + 1) for child in children if isinstance(child, dict)
+                )
+                break
@@ -0,0 +1,363 @@
+import json
+import operator
+import re
+import typing as typ
+from array import array
+
+from rule_engine_api.rules.decision_table import TABLE
+from rule_engine_api.rules.decision_table import compile_table
+from rule_engine_api.rules.decision_table import is_table
+from rule_engine_api.rules.decision_table import table_errors
+from rule_engine_api.rules.paths import MISSING
+from rule_engine_api.rules.paths import make_accessor
+from rule_engine_api.rules.rule_engine import CONST
+from rule_engine_api.rules.rule_engine import JUMP_IF_FALSE
+from rule_engine_api.rules.rule_engine import OPERATORS
+from rule_engine_api.rules.rule_engine import TEST
+from rule_engine_api.rules.rule_engine import Predicate
+from rule_engine_api.rules.rule_engine import emit_program
+from rule_engine_api.rules.rule_engine import invalid_predicate
+from rule_engine_api.rules.rule_engine import thread_jumps
+
+# Leaf kinds, with what their operand indexes:
+# - a comparison with a number literal: ``numbers``, a double array;
+# - a comparison with any other literal: ``constants``;
+# - ``in``/``not_in``: ``constants``, holding the members as a tuple, or a
+#   frozenset when there are more than ``SMALL_MEMBERSHIP`` hashable ones;
+# - ``between``: ``constants``, holding the ``(low, high)`` tuple;
+# - any other operator: ``tests``, one compiled test per distinct literal;
+# - tables and invalid leaves: ``predicates``, called with the payload.
+_COMPARISONS = ("==", "!=", ">", "<", ">=", "<=")
+_COMPARE = (
+    operator.eq,
+    operator.ne,
+    operator.gt,
+    operator.lt,
+    operator.ge,
+    operator.le,
+)
+_CONSTANT = len(_COMPARISONS)  # Added to the comparison kind.
+_IN = 2 * _CONSTANT
+_NOT_IN = _IN + 1
+_BETWEEN = _IN + 2
+_TEST = _IN + 3
+_PREDICATE = _IN + 4
+
+# Scanning a few members costs about a hash lookup, in a quarter of the memory.
+SMALL_MEMBERSHIP = 8
+
+# Integers beyond this lose precision as doubles: they stay constants.
+_EXACT_INT = 2**53
+
+
+def _is_exact_number(value: typ.Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, float) or (
+        isinstance(value, int) and -_EXACT_INT < value < _EXACT_INT
+    )
+
+
+class PackedRuleSet:
+    """
+    Rules packed into flat typed arrays, for populations too large to keep
+    as condition dicts, closures and model instances.
+
+    Every rule is compiled like ``compile_program`` into one shared pair of
+    ``ops``/``args`` arrays, ``starts[i]:starts[i + 1]`` being the code of
+    the ``i``-th rule by name. A ``TEST`` argument is a leaf id: leaves are
+    deduplicated and stored as three parallel arrays of small ints, the
+    interned field, the kind and the operand. Literals are interned too, so
+    a value used by many rules is held once. Names are one string sliced by
+    ``name_offsets``, sorted so that a name is found by bisection.
+
+    Outcomes are the ones of ``CompiledRuleSet.evaluate``. The conditions
+    themselves are not kept.
+    """
+
+    __slots__ = (
+        "accessors",
+        "args",
+        "constants",
+        "fields",
+        "leaf_fields",
+        "leaf_kinds",
+        "leaf_operands",
+        "name_offsets",
+        "names",
+        "numbers",
+        "ops",
+        "predicates",
+        "starts",
+        "tests",
+    )
+
+    def __init__(self, rules: typ.Iterable[tuple[str, typ.Any]]) -> None:
+        self.fields: list[str] = []
+        self.accessors: list[typ.Callable[[dict[str, typ.Any]], typ.Any]] = []
+        self.numbers = array("d")
+        self.constants: list[typ.Any] = []
+        self.tests: list[typ.Callable[[typ.Any], bool]] = []
+        self.predicates: list[Predicate] = []
+        self.leaf_fields = array("i")
+        self.leaf_kinds = array("B")
+        self.leaf_operands = array("i")
+        self.ops = array("B")
+        self.args = array("i")
+        self.starts = array("L", [0])
+        self.name_offsets = array("L", [0])
+
+        packer = _Packer(self)
+        names = []
+        for name, condition in sorted(rules, key=lambda rule: rule[0]):
+            packer.pack_rule(condition)
+            names.append(name)
+            self.name_offsets.append(self.name_offsets[-1] + len(name))
+            self.starts.append(len(self.ops))
+        self.names = "".join(names)
+
+    def __len__(self) -> int:
+        return len(self.name_offsets) - 1
+
+    def name(self, index: int) -> str:
+        return self.names[self.name_offsets[index] : self.name_offsets[index + 1]]
+
+    def index(self, name: str) -> int:
+        """Position of the rule called ``name``; ``KeyError`` if there is none."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.name(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self) or self.name(low) != name:
+            raise KeyError(name)
+        return low
+
+    def _leaf(self, leaf: int, payload: dict[str, typ.Any]) -> typ.Any:
+        kind = self.leaf_kinds[leaf]
+        operand = self.leaf_operands[leaf]
+        if kind == _PREDICATE:
+            return self.predicates[operand](payload, None)
+        field = self.leaf_fields[leaf]
+        actual: typ.Any = self.accessors[field](payload) if field >= 0 else MISSING
+        if kind == _TEST:
+            return self.tests[operand](actual)
+        if actual is MISSING:
+            actual = None
+        if kind < _CONSTANT:
+            return _COMPARE[kind](actual, self.numbers[operand])
+        if kind < _IN:
+            return _COMPARE[kind - _CONSTANT](actual, self.constants[operand])
+        if kind == _BETWEEN:
+            low, high = self.constants[operand]
+            return low <= actual <= high
+        members = self.constants[operand]
+        try:
+            found = actual in members
+        except TypeError:
+            found = actual in tuple(members)
+        return found if kind == _IN else not found
+
+    def evaluate_rule(self, index: int, payload: dict[str, typ.Any]) -> bool:
+        """Outcome of the ``index``-th rule; a failing leaf raises."""
+        ops, args = self.ops, self.args
+        value: typ.Any = True
+        pc = self.starts[index]
+        end = self.starts[index + 1]
+        while pc < end:
+            op = ops[pc]
+            if op == TEST:
+                value = self._leaf(args[pc], payload)
+            elif op == CONST:
+                value = args[pc]
+            elif op == JUMP_IF_FALSE:
+                if not value:
+                    pc = args[pc]
+                    continue
+            elif value:
+                pc = args[pc]
+                continue
+            pc += 1
+        return bool(value)
+
+    def evaluate(
+        self,
+        payload: dict[str, typ.Any],
+        names: typ.Iterable[str] | None = None,
+    ) -> tuple[list[str], list[str]]:
+        """
+        Return the ``(passed, failed)`` names of the rules called ``names``,
+        by default all of them, in name order. Unknown names raise
+        ``KeyError``.
+        """
+        indexes = (
+            range(len(self)) if names is None else sorted(map(self.index, set(names)))
+        )
+        passed_rules: list[str] = []
+        failed_rules: list[str] = []
+        for index in indexes:
+            try:
+                passed = self.evaluate_rule(index, payload)
+            except Exception:  # noqa: BLE001
+                passed = False
+            (passed_rules if passed else failed_rules).append(self.name(index))
+        return passed_rules, failed_rules
+
+
+class _Packer:
+    """Interning tables of a ``PackedRuleSet``, only needed while packing."""
+
+    def __init__(self, ruleset: "PackedRuleSet") -> None:
+        self.ruleset = ruleset
+        self.field_ids: dict[str, int] = {}
+        self.number_ids: dict[float, int] = {}
+        self.constant_ids: dict[str, int] = {}
+        self.test_ids: dict[str, int] = {}
+        self.predicate_ids: dict[str, int] = {}
+        self.leaf_ids: dict[tuple[int, int, int], int] = {}
+        self.strings: dict[str, str] = {}
+
+    @staticmethod
+    def intern(
+        table: dict,
+        key: typ.Any,
+        values: typ.Any,
+        make: typ.Callable[[], typ.Any],
+    ) -> int:
+        index = table.get(key)
+        if index is None:
+            values.append(make())
+            index = table[key] = len(values) - 1
+        return index
+
+    def share(self, value: typ.Any) -> typ.Any:
+        if isinstance(value, str):
+            return self.strings.setdefault(value, value)
+        return value
+
+    def members(self, value: typ.Any) -> typ.Any:
+        if not isinstance(value, list):
+            msg = "'in' and 'not_in' expect a list value"
+            raise TypeError(msg)
+        if len(value) <= SMALL_MEMBERSHIP:
+            return tuple(map(self.share, value))
+        try:
+            return frozenset(map(self.share, value))
+        except TypeError:
+            return tuple(value)
+
+    def bounds(self, value: typ.Any) -> tuple[typ.Any, typ.Any]:
+        if not isinstance(value, list) or len(value) != 2:  # noqa: PLR2004
+            msg = "'between' expects a [low, high] value"
+            raise TypeError(msg)
+        return self.share(value[0]), self.share(value[1])
+
+    def field_id(self, field: typ.Any) -> int:
+        if not isinstance(field, str):
+            return -1
+        if field not in self.field_ids:
+            accessor = make_accessor(field)  # Raises on a malformed path.
+            self.ruleset.fields.append(field)
+            self.ruleset.accessors.append(accessor)
+            self.field_ids[field] = len(self.field_ids)
+        return self.field_ids[field]
+
+    def leaf_id(self, field: int, kind: int, operand: int) -> int:
+        key = (field, kind, operand)
+        index = self.leaf_ids.get(key)
+        if index is None:
+            ruleset = self.ruleset
+            index = self.leaf_ids[key] = len(ruleset.leaf_kinds)
+            ruleset.leaf_fields.append(field)
+            ruleset.leaf_kinds.append(kind)
+            ruleset.leaf_operands.append(operand)
+        return index
+
+    def predicate_leaf(self, key: str, make: typ.Callable[[], Predicate]) -> int:
+        operand = self.intern(self.predicate_ids, key, self.ruleset.predicates, make)
+        return self.leaf_id(-1, _PREDICATE, operand)
+
+    def invalid_leaf(self, error: Exception) -> int:
+        # Without its traceback, which holds the packer and its tables.
+        error = error.with_traceback(None)
+        return self.predicate_leaf(
+            f"{type(error).__name__}: {error}",
+            lambda: invalid_predicate(error),
+        )
+
+    def pack_leaf(self, node: typ.Any) -> int:
+        # Same checks, in the same order, as ``compile_leaf``.
+        if not isinstance(node, dict):
+            return self.invalid_leaf(
+                TypeError(f"Expected a condition object, got {node!r}"),
+            )
+        if is_table(node):
+            errors = table_errors(node[TABLE])
+            if errors:
+                return self.invalid_leaf(ValueError(errors[0]))
+            key = json.dumps(node[TABLE], sort_keys=True)
+            return self.predicate_leaf(key, lambda: compile_table(node[TABLE]))
+        op = node.get("operator")
+        try:
+            if op not in OPERATORS:
+                raise ValueError(f"Unsupported operator: {op}")  # noqa: TRY003, EM102, TRY301
+            kind, operand = self._operand(op, node.get("value"))
+            return self.leaf_id(self.field_id(node.get("field")), kind, operand)
+        except (TypeError, ValueError, re.error) as exc:
+            return self.invalid_leaf(exc)
+
+    def _operand(self, op: str, value: typ.Any) -> tuple[int, int]:
+        """The kind of a leaf with a valid operator, and its interned operand."""
+        ruleset = self.ruleset
+        key = json.dumps(value, sort_keys=True, default=repr)
+        if op in _COMPARISONS and _is_exact_number(value):
+            return _COMPARISONS.index(op), self.intern(
+                self.number_ids,
+                float(value),
+                ruleset.numbers,
+                lambda: value,
+            )
+        if op in _COMPARISONS:
+            kind = _CONSTANT + _COMPARISONS.index(op)
+            make: typ.Callable[[], typ.Any] = lambda: self.share(value)  # noqa: E731
+        elif op in ("in", "not_in"):
+            kind = _IN if op == "in" else _NOT_IN
+            key = f"in:{key}"
+            make = lambda: self.members(value)  # noqa: E731
+        elif op == "between":
+            kind = _BETWEEN
+            key = f"between:{key}"
+            make = lambda: self.bounds(value)  # noqa: E731
+        else:
+            test = self.intern(
+                self.test_ids,
+                f"{op}:{key}",
+                ruleset.tests,
+                lambda: OPERATORS[op](value),
+            )
+            return _TEST, test
+        return kind, self.intern(self.constant_ids, key, ruleset.constants, make)
+
+    def pack_rule(self, condition: typ.Any) -> None:
+        """Append the code of ``condition`` to the ruleset's program."""
+        ruleset = self.ruleset
+        ops: list[int] = []
+        args: list[typ.Any] = []
+        emit_program(condition, ops, args, leaf=self.pack_leaf)
+        thread_jumps(ops, args)
+        base = len(ruleset.ops)
+        for opcode, arg in zip(ops, args, strict=True):
+            ruleset.ops.append(opcode)
+            if opcode == TEST:
+                # A group without a list of children comes as a predicate.
+                if isinstance(arg, int):
+                    ruleset.args.append(arg)
+                else:
+                    leaf = self.predicate_leaf(repr(arg), lambda: arg)  # noqa: B023
+                    ruleset.args.append(leaf)
+            elif opcode == CONST:
+                ruleset.args.append(int(arg))
+            else:
+                ruleset.args.append(base + arg)
@@ -0,0 +1,163 @@
+import secrets
+import typing as typ
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rule_engine_api.rules.normalize import ALWAYS_FALSE
+from rule_engine_api.rules.normalize import ALWAYS_TRUE
+from rule_engine_api.rules.normalize import leaf_fields
+from rule_engine_api.rules.normalize import referenced_fields
+from rule_engine_api.rules.paths import MISSING
+from rule_engine_api.rules.paths import make_accessor
+from rule_engine_api.rules.rule_engine import compile_leaf
+from rule_engine_api.rules.rule_engine import group_kind
+
+# Outcome of a sub-condition: decided ``True``/``False``, still depending on
+# fields the payload does not have yet (``None``), or the exception it raises,
+# with what remains of it.
+Partial = tuple[bool | None | Exception, typ.Any]
+
+
+def partially_evaluate(condition: typ.Any, payload: dict[str, typ.Any]) -> Partial:
+    """
+    Evaluate ``condition`` as far as ``payload`` allows.
+
+    Leaves on fields absent from the payload stay undecided; every other
+    leaf is evaluated. ``AND``/``OR`` nodes are decided as soon as one child
+    settles them, otherwise decided children are dropped and the residual
+    keeps only the undecided ones. Returns ``(True|False, decided node)`` or
+    ``(None, residual condition)``. A leaf that raises makes the condition
+    raise, like ``evaluate_condition``, but only once the children before it
+    are decided: until then it is kept in the residual.
+    """
+    # Post-order walk with an explicit stack of (node, children pushed yet).
+    results: list[Partial] = []
+    stack: list[tuple[typ.Any, bool]] = [(condition, False)]
+    while stack:
+        node, expanded = stack.pop()
+        kind = group_kind(node)
+        if kind is None:
+            results.append(_partial_leaf(node, payload))
+            continue
+        children = node[kind]
+        if not isinstance(children, list):
+            results.append(_partial_leaf(node, payload))
+            continue
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+        outcomes = results[len(results) - len(children) :]
+        del results[len(results) - len(children) :]
+        results.append(_combine(kind, outcomes))
+    value, node = results[0]
+    if isinstance(value, Exception):
+        raise value
+    return value, node
+
+
+def _partial_leaf(node: typ.Any, payload: dict[str, typ.Any]) -> Partial:
+    for field in leaf_fields(node):
+        try:
+            if make_accessor(field)(payload) is MISSING:
+                return None, node
+        except ValueError:
+            pass  # Malformed path: the leaf raises below.
+    try:
+        return bool(compile_leaf(node)(payload, None)), node
+    except Exception as exc:  # noqa: BLE001
+        return exc, node
+
+
+def _combine(kind: str, outcomes: list[Partial]) -> Partial:
+    # The value that decides the group on its own: False for AND, True for OR.
+    deciding = kind == "OR"
+    residual: list[typ.Any] = []
+    for value, node in outcomes:
+        if isinstance(value, Exception):
+            if not residual:
+                return value, node
+            # Only reached if the undecided children before it do not decide
+            # the group, and then it raises: the children after it never count.
+            residual.append(node)
+            break
+        if value is deciding:
+            return deciding, ALWAYS_TRUE if deciding else ALWAYS_FALSE
+        if value is None:
+            residual.append(node)
+    if not residual:
+        return not deciding, ALWAYS_FALSE if deciding else ALWAYS_TRUE
+    if len(residual) == 1:
+        return None, residual[0]
+    return None, {kind: residual}
+
+
+class PartialResult(typ.NamedTuple):
+    passed: list[str]
+    failed: list[str]
+    # Rule name -> residual condition, for rules that are not decided yet.
+    residuals: dict[str, typ.Any]
+
+    @property
+    def missing_fields(self) -> list[str]:
+        """Fields the undecided rules still need, sorted."""
+        return sorted(
+            {
+                field
+                for condition in self.residuals.values()
+                for field in referenced_fields(condition)
+            },
+        )
+
+
+def evaluate_partially(
+    rules: typ.Iterable[tuple[str, typ.Any]],
+    payload: dict[str, typ.Any],
+) -> PartialResult:
+    """
+    Partially evaluate ``(name, condition)`` pairs. Pass the ``residuals`` of
+    an earlier result, with a payload holding more fields, to continue from
+    where it stopped.
+    """
+    passed: list[str] = []
+    failed: list[str] = []
+    residuals: dict[str, typ.Any] = {}
+    for name, condition in rules:
+        try:
+            value, residual = partially_evaluate(condition, payload)
+        except Exception:  # noqa: BLE001
+            failed.append(name)
+            continue
+        if value is None:
+            residuals[name] = residual
+        elif value:
+            passed.append(name)
+        else:
+            failed.append(name)
+    return PartialResult(passed, failed, residuals)
+
+
+PARTIAL_STATE_KEY = "rules:partial:{state_id}"
+
+
+def save_partial_state(state: dict[str, typ.Any], state_id: str | None = None) -> str:
+    """
+    Keep a partial evaluation in the shared cache for
+    ``RULES_PARTIAL_STATE_TIMEOUT`` seconds and return its id.
+    """
+    state_id = state_id or secrets.token_urlsafe(16)
+    cache.set(
+        PARTIAL_STATE_KEY.format(state_id=state_id),
+        state,
+        timeout=settings.RULES_PARTIAL_STATE_TIMEOUT,
+    )
+    return state_id
+
+
+def load_partial_state(state_id: str) -> dict[str, typ.Any] | None:
+    return cache.get(PARTIAL_STATE_KEY.format(state_id=state_id))
+
+
+def delete_partial_state(state_id: str) -> None:
+    cache.delete(PARTIAL_STATE_KEY.format(state_id=state_id))
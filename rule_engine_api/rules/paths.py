@@ -0,0 +1,117 @@
+import functools
+import re
+import typing as typ
+
+Accessor = typ.Callable[[dict[str, typ.Any]], typ.Any]
+Step = str | int
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+# Returned by accessors when the path does not exist in the payload.
+MISSING = _Missing()
+
+_DOTTED_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+def parse_field_path(field: str) -> tuple[Step, ...]:
+    """
+    Split a field into lookup steps.
+
+    Three spellings are accepted:
+    - a plain key: ``age``
+    - dotted keys with list indexes: ``applicant.address.country``, ``items[0].price``
+    - a JSON pointer (RFC 6901): ``/applicant/address/country``, ``/items/0/price``
+    """
+    if not field:
+        msg = "Field path must not be empty"
+        raise ValueError(msg)
+
+    if field.startswith("/"):
+        return tuple(
+            segment.replace("~1", "/").replace("~0", "~")
+            for segment in field[1:].split("/")
+        )
+
+    steps: list[Step] = []
+    position = 0
+    expect_key = True
+    while position < len(field):
+        if not expect_key and field[position] == ".":
+            position += 1
+            expect_key = True
+            continue
+        match = _DOTTED_TOKEN.match(field, position)
+        if match is None or (match.group(1) is not None and not expect_key):
+            msg = f"Invalid field path: {field!r}"
+            raise ValueError(msg)
+        key, index = match.groups()
+        steps.append(key if key is not None else int(index))
+        position = match.end()
+        expect_key = False
+    if expect_key:
+        msg = f"Invalid field path: {field!r}"
+        raise ValueError(msg)
+    return tuple(steps)
+
+
+def root_key(field: str) -> str | None:
+    """The top-level payload key a path starts from, if it has one."""
+    try:
+        first = parse_field_path(field)[0]
+    except ValueError:
+        return None
+    return first if isinstance(first, str) else None
+
+
+def _list_item(items: list, step: Step) -> typ.Any:
+    # Dotted paths spell list indexes as digit strings.
+    if isinstance(step, str):
+        if not step.isdigit():
+            return MISSING
+        step = int(step)
+    return items[step] if step < len(items) else MISSING
+
+
+@functools.lru_cache(maxsize=4096)
+def make_accessor(field: str) -> Accessor:
+    """
+    Build a function reading ``field`` from a payload, or ``MISSING``.
+
+    The path is parsed once here. A payload that already carries the literal
+    key (e.g. a client-flattened ``"applicant.address.country"``) wins over
+    walking the nested structure, so flattened payloads keep working.
+    """
+    steps = parse_field_path(field)
+    if steps == (field,):
+
+        def get_key(payload):
+            return payload.get(field, MISSING)
+
+        return get_key
+
+    def get_path(payload):
+        value = payload.get(field, MISSING)
+        if value is not MISSING:
+            return value
+        value = payload
+        for step in steps:
+            if isinstance(value, dict):
+                value = value.get(step, MISSING) if isinstance(step, str) else MISSING
+            elif isinstance(value, list):
+                value = _list_item(value, step)
+            else:
+                return MISSING
+            if value is MISSING:
+                return MISSING
+        return value
+
+    return get_path
@@ -0,0 +1,61 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# Set when the primary is at least this recent: reads stay on it while the
+# replica may still be catching up.
+PRIMARY_PIN_KEY = "rules:read-primary"
+
+_replica_reads = contextvars.ContextVar("rules_replica_reads", default=False)
+
+
+def pin_primary_reads() -> None:
+    """Keep ``replica_reads`` on the primary for ``RULES_REPLICA_LAG`` seconds."""
+    if settings.RULES_READ_DATABASE != DEFAULT_DB_ALIAS:
+        cache.set(PRIMARY_PIN_KEY, 1, timeout=settings.RULES_REPLICA_LAG)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Route reads made inside the block to ``RULES_READ_DATABASE``.
+
+    Right after a rule write every reader stays on the primary, so an admin
+    listing or evaluating the rules they just edited sees their change, and
+    rules read from a lagging replica are never cached under the new
+    ruleset version.
+    """
+    if settings.RULES_READ_DATABASE == DEFAULT_DB_ALIAS or cache.get(PRIMARY_PIN_KEY):
+        yield
+        return
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads inside ``replica_reads()`` to the replica, the rest to default."""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return settings.RULES_READ_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, settings.RULES_READ_DATABASE}
+        if obj1._state.db in databases and obj2._state.db in databases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != DEFAULT_DB_ALIAS and db == settings.RULES_READ_DATABASE:
+            return False
+        return None
@@ -1,34 +1,616 @@
+import functools
+import json
+import re
 import typing as typ
 
+from rule_engine_api.rules.decision_table import TABLE
+from rule_engine_api.rules.decision_table import compile_table
+from rule_engine_api.rules.decision_table import is_table
+from rule_engine_api.rules.decision_table import table_errors
+from rule_engine_api.rules.normalize import condition_stats
+from rule_engine_api.rules.paths import MISSING
+from rule_engine_api.rules.paths import make_accessor
+
+ContainsHits = typ.Container[tuple[str, str]] | None
+Predicate = typ.Callable[[dict[str, typ.Any], ContainsHits], bool]
+# Compiled test of a single payload value, which may be ``MISSING``.
+ValueTest = typ.Callable[[typ.Any], bool]
+
+REGEX_CACHE_SIZE = 1024
+CONDITION_CACHE_SIZE = 256
+# Deeper conditions are compiled into a flat program instead of closures.
+CLOSURE_MAX_DEPTH = 32
+
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _present(actual: typ.Any) -> typ.Any:
+    return None if actual is MISSING else actual
+
+
+def _binary(
+    op: typ.Callable[[typ.Any, typ.Any], bool],
+) -> typ.Callable[[typ.Any], ValueTest]:
+    """Operators comparing the payload value with the literal, absent as ``None``."""
+
+    def factory(value):
+        def test(actual):
+            return op(_present(actual), value)
+
+        return test
+
+    return factory
+
+
+def _membership(value: typ.Any) -> ValueTest:
+    if not isinstance(value, list):
+        msg = "'in' and 'not_in' expect a list value"
+        raise TypeError(msg)
+    try:
+        members: typ.Collection[typ.Any] = frozenset(value)
+    except TypeError:
+        # Unhashable members (objects, lists) fall back to a linear scan.
+        members = tuple(value)
+
+    def test(actual):
+        actual = _present(actual)
+        try:
+            return actual in members
+        except TypeError:
+            return actual in value
+
+    return test
+
+
+def _not_in(value: typ.Any) -> ValueTest:
+    member = _membership(value)
+    return lambda actual: not member(actual)
+
+
+def _between(value: typ.Any) -> ValueTest:
+    if not isinstance(value, list) or len(value) != 2:  # noqa: PLR2004
+        msg = "'between' expects a [low, high] value"
+        raise TypeError(msg)
+    low, high = value
+
+    def test(actual):
+        return low <= _present(actual) <= high
+
+    return test
+
+
+def _string_test(method: str) -> typ.Callable[[typ.Any], ValueTest]:
+    def factory(value):
+        if not isinstance(value, str):
+            msg = f"'{method}' expects a string value"
+            raise TypeError(msg)
+
+        def test(actual):
+            return isinstance(actual, str) and getattr(actual, method)(value)
+
+        return test
+
+    return factory
+
+
+def _regex(value: typ.Any) -> ValueTest:
+    if not isinstance(value, str):
+        msg = "'regex' expects a string pattern"
+        raise TypeError(msg)
+    search = compile_regex(value).search
+
+    def test(actual):
+        return isinstance(actual, str) and search(actual) is not None
+
+    return test
+
+
+def _exists(value: typ.Any) -> ValueTest:
+    expected = value is None or bool(value)
+    return lambda actual: (actual is not MISSING) is expected
+
+
+def _is_null(value: typ.Any) -> ValueTest:
+    expected = value is None or bool(value)
+    return lambda actual: (actual is MISSING or actual is None) is expected
+
+
+# Each factory receives the literal ``value`` once, at compile time, and
+# returns the test applied to the payload value on every evaluation.
+OPERATORS: dict[str, typ.Callable[[typ.Any], ValueTest]] = {
+    "==": _binary(lambda a, b: a == b),
+    "!=": _binary(lambda a, b: a != b),
+    ">": _binary(lambda a, b: a > b),
+    "<": _binary(lambda a, b: a < b),
+    ">=": _binary(lambda a, b: a >= b),
+    "<=": _binary(lambda a, b: a <= b),
+    "contains": _binary(lambda a, b: b in a if isinstance(a, (list, str)) else False),
+    "in": _membership,
+    "not_in": _not_in,
+    "between": _between,
+    "startswith": _string_test("startswith"),
+    "endswith": _string_test("endswith"),
+    "regex": _regex,
+    "exists": _exists,
+    "is_null": _is_null,
+}
+
+
 # ChatGPT solution.
-def evaluate_condition(condition: typ.Dict[str, typ.Any], payload: typ.Dict[str, typ.Any]) -> bool:
+def evaluate_condition(
+    condition: dict[str, typ.Any],
+    payload: dict[str, typ.Any],
+    contains_hits: ContainsHits = None,
+) -> bool:
     """
-    Recursive evaluation of condition against the payload.
+    Evaluation of condition against the payload.
     Supports AND/OR nesting.
+
+    ``contains_hits`` is the result of ``ContainsIndex.search`` for the same
+    payload. When given, ``contains`` leaves with a string value are answered
+    from it instead of being scanned one at a time.
+
+    The predicate is compiled once per distinct condition, keyed by its JSON
+    text; conditions JSON cannot encode, or too deep for it, are compiled on
+    every call.
     """
+    try:
+        key = json.dumps(condition, sort_keys=True)
+    except (TypeError, ValueError, RecursionError):
+        predicate = compile_condition(condition)
+    else:
+        predicate = _compile_json(key)
+    return predicate(payload, contains_hits)
+
+
+@functools.lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def _compile_json(key: str) -> Predicate:
+    # Only the order of object keys differs from the condition, and no
+    # evaluation depends on it.
+    return compile_condition(json.loads(key))
+
+
+# Opcodes of a compiled condition program.
+TEST = 0  # value = leaf predicate(payload, contains_hits)
+CONST = 1  # value = literal
+JUMP_IF_FALSE = 2  # short-circuit an AND
+JUMP_IF_TRUE = 3  # short-circuit an OR
+# Only in merged programs, see ``compile_merged``.
+MEMO = 4  # value = memo[slot] and skip the code after, if already computed
+STORE = 5  # memo[slot] = value
+RESULT = 6  # record value as the outcome of a rule
+
+# Markers on the compiler's work stack.
+_VISIT = 0
+_JUMP = 1
+_PATCH = 2
+_STORE = 3
+
+# Memo slot not computed yet in the current run.
+_UNSET = object()
+
+
+def compile_condition(condition: dict[str, typ.Any]) -> Predicate:
+    """
+    Turn a condition into a predicate ``(payload, contains_hits) -> bool``.
+    Field paths, operators and literals are resolved once here, not per
+    evaluation.
+
+    Conditions up to ``CLOSURE_MAX_DEPTH`` levels become nested closures,
+    the fastest form for the usual shallow rule. Deeper ones are compiled
+    into a flat program of leaf tests and short-circuit jumps, which runs
+    without recursion whatever the depth.
+    """
+    if condition_stats(condition)[1] <= CLOSURE_MAX_DEPTH:
+        return _compile_tree(condition)
+    ops, args = compile_program(condition)
+
+    def run(payload, contains_hits):
+        value = True
+        pc = 0
+        end = len(ops)
+        while pc < end:
+            op = ops[pc]
+            if op == TEST:
+                value = args[pc](payload, contains_hits)
+            elif op == CONST:
+                value = args[pc]
+            elif op == JUMP_IF_FALSE:
+                if not value:
+                    pc = args[pc]
+                    continue
+            elif value:
+                pc = args[pc]
+                continue
+            pc += 1
+        return bool(value)
+
+    return run
+
+
+def _compile_tree(condition: typ.Any) -> Predicate:
+    kind = group_kind(condition)
+    if kind is None:
+        return compile_leaf(condition)
+    children = condition[kind]
+    if not isinstance(children, list):
+        return invalid_predicate(TypeError(f"{kind} expects a list of conditions"))
+    compiled = tuple(_compile_tree(sub) for sub in children)
+
+    if kind == "AND":
+        # Plain loops: ``all``/``any`` over a generator cost a frame per call.
+        def all_of(payload, contains_hits):
+            for child in compiled:  # noqa: SIM110
+                if not child(payload, contains_hits):
+                    return False
+            return True
+
+        return all_of
+
+    def any_of(payload, contains_hits):
+        for child in compiled:  # noqa: SIM110
+            if child(payload, contains_hits):
+                return True
+        return False
 
-    if 'AND' in condition:
-        return all(evaluate_condition(sub, payload) for sub in condition['AND'])
-    if 'OR' in condition:
-        return any(evaluate_condition(sub, payload) for sub in condition['OR'])
+    return any_of
 
+
+def group_kind(node: typ.Any) -> str | None:
+    """``"AND"``/``"OR"`` for a group node, ``None`` for anything else."""
+    if isinstance(node, dict):
+        if "AND" in node:
+            return "AND"
+        if "OR" in node:
+            return "OR"
+    return None
+
+
+def compile_program(condition: typ.Any) -> tuple[list[int], list[typ.Any]]:
+    """
+    Compile ``condition`` into parallel ``(opcodes, arguments)`` lists.
+
+    ``{"AND": [a, b, c]}`` becomes ``a; JUMP_IF_FALSE end; b; JUMP_IF_FALSE
+    end; c; end:`` so a false child skips its siblings and leaves the AND's
+    result as the current value; OR is the same with ``JUMP_IF_TRUE``.
+    Jumps landing on a jump of the same kind are forwarded to its target.
+    """
+    ops: list[int] = []
+    args: list[typ.Any] = []
+    emit_program(condition, ops, args)
+    thread_jumps(ops, args)
+    return ops, args
+
+
+def emit_program(
+    condition: typ.Any,
+    ops: list[int],
+    args: list[typ.Any],
+    shared: dict[int, int] | None = None,
+    leaf: typ.Callable[[typ.Any], typ.Any] | None = None,
+) -> None:
+    """
+    Append the opcodes and arguments of ``condition`` to ``ops``/``args``,
+    jumps not yet threaded. ``shared`` maps ``id(node)`` to the memo slot of
+    shared subexpressions; ``leaf`` turns a leaf into the argument of its
+    ``TEST``, by default its predicate.
+    """
+    leaf = leaf or compile_leaf
+    stack: list[tuple[int, typ.Any]] = [(_VISIT, condition)]
+    while stack:
+        action, item = stack.pop()
+        if action == _JUMP:
+            opcode, pending = item
+            pending.append(len(ops))
+            ops.append(opcode)
+            args.append(None)
+        elif action == _PATCH:
+            for index in item:
+                args[index] = len(ops)
+        elif action == _STORE:
+            slot, memo = item
+            ops.append(STORE)
+            args.append(slot)
+            args[memo] = (slot, len(ops))
+        else:
+            slot = shared.get(id(item)) if shared else None
+            if slot is not None:
+                # Patched with the skip target once the node is emitted.
+                stack.append((_STORE, (slot, len(ops))))
+                ops.append(MEMO)
+                args.append(None)
+            _visit(item, stack, ops, args, leaf)
+
+
+def thread_jumps(ops: list[int], args: list[typ.Any]) -> None:
+    """
+    Forward jumps through the jumps they land on (nested groups ending
+    together): the value is known there, so the outcome is too.
+    """
+    for index, opcode in enumerate(ops):
+        if opcode not in (JUMP_IF_FALSE, JUMP_IF_TRUE):
+            continue
+        target = args[index]
+        while target < len(ops) and ops[target] in (JUMP_IF_FALSE, JUMP_IF_TRUE):
+            target = args[target] if ops[target] == opcode else target + 1
+        args[index] = target
+
+
+def shared_subexpressions(conditions: typ.Iterable[typ.Any]) -> dict[int, int]:
+    """
+    Map ``id(node)`` of every node that occurs more than once across
+    ``conditions`` to a memo slot, equal nodes sharing the slot. Works on
+    normalized conditions, where equal sub-conditions are equal JSON.
+    """
+    # Structural ids, children first: a group is identified by its kind
+    # and the ids of its children, a leaf by its JSON.
+    interned: dict[typ.Any, int] = {}
+    node_ids: dict[int, int] = {}
+    occurrences: list[int] = []
+    nodes: list[typ.Any] = []
+    for condition in conditions:
+        stack: list[tuple[typ.Any, bool]] = [(condition, False)]
+        while stack:
+            node, expanded = stack.pop()
+            kind = group_kind(node)
+            children = node[kind] if kind is not None else None
+            if isinstance(children, list) and not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+            key: tuple[str | None, tuple[int, ...]] | str
+            if isinstance(children, list):
+                key = (kind, tuple(node_ids[id(child)] for child in children))
+            else:
+                key = json.dumps(node, sort_keys=True, default=repr)
+            structural = interned.setdefault(key, len(interned))
+            if structural == len(occurrences):
+                occurrences.append(0)
+            occurrences[structural] += 1
+            node_ids[id(node)] = structural
+            nodes.append(node)
+
+    slots: dict[int, int] = {}
+    shared: dict[int, int] = {}
+    for node in nodes:
+        structural = node_ids[id(node)]
+        if occurrences[structural] > 1:
+            shared[id(node)] = slots.setdefault(structural, len(slots))
+    return shared
+
+
+def compile_merged(  # noqa: C901
+    rules: typ.Sequence[tuple[str, typ.Any]],
+    shared: dict[int, int] | None = None,
+) -> typ.Callable[[dict[str, typ.Any], ContainsHits], tuple[list[str], list[str]]]:
+    """
+    Compile ``(name, condition)`` pairs into one program returning the
+    ``(passed, failed)`` names, like ``CompiledRuleSet.evaluate``.
+
+    Each rule is compiled as by ``compile_program`` and ends with a
+    ``RESULT``. Sub-conditions found more than once across the rules are
+    computed once per run: their code is wrapped in ``MEMO``/``STORE`` and
+    later occurrences jump over it. A leaf that raises fails its rule and
+    the run continues with the next one; nothing it was part of is stored.
+    ``shared`` is the result of ``shared_subexpressions``, if already known.
+    """
+    if shared is None:
+        shared = shared_subexpressions(condition for _, condition in rules)
+    ops: list[int] = []
+    args: list[typ.Any] = []
+    for name, condition in rules:
+        emit_program(condition, ops, args, shared)
+        ops.append(RESULT)
+        args.append(name)
+    thread_jumps(ops, args)
+
+    recover = _recovery_points(ops)
+    slot_count = len(set(shared.values()))
+
+    # One flat loop on purpose: a call per opcode would cost more than the
+    # branches it saves.
+    def run(payload, contains_hits):  # noqa: C901
+        passed_rules: list[str] = []
+        failed_rules: list[str] = []
+        memo = [_UNSET] * slot_count
+        value: typ.Any = True
+        pc = 0
+        end = len(ops)
+        while pc < end:
+            op = ops[pc]
+            if op == TEST:
+                try:
+                    value = args[pc](payload, contains_hits)
+                except Exception:  # noqa: BLE001
+                    pc = recover[pc]
+                    failed_rules.append(args[pc - 1])
+                    continue
+            elif op == JUMP_IF_FALSE:
+                if not value:
+                    pc = args[pc]
+                    continue
+            elif op == JUMP_IF_TRUE:
+                if value:
+                    pc = args[pc]
+                    continue
+            elif op == RESULT:
+                (passed_rules if value else failed_rules).append(args[pc])
+            elif op == MEMO:
+                slot, skip = args[pc]
+                if memo[slot] is not _UNSET:
+                    value = memo[slot]
+                    pc = skip
+                    continue
+            elif op == STORE:
+                memo[args[pc]] = value
+            else:
+                value = args[pc]
+            pc += 1
+        return passed_rules, failed_rules
+
+    return run
+
+
+def _recovery_points(ops: list[int]) -> list[int]:
+    """Where a failing leaf resumes: after its rule's ``RESULT``."""
+    recover = [0] * len(ops)
+    resume = len(ops)
+    for index in reversed(range(len(ops))):
+        if ops[index] == RESULT:
+            resume = index + 1
+        recover[index] = resume
+    return recover
+
+
+def _visit(
+    node: typ.Any,
+    stack: list,
+    ops: list[int],
+    args: list[typ.Any],
+    leaf: typ.Callable[[typ.Any], typ.Any],
+) -> None:
+    kind = group_kind(node)
+    if kind is None:
+        ops.append(TEST)
+        args.append(leaf(node))
+        return
+
+    children = node[kind]
+    if not isinstance(children, list):
+        ops.append(TEST)
+        args.append(
+            invalid_predicate(TypeError(f"{kind} expects a list of conditions")),
+        )
+        return
+    if not children:
+        ops.append(CONST)
+        args.append(kind == "AND")
+        return
+
+    opcode = JUMP_IF_FALSE if kind == "AND" else JUMP_IF_TRUE
+    pending: list[int] = []
+    # Pushed in reverse: child, jump, child, jump, ..., last child, patch.
+    stack.append((_PATCH, pending))
+    for position, child in enumerate(reversed(children)):
+        if position:
+            stack.append((_JUMP, (opcode, pending)))
+        stack.append((_VISIT, child))
+
+
+def compile_leaf(node: typ.Any) -> Predicate:
+    """Predicate of a single leaf; invalid leaves raise when evaluated."""
+    if not isinstance(node, dict):
+        return invalid_predicate(
+            TypeError(f"Expected a condition object, got {node!r}"),
+        )
+    if is_table(node):
+        errors = table_errors(node[TABLE])
+        return (
+            invalid_predicate(ValueError(errors[0]))
+            if errors
+            else compile_table(node[TABLE])
+        )
     # Simple condition: field + operator + value
-    field = condition.get("field")
-    operator = condition.get("operator")
-    value = condition.get("value")
-    actual = payload.get(field)
-
-    ops = {
-        "==": lambda a, b: a == b,
-        "!=": lambda a, b: a != b,
-        ">": lambda a, b: a > b,
-        "<": lambda a, b: a < b,
-        ">=": lambda a, b: a >= b,
-        "<=": lambda a, b: a <= b,
-        "contains": lambda a, b: b in a if isinstance(a, (list, str)) else False,
-    }
-
-    if operator not in ops:
-        raise ValueError(f"Unsupported operator: {operator}")
-
-    return ops[operator](actual, value)
+    try:
+        return _compile_leaf(node.get("field"), node.get("operator"), node.get("value"))
+    except (TypeError, ValueError, re.error) as exc:
+        return invalid_predicate(exc)
+
+
+def invalid_predicate(error: Exception) -> Predicate:
+    """
+    Predicate raising ``error`` when evaluated, so an OR branch that is
+    never reached does not fail the whole rule.
+    """
+
+    def invalid(payload, contains_hits):
+        # Without its earlier traceback, which would grow on every raise.
+        raise error.with_traceback(None)
+
+    return invalid
+
+
+def _compile_leaf(field: typ.Any, operator: typ.Any, value: typ.Any) -> Predicate:
+    if operator not in OPERATORS:
+        raise ValueError(f"Unsupported operator: {operator}")  # noqa: TRY003, EM102
+    test = OPERATORS[operator](value)
+
+    if not isinstance(field, str):
+        # Nothing can be read: behave like a field absent from the payload.
+        return lambda payload, contains_hits: test(MISSING)
+
+    accessor = make_accessor(field)
+
+    if operator == "contains" and isinstance(value, str):
+        key = (field, value)
+
+        def contains(payload, contains_hits):
+            if contains_hits is not None:
+                return key in contains_hits
+            return test(accessor(payload))
+
+        return contains
+
+    def leaf(payload, contains_hits):
+        return test(accessor(payload))
+
+    return leaf
+
+
+def condition_errors(
+    condition: typ.Any,
+    *,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+) -> list[str]:
+    """
+    Problems that would make parts of ``condition`` fail on every evaluation:
+    unknown operators, malformed field paths and literals an operator cannot
+    use. Anything that is not a condition object is left alone.
+
+    ``max_depth`` and ``max_nodes`` bound the size of the tree, counted like
+    ``condition_stats``; the walk stops as soon as the node limit is passed.
+    """
+    if not isinstance(condition, dict):
+        return []
+    errors = []
+    nodes = 0
+    too_deep = False
+    stack = [(condition, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if not isinstance(node, dict):
+            errors.append(f"Expected a condition object, got {node!r}")
+            continue
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            errors.append(f"Condition has more than {max_nodes} nodes")
+            break
+        if max_depth is not None and depth > max_depth and not too_deep:
+            too_deep = True
+            errors.append(f"Condition is nested deeper than {max_depth} levels")
+        if "AND" in node or "OR" in node:
+            children = node.get("AND", node.get("OR"))
+            if isinstance(children, list):
+                stack.extend((child, depth + 1) for child in reversed(children))
+            else:
+                errors.append("AND/OR expect a list of conditions")
+            continue
+        errors.extend(_leaf_errors(node))
+    return errors
+
+
+def _leaf_errors(node: dict[str, typ.Any]) -> list[str]:
+    if is_table(node):
+        return table_errors(node[TABLE])
+    field = node.get("field")
+    if not isinstance(field, str):
+        return [f"Invalid field: {field!r}"]
+    try:
+        _compile_leaf(field, node.get("operator"), node.get("value"))
+    except (TypeError, ValueError, re.error) as exc:
+        return [f"{field}: {exc}"]
+    return []
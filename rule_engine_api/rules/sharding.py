@@ -0,0 +1,392 @@
+"""
+Rules partitioned across worker groups and evaluated scatter-gather.
+
+Rules are assigned to shards by consistent hashing, of their name or of
+the first payload field they read, so that adding a shard only moves the
+rules that land on it. Each shard is served by a group of interchangeable
+workers holding a ``PackedRuleSet`` of its rules: a request is sent to
+one worker of every shard it involves, and the replies are merged in name
+order. When a worker dies or its pipe breaks, the shard is retried on the
+next worker of its group. Shards that still cannot answer in time, or
+that fail to evaluate, leave their rules ``unavailable``.
+
+Workers here are local processes started with ``multiprocessing``; the
+coordinator only needs their ``send``/``receive`` methods, which a remote
+transport can provide just as well.
+"""
+
+import bisect
+import contextlib
+import hashlib
+import heapq
+import itertools
+import multiprocessing
+import threading
+import time
+import typing as typ
+from multiprocessing.connection import wait
+
+from rule_engine_api.rules.normalize import referenced_fields
+from rule_engine_api.rules.packed import PackedRuleSet
+from rule_engine_api.rules.paths import root_key
+
+# Points per shard on the ring: more of them spread the rules more evenly.
+DEFAULT_VNODES = 64
+DEFAULT_TIMEOUT = 5.0
+PARTITION_KEYS = ("name", "field")
+
+
+def _hash(key: str) -> int:
+    # Unlike ``hash``, the same in every process.
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys onto ``shards``."""
+
+    def __init__(
+        self,
+        shards: typ.Sequence[str],
+        *,
+        vnodes: int = DEFAULT_VNODES,
+    ) -> None:
+        if not shards:
+            msg = "A ring needs at least one shard"
+            raise ValueError(msg)
+        points = sorted(
+            (_hash(f"{shard}#{index}"), shard)
+            for shard in shards
+            for index in range(vnodes)
+        )
+        self.shards = tuple(shards)
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._shards[index]
+
+
+def partition_key(name: str, condition: typ.Any, by: str = "name") -> str:
+    """
+    Key a rule is placed by: its name, or with ``by="field"`` one of the
+    top-level payload keys it reads, the one with the smallest hash. Rules
+    over the same fields then share a shard, and the more fields two rules
+    have in common the likelier they are placed together. Rules reading no
+    field fall back to their name.
+    """
+    if by not in PARTITION_KEYS:
+        raise ValueError(f"Unknown partition key: {by}")  # noqa: TRY003, EM102
+    if by == "field":
+        keys = set(filter(None, map(root_key, referenced_fields(condition))))
+        if keys:
+            return min(keys, key=_hash)
+    return name
+
+
+def partition(
+    rules: typ.Iterable[tuple[str, typ.Any]],
+    ring: HashRing,
+    by: str = "name",
+) -> dict[str, list[tuple[str, typ.Any]]]:
+    """The ``(name, condition)`` pairs of each shard of ``ring``."""
+    shards: dict[str, list[tuple[str, typ.Any]]] = {shard: [] for shard in ring.shards}
+    for name, condition in rules:
+        shards[ring.shard_for(partition_key(name, condition, by))].append(
+            (name, condition),
+        )
+    return shards
+
+
+class ShardError(Exception):
+    """A worker that cannot be reached."""
+
+
+def _serve(connection: typ.Any, rules: list[tuple[str, typ.Any]]) -> None:
+    """Worker loop: evaluate ``(request_id, payload, names)`` until ``None``."""
+    ruleset = PackedRuleSet(rules)
+    del rules
+    connection.send(("ready", len(ruleset)))
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        request_id, payload, names = message
+        try:
+            connection.send((request_id, ruleset.evaluate(payload, names), None))
+        except Exception as exc:  # noqa: BLE001
+            connection.send((request_id, None, f"{type(exc).__name__}: {exc}"))
+
+
+class LocalWorker:
+    """A process holding the rules of one shard, reached through a pipe."""
+
+    def __init__(self, rules: list[tuple[str, typ.Any]], context: typ.Any) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, rules), daemon=True)
+        self.process.start()
+        child.close()
+        # Consecutive failures: the least failing worker of a group is tried first.
+        self.failures = 0
+        self.rule_count: int | None = None
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def wait_ready(self, timeout: float) -> None:
+        if not self.connection.poll(timeout):
+            msg = "Worker did not start in time"
+            raise ShardError(msg)
+        try:
+            _, self.rule_count = self.connection.recv()
+        except (EOFError, OSError) as exc:
+            raise ShardError(str(exc) or "Worker exited while starting") from exc
+
+    def send(self, request_id: int, payload: typ.Any, names: list[str] | None) -> None:
+        try:
+            self.connection.send((request_id, payload, names))
+        except (OSError, ValueError) as exc:
+            raise ShardError(str(exc)) from exc
+
+    def receive(self, request_id: int) -> tuple[typ.Any, str | None] | None:
+        """
+        The ``(outcome, error)`` reply to ``request_id``, or ``None`` if the
+        available message was a late reply to an earlier, abandoned request.
+        """
+        try:
+            reply_id, outcome, error = self.connection.recv()
+        except (EOFError, OSError) as exc:
+            raise ShardError(str(exc) or "Worker exited") from exc
+        return (outcome, error) if reply_id == request_id else None
+
+    def close(self, timeout: float = 1.0) -> None:
+        with contextlib.suppress(OSError, ValueError):
+            self.connection.send(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.connection.close()
+
+
+class ScatterResult(typ.NamedTuple):
+    passed: list[str]
+    failed: list[str]
+    # Rules of the shards that could not answer, and why, by shard.
+    unavailable: list[str]
+    errors: dict[str, str]
+
+
+class _Gather:
+    """State of one scatter request while its shards answer."""
+
+    def __init__(
+        self,
+        request_id: int,
+        payload: typ.Any,
+        names: dict[str, list[str] | None],
+        rules: dict[str, list[str]],
+        remaining: dict[str, list[LocalWorker]],
+    ) -> None:
+        self.request_id = request_id
+        self.payload = payload
+        # The names sent to each shard involved, ``None`` for all of its
+        # rules, and the rules they stand for.
+        self.names = names
+        self.rules = rules
+        # Shard -> workers not tried yet, and the worker waited on.
+        self.remaining = remaining
+        self.waiting: dict[typ.Any, tuple[str, LocalWorker]] = {}
+        self.outcomes: list[tuple[list[str], list[str]]] = []
+        self.unavailable: list[list[str]] = []
+        self.errors: dict[str, str] = {}
+
+    def dispatch(self, shard: str) -> None:
+        """Send the request to the next worker of ``shard`` that takes it."""
+        while self.remaining[shard]:
+            worker = self.remaining[shard].pop(0)
+            try:
+                worker.send(self.request_id, self.payload, self.names[shard])
+            except ShardError as exc:
+                worker.failures += 1
+                self.errors[shard] = str(exc)
+                continue
+            self.waiting[worker.connection] = (shard, worker)
+            return
+        self.errors.setdefault(shard, "No live worker")
+        self.unavailable.append(self.rules[shard])
+
+    def receive(self, connection: typ.Any) -> None:
+        shard, worker = self.waiting[connection]
+        try:
+            reply = worker.receive(self.request_id)
+        except ShardError as exc:
+            worker.failures += 1
+            self.errors[shard] = str(exc)
+            del self.waiting[connection]
+            self.dispatch(shard)
+            return
+        if reply is None:
+            return
+        del self.waiting[connection]
+        worker.failures = 0
+        outcome, error = reply
+        if error is None:
+            # Earlier workers may have failed: the shard answered.
+            self.errors.pop(shard, None)
+            self.outcomes.append(outcome)
+        else:
+            # The other workers hold the same rules: no retry.
+            self.errors[shard] = error
+            self.unavailable.append(self.rules[shard])
+
+    def time_out(self) -> None:
+        for shard, worker in self.waiting.values():
+            # Its late reply is skipped by the next request.
+            worker.failures += 1
+            self.errors[shard] = "Timed out"
+            self.unavailable.append(self.rules[shard])
+        self.waiting.clear()
+
+    def result(self) -> ScatterResult:
+        return ScatterResult(
+            list(heapq.merge(*(passed for passed, _ in self.outcomes))),
+            list(heapq.merge(*(failed for _, failed in self.outcomes))),
+            list(heapq.merge(*self.unavailable)),
+            self.errors,
+        )
+
+
+class ShardedRuleSet:
+    """
+    Rules split into ``shards`` groups of ``replicas`` worker processes.
+
+    ``evaluate`` has the signature and the outcomes of
+    ``CompiledRuleSet.evaluate``, except that rules are in name order and
+    unavailable rules are failed, like rules whose evaluation raises.
+    ``scatter`` keeps them apart. One request is in flight at a time:
+    concurrent callers wait for each other.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        rules: typ.Iterable[tuple[str, typ.Any]],
+        *,
+        shards: int = 2,
+        replicas: int = 1,
+        by: str = "name",
+        timeout: float = DEFAULT_TIMEOUT,
+        start_timeout: float = 60.0,
+        vnodes: int = DEFAULT_VNODES,
+        context: typ.Any = None,
+    ) -> None:
+        if shards <= 0 or replicas <= 0:
+            msg = "shards and replicas must be positive"
+            raise ValueError(msg)
+        # Workers only import the rule engine: spawning them is cheap and
+        # safe in threaded servers, unlike forking.
+        context = context or multiprocessing.get_context("spawn")
+        self.ring = HashRing(
+            [f"shard-{index}" for index in range(shards)],
+            vnodes=vnodes,
+        )
+        self.timeout = timeout
+        self.shard_rules: dict[str, list[str]] = {}
+        self.assignment: dict[str, str] = {}
+        self.groups: dict[str, list[LocalWorker]] = {}
+        for shard, shard_rules in partition(rules, self.ring, by).items():
+            self.shard_rules[shard] = sorted(name for name, _ in shard_rules)
+            self.assignment.update((name, shard) for name, _ in shard_rules)
+            self.groups[shard] = [
+                LocalWorker(shard_rules, context) for _ in range(replicas)
+            ]
+
+        deadline = time.monotonic() + start_timeout
+        for worker in self.workers():
+            try:
+                worker.wait_ready(max(deadline - time.monotonic(), 0))
+            except ShardError:
+                worker.failures += 1
+        self._rotation = itertools.count()
+        self._request_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ShardedRuleSet":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.assignment)
+
+    def workers(self) -> typ.Iterator[LocalWorker]:
+        return itertools.chain.from_iterable(self.groups.values())
+
+    def close(self) -> None:
+        for worker in self.workers():
+            worker.close()
+
+    def _candidates(self, shard: str) -> list[LocalWorker]:
+        """Live workers of ``shard``, least failing first, rotating among equals."""
+        group = self.groups[shard]
+        start = next(self._rotation) % len(group)
+        rotated = group[start:] + group[:start]
+        return sorted(
+            (worker for worker in rotated if worker.is_alive()),
+            key=lambda worker: worker.failures,
+        )
+
+    def scatter(
+        self,
+        payload: dict[str, typ.Any],
+        names: typ.Iterable[str] | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> ScatterResult:
+        """
+        Evaluate the rules called ``names``, by default all of them, on the
+        shards holding them. Unknown names raise ``KeyError``.
+        """
+        requested: dict[str, list[str] | None]
+        if names is None:
+            requested = dict.fromkeys(self.groups)
+        else:
+            by_shard: dict[str, list[str]] = {}
+            for name in sorted(set(names)):
+                by_shard.setdefault(self.assignment[name], []).append(name)
+            requested = dict(by_shard)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._lock:
+            gather = _Gather(
+                next(self._request_ids),
+                payload,
+                requested,
+                {
+                    shard: shard_names or self.shard_rules[shard]
+                    for shard, shard_names in requested.items()
+                },
+                {shard: self._candidates(shard) for shard in requested},
+            )
+            for shard in requested:
+                gather.dispatch(shard)
+            while gather.waiting:
+                ready = wait(list(gather.waiting), max(deadline - time.monotonic(), 0))
+                if not ready:
+                    break
+                for connection in ready:
+                    gather.receive(connection)
+            gather.time_out()
+        return gather.result()
+
+    def evaluate(
+        self,
+        payload: dict[str, typ.Any],
+        names: typ.Iterable[str] | None = None,
+    ) -> tuple[list[str], list[str]]:
+        """Return the ``(passed, failed)`` rule names, unavailable rules failing."""
+        result = self.scatter(payload, names)
+        return result.passed, list(heapq.merge(result.failed, result.unavailable))
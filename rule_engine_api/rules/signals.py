@@ -0,0 +1,26 @@
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.models import RuleSet
+from rule_engine_api.rules.models import RuleSetMembership
+from rule_engine_api.rules.versioning import schedule_version_bump
+
+
+@receiver(post_save, sender=Rule)
+@receiver(post_delete, sender=Rule)
+@receiver(post_save, sender=RuleSet)
+@receiver(post_delete, sender=RuleSet)
+@receiver(post_save, sender=RuleSetMembership)
+@receiver(post_delete, sender=RuleSetMembership)
+def rule_changed(sender, **kwargs):
+    schedule_version_bump()
+
+
+@receiver(m2m_changed, sender=RuleSetMembership)
+def ruleset_members_changed(sender, action, **kwargs):
+    # ``ruleset.rules.add()``/``remove()`` skip the membership save signals.
+    if action.startswith("post_"):
+        schedule_version_bump()
@@ -0,0 +1,339 @@
+"""
+Cold start profiling of the project's entry points.
+
+Each probe runs in a fresh interpreter under ``-X importtime`` and goes
+through the phases a server or worker goes through when it boots:
+
+- ``setup``: ``django.setup()``, i.e. settings plus a ready app registry;
+- ``import``: importing the entry point module, e.g. ``config.wsgi``;
+- ``first_request``: one request through the application, which imports
+  the URLconf and views. For the Celery app it is the import of the task
+  modules and the finalization a worker does before taking tasks.
+
+The ``-X importtime`` lines are split by phase and ranked, so the report
+shows both where the time goes and which project module asked for it.
+"""
+
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+import typing as typ
+
+DEFAULT_TARGETS = ("config.wsgi", "config.asgi", "config.celery_app")
+PHASES = ("setup", "import", "first_request")
+PROJECT_PACKAGES = ("config", "rule_engine_api")
+
+_PHASE_MARKER = "startup-phase: "
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+# Run with ``python -X importtime -c _PROBE <target> <path> <host>``. It only
+# imports what the phases need, and prints its timings as JSON on stdout.
+_PROBE = """
+import sys
+import time
+
+target, path, host = sys.argv[1:4]
+timings = {}
+
+
+def phase(name):
+    sys.stderr.write("%s%s\\n" % (PHASE_MARKER, name))
+    sys.stderr.flush()
+
+
+def first_request(application):
+    import inspect
+
+    if inspect.iscoroutinefunction(application) or inspect.iscoroutinefunction(
+        getattr(application, "__call__", None)
+    ):
+        import asyncio
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "https",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [(b"host", host.encode())],
+            "client": ("127.0.0.1", 0),
+            "server": (host, 443),
+        }
+        sent = []
+
+        async def run():
+            # Django cancels the response as soon as the client disconnects.
+            finished = asyncio.Event()
+            received = []
+
+            async def receive():
+                if received:
+                    await finished.wait()
+                    return {"type": "http.disconnect"}
+                received.append(True)
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                sent.append(message)
+                body = message["type"] == "http.response.body"
+                if body and not message.get("more_body"):
+                    finished.set()
+
+            await application(scope, receive, send)
+
+        asyncio.run(run())
+        return sent[0]["status"] if sent else 0
+
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {
+        "PATH_INFO": path,
+        "HTTP_HOST": host,
+        "wsgi.url_scheme": "https",
+        "HTTPS": "on",
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(
+        environ,
+        lambda status, headers, exc_info=None: statuses.append(status),
+    )
+    try:
+        b"".join(body)
+    finally:
+        getattr(body, "close", lambda: None)()
+    return int(statuses[0].split()[0])
+
+
+phase("setup")
+start = time.perf_counter()
+import django
+
+django.setup()
+timings["setup"] = time.perf_counter() - start
+
+phase("import")
+start = time.perf_counter()
+module = __import__(target, fromlist=["*"])
+timings["import"] = time.perf_counter() - start
+
+phase("first_request")
+start = time.perf_counter()
+status = None
+if hasattr(module, "application"):
+    status = first_request(module.application)
+else:
+    module.app.loader.import_default_modules()
+    module.app.finalize(auto=True)
+timings["first_request"] = time.perf_counter() - start
+
+phase("done")
+import json
+
+sys.stdout.write(json.dumps({"timings": timings, "status": status}))
+""".replace("PHASE_MARKER", repr(_PHASE_MARKER))
+
+
+def is_project_module(module: str) -> bool:
+    return any(
+        module == package or module.startswith(f"{package}.")
+        for package in PROJECT_PACKAGES
+    )
+
+
+class ImportRecord(typ.NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    phase: str
+    # Module whose import statement loaded this one, if any.
+    importer: str | None
+
+
+def parse_importtime(lines: typ.Iterable[str]) -> list[ImportRecord]:
+    """
+    Records of ``-X importtime`` output lines, in their original order.
+    Phase markers written by the probe attribute the lines that follow
+    them; lines before the first marker are the interpreter's own.
+    """
+    rows = []
+    phase = "interpreter"
+    for line in lines:
+        if line.startswith(_PHASE_MARKER):
+            phase = line[len(_PHASE_MARKER) :].strip()
+            continue
+        match = _IMPORT_LINE.match(line.rstrip("\n"))
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append(
+                (module, int(self_us), int(cumulative_us), phase, len(indent) // 2),
+            )
+
+    # Modules are printed after the ones they import: walking backwards
+    # meets every importer before its imports. No import spans a marker.
+    importers: list[str | None] = [None] * len(rows)
+    stack: list[tuple[int, str]] = []
+    for index in reversed(range(len(rows))):
+        module, _, _, phase, depth = rows[index]
+        if index + 1 < len(rows) and rows[index + 1][3] != phase:
+            stack.clear()
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        if stack and stack[-1][0] == depth - 1:
+            importers[index] = stack[-1][1]
+        stack.append((depth, module))
+    return [
+        ImportRecord(module, self_us, cumulative_us, phase, importer)
+        for (module, self_us, cumulative_us, phase, _), importer in zip(
+            rows,
+            importers,
+            strict=True,
+        )
+    ]
+
+
+class StartupProfile:
+    """Phase timings and imports of one entry point, over repeated probes."""
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self.runs: list[dict[str, float]] = []
+        self.statuses: list[int | None] = []
+        # Module -> records of the runs, in probe order.
+        self.imports: dict[str, list[ImportRecord]] = {}
+
+    def record(
+        self,
+        timings: dict[str, float],
+        status: int | None,
+        imports: typ.Iterable[ImportRecord],
+    ) -> None:
+        self.runs.append(timings)
+        self.statuses.append(status)
+        for record in imports:
+            self.imports.setdefault(record.module, []).append(record)
+
+    def phase_median(self, phase: str) -> float:
+        return statistics.median(run[phase] for run in self.runs)
+
+    def median_imports(self) -> list[ImportRecord]:
+        """One record per module, with the median times of the runs."""
+        return [
+            records[0]._replace(
+                self_us=int(statistics.median(record.self_us for record in records)),
+                cumulative_us=int(
+                    statistics.median(record.cumulative_us for record in records),
+                ),
+            )
+            for records in self.imports.values()
+        ]
+
+    def to_dict(self) -> dict[str, typ.Any]:
+        return {
+            "target": self.target,
+            "runs": self.runs,
+            "statuses": self.statuses,
+            "imports": [record._asdict() for record in self.median_imports()],
+        }
+
+    def report(self, top: int = 20) -> str:
+        imports = self.median_imports()
+        lines = [f"{self.target} (median of {len(self.runs)} runs)", ""]
+        lines.append(f"{'Phase':<16}{'ms':>10}{'Modules':>10}")
+        for phase in ("interpreter", *PHASES, "process"):
+            modules = sum(record.phase == phase for record in imports)
+            shown = f"{modules:>10}" if phase != "process" else ""
+            lines.append(f"{phase:<16}{self.phase_median(phase) * 1000:>10.1f}{shown}")
+        statuses = {status for status in self.statuses if status is not None}
+        if statuses:
+            lines.append(
+                f"First request status: {', '.join(map(str, sorted(statuses)))}",
+            )
+
+        lines += ["", f"Slowest imports by own time (top {top})"]
+        lines.append(f"{'self ms':>9}{'cum ms':>9}  {'phase':<14}module")
+        lines.extend(
+            f"{record.self_us / 1000:>9.1f}{record.cumulative_us / 1000:>9.1f}  "
+            f"{record.phase:<14}{record.module}"
+            for record in sorted(imports, key=lambda record: -record.self_us)[:top]
+        )
+
+        # Outside imports whose statement is in a project module: the ones
+        # the project can defer.
+        caused = [
+            record
+            for record in imports
+            if record.importer
+            and is_project_module(record.importer)
+            and not is_project_module(record.module)
+        ]
+        lines += ["", f"Slowest imports made by project modules (top {top})"]
+        lines.append(f"{'cum ms':>9}  {'phase':<14}{'module':<48}imported by")
+        lines.extend(
+            f"{record.cumulative_us / 1000:>9.1f}  {record.phase:<14}"
+            f"{record.module:<48}{record.importer}"
+            for record in sorted(caused, key=lambda record: -record.cumulative_us)[:top]
+        )
+        return "\n".join(lines)
+
+
+def probe(
+    target: str,
+    *,
+    path: str = "/api/evaluate/",
+    host: str = "localhost",
+    env: dict[str, str] | None = None,
+    cwd: str | None = None,
+) -> tuple[dict[str, float], int | None, list[ImportRecord]]:
+    """
+    Boot ``target`` once in a new interpreter; returns the phase timings in
+    seconds, the first request status and the import records.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", _PROBE, target, path, host],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    stderr = completed.stderr.splitlines()
+    if completed.returncode:
+        output = [line for line in stderr if not line.startswith("import time:")]
+        msg = f"{target} failed to start:\n" + "\n".join(output[-20:])
+        raise RuntimeError(msg)
+
+    result = json.loads(completed.stdout)
+    timings = {**result["timings"], "process": elapsed}
+    imports = parse_importtime(stderr)
+    interpreter = [record for record in imports if record.phase == "interpreter"]
+    # Top-level imports only: cumulative times include nested ones.
+    timings["interpreter"] = (
+        sum(record.cumulative_us for record in interpreter if record.importer is None)
+        / 1e6
+    )
+    return (
+        timings,
+        result["status"],
+        [record for record in imports if record.phase != "done"],
+    )
+
+
+def profile_startup(
+    target: str,
+    *,
+    repeat: int = 3,
+    **kwargs: typ.Any,
+) -> StartupProfile:
+    profile = StartupProfile(target)
+    for _ in range(repeat):
+        profile.record(*probe(target, **kwargs))
+    return profile
@@ -0,0 +1,71 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rule_engine_api.rules.models import Decision
+
+RULE_STATS_KEY = "rules:failure-rates"
+
+
+def compute_failure_rates(sample_size: int) -> dict[str, float]:
+    """
+    Failure rate of each rule over the latest ``sample_size`` audited
+    decisions, smoothed towards 1/2 so rarely seen rules are not trusted
+    on a handful of outcomes.
+
+    Only rules that were actually evaluated count: a fail-fast decision
+    lists the rules it ran, not those it skipped.
+    """
+    evaluated: Counter[str] = Counter()
+    failed: Counter[str] = Counter()
+    decisions = Decision.objects.order_by("-created_at").values_list(
+        "passed_rules",
+        "failed_rules",
+    )[:sample_size]
+    for passed_rules, failed_rules in decisions.iterator(chunk_size=2000):
+        evaluated.update(passed_rules)
+        evaluated.update(failed_rules)
+        failed.update(failed_rules)
+    return {name: (failed[name] + 1) / (count + 2) for name, count in evaluated.items()}
+
+
+def refresh_failure_rates() -> dict[str, float]:
+    """
+    Recompute the failure rates and share them through the cache. Run by
+    ``refresh_failure_rates_task`` on a beat schedule, never in a request.
+    """
+    rates = compute_failure_rates(settings.RULES_STATS_SAMPLE_SIZE)
+    # No expiry: stale rates still order rules better than none.
+    cache.set(RULE_STATS_KEY, rates, timeout=None)
+    return rates
+
+
+class _FailureRates:
+    """
+    Process-local copy of the failure rates kept in the shared cache. The
+    same dict object is returned until it expires, so callers can cache
+    work derived from it by identity. Until the rates are first computed
+    this is an empty dict.
+    """
+
+    def __init__(self) -> None:
+        self._rates: dict[str, float] = {}
+        self._expires = 0.0
+
+    def get(self) -> dict[str, float]:
+        if self._expires <= time.monotonic():
+            # Concurrent readers may both hit the cache, but never wait.
+            self._expires = time.monotonic() + settings.RULES_STATS_LOCAL_TIMEOUT
+            rates = cache.get(RULE_STATS_KEY)
+            if rates is not None and rates != self._rates:
+                self._rates = rates
+        return self._rates
+
+    def clear(self) -> None:
+        self._rates = {}
+        self._expires = 0.0
+
+
+failure_rates = _FailureRates()
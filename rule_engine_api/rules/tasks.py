@@ -0,0 +1,19 @@
+import typing as typ
+
+from celery import shared_task
+
+from rule_engine_api.rules.audit import rows_from_json
+from rule_engine_api.rules.audit import write_decisions
+from rule_engine_api.rules.stats import refresh_failure_rates
+
+
+@shared_task()
+def write_decisions_task(rows: list[dict[str, typ.Any]]) -> int:
+    """Insert a batch of decisions queued by ``DecisionLog`` in celery mode."""
+    return write_decisions(rows_from_json(rows), batch_size=len(rows) or 1)
+
+
+@shared_task()
+def refresh_failure_rates_task() -> int:
+    """Recompute the rule failure rates fail-fast evaluations are ordered by."""
+    return len(refresh_failure_rates())
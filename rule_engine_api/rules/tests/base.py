@@ -0,0 +1,60 @@
+import typing as typ
+
+from rest_framework.test import APIClient
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.users.tests.test_user_roles import UserSetupTestCase
+
+ADULT = {"field": "age", "operator": ">=", "value": 18}
+RESIDENT = {"field": "country", "operator": "==", "value": "TH"}
+
+# Adult, and resident or earning over 1000.
+ELIGIBLE = {
+    "AND": [
+        ADULT,
+        {
+            "OR": [
+                RESIDENT,
+                {"field": "income", "operator": ">", "value": 1000},
+            ],
+        },
+    ],
+}
+
+DECISION_TABLE: dict[str, typ.Any] = {
+    "table": {
+        "columns": ["country", "product", "channel.name"],
+        "rows": [
+            ["TH", "loan", "web", True],
+            ["TH", "loan", "app", False],
+            ["US", "card", "web", True],
+        ],
+        "default": False,
+    },
+}
+
+
+def nested_condition(depth: int) -> dict:
+    """Alternating OR/AND chain ``depth`` levels deep that holds for ``{"x": 1}``."""
+    condition = {"field": "x", "operator": "==", "value": 1}
+    for level in range(depth - 1):
+        kind = "AND" if level % 2 else "OR"
+        sibling = {"field": "x", "operator": "==", "value": 1 if kind == "AND" else 2}
+        condition = {kind: [sibling, condition]}
+    return condition
+
+
+class RuleSetupTestCase(UserSetupTestCase):
+    def create_rule(self, name: str, condition: typ.Any = None, **fields) -> Rule:
+        return Rule.objects.create(
+            name=name,
+            condition={} if condition is None else condition,
+            created_by=self.admin,
+            **fields,
+        )
+
+    def api(self, user=None) -> APIClient:
+        """A client authenticated as ``user``, the admin by default."""
+        client = APIClient()
+        client.force_authenticate(user=user or self.admin)
+        return client
@@ -0,0 +1,89 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.audit import DecisionLog
+from rule_engine_api.rules.models import Decision
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+
+
+class DecisionLogTest(RuleSetupTestCase):
+    def row(self, result="APPROVED"):
+        return {
+            "created_at": timezone.now(),
+            "user_id": self.client.pk,
+            "rules": ["A"],
+            "payload": {"age": 1},
+            "result": result,
+            "passed_rules": ["A"],
+            "failed_rules": [],
+        }
+
+    def test_evaluate_records_decision(self) -> None:
+        self.create_rule("Adult", ADULT)
+        client = self.api(self.client)
+        res = client.post(
+            reverse("evaluate"),
+            data={"rules": ["Adult"], "payload": {"age": 10, "noise": 1}},
+            format="json",
+        )
+        assert res.status_code == status.HTTP_200_OK
+        decision = Decision.objects.get()
+        assert decision.user == self.client
+        assert decision.result == Decision.ResultChoice.REJECTED
+        assert decision.payload == {"age": 10}
+        assert decision.failed_rules == ["Adult"]
+
+    def test_flush_writes_in_batches(self) -> None:
+        log = DecisionLog(batch_size=3, autostart=False)
+        for _ in range(7):
+            log.submit(self.row())
+        assert Decision.objects.count() == 0
+        with CaptureQueriesContext(connection) as ctx:
+            log.flush()
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 3  # noqa: PLR2004
+        assert Decision.objects.count() == 7  # noqa: PLR2004
+        assert len(log) == 0
+
+    def test_drop_newest_when_full(self) -> None:
+        log = DecisionLog(queue_size=2, autostart=False)
+        assert log.submit(self.row())
+        assert log.submit(self.row())
+        assert not log.submit(self.row("REJECTED"))
+        assert log.dropped == 1
+        log.flush()
+        assert not Decision.objects.filter(result="REJECTED").exists()
+
+    def test_drop_oldest_when_full(self) -> None:
+        log = DecisionLog(queue_size=2, overflow="drop_oldest", autostart=False)
+        log.submit(self.row())
+        log.submit(self.row())
+        assert log.submit(self.row("REJECTED"))
+        assert log.dropped == 1
+        log.flush()
+        assert list(
+            Decision.objects.values_list("result", flat=True).order_by("id"),
+        ) == [
+            "APPROVED",
+            "REJECTED",
+        ]
+
+    def test_block_times_out_then_drops(self) -> None:
+        log = DecisionLog(
+            queue_size=1,
+            overflow="block",
+            block_timeout=0.01,
+            autostart=False,
+        )
+        log.submit(self.row())
+        assert not log.submit(self.row())
+        assert log.dropped == 1
+
+    def test_invalid_mode(self) -> None:
+        with self.assertRaisesMessage(ImproperlyConfigured, "RULES_AUDIT_LOG_MODE"):
+            DecisionLog(mode="kafka")
@@ -0,0 +1,211 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+from rule_engine_api.rules.versioning import batched_version_bump
+from rule_engine_api.rules.versioning import get_ruleset_version
+
+
+class RuleBulkApiTest(RuleSetupTestCase):
+    def test_bulk_create_bumps_version_once(self) -> None:
+        version = get_ruleset_version()
+        payload = [
+            {
+                "name": f"Age over {age}",
+                "condition": {"field": "age", "operator": ">=", "value": age},
+                "is_active": True,
+            }
+            for age in (18, 21, 30)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            res = self.api().post(
+                reverse("api:rules-bulk-create"),
+                data=payload,
+                format="json",
+            )
+        assert res.status_code == status.HTTP_201_CREATED
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+        assert res.data["count"] == 3  # noqa: PLR2004
+        assert get_ruleset_version() == version + 1
+        rule = Rule.objects.get(name="Age over 21")
+        assert rule.created_by == self.admin
+        assert rule.fields == ["age"]
+
+    def test_batched_bump_when_block_raises(self) -> None:
+        def write_then_fail():
+            with batched_version_bump():
+                self.create_rule("Written before the error")
+                msg = "Interrupted"
+                raise CommandError(msg)
+
+        version = get_ruleset_version()
+        with pytest.raises(CommandError, match="Interrupted"):
+            write_then_fail()
+        assert get_ruleset_version() == version + 1
+
+    @mock.patch("rule_engine_api.rules.api.serializers.BULK_MAX_ITEMS", 2)
+    def test_bulk_create_limits_items(self) -> None:
+        url = reverse("api:rules-bulk-create")
+        rules = [
+            {"name": f"Rule {i}", "condition": {}, "is_active": True} for i in range(3)
+        ]
+        for payload in ([], rules):
+            res = self.api().post(url, data=payload, format="json")
+            assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Rule.objects.exists()
+
+    def test_bulk_create_rejects_existing_names(self) -> None:
+        self.create_rule("Taken")
+        payload = [{"name": "Taken", "condition": {}, "is_active": True}]
+        res = self.api().post(
+            reverse("api:rules-bulk-create"),
+            data=payload,
+            format="json",
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert Rule.objects.count() == 1
+
+    def test_bulk_update_activate_and_delete(self) -> None:
+        first = self.create_rule("First")
+        second = self.create_rule("Second")
+        client = self.api()
+
+        res = client.post(
+            reverse("api:rules-bulk-update"),
+            data=[
+                {
+                    "id": first.pk,
+                    "condition": {"field": "pet", "operator": "==", "value": "cat"},
+                },
+                {"id": second.pk, "name": "Second renamed"},
+            ],
+            format="json",
+        )
+        assert res.status_code == status.HTTP_200_OK
+        first.refresh_from_db()
+        assert first.fields == ["pet"]
+        assert Rule.objects.filter(name="Second renamed").exists()
+
+        res = client.post(
+            reverse("api:rules-bulk-activate"),
+            data={"ids": [first.pk, second.pk], "is_active": False},
+            format="json",
+        )
+        assert res.data["count"] == 2  # noqa: PLR2004
+        assert not Rule.objects.filter(is_active=True).exists()
+
+        res = client.post(
+            reverse("api:rules-bulk-delete"),
+            data={"ids": [first.pk]},
+            format="json",
+        )
+        assert res.data["count"] == 1
+        assert list(Rule.objects.values_list("pk", flat=True)) == [second.pk]
+
+    def test_bulk_update_unknown_id(self) -> None:
+        res = self.api().post(
+            reverse("api:rules-bulk-update"),
+            data=[{"id": 999, "is_active": False}],
+            format="json",
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_client_cannot_bulk_delete(self) -> None:
+        client = self.api(self.client)
+        res = client.post(
+            reverse("api:rules-bulk-delete"),
+            data={"ids": [1]},
+            format="json",
+        )
+        assert res.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_evaluate_sees_bulk_update(self) -> None:
+        rule = self.create_rule(
+            "Pet",
+            {"field": "pet", "operator": "==", "value": "dog"},
+        )
+        client = self.api()
+        request = {"rules": ["Pet"], "payload": {"pet": "cat"}}
+        assert (
+            client.post(reverse("evaluate"), data=request, format="json").data["result"]
+            == "REJECTED"
+        )
+        client.post(
+            reverse("api:rules-bulk-update"),
+            data=[
+                {
+                    "id": rule.pk,
+                    "condition": {"field": "pet", "operator": "==", "value": "cat"},
+                },
+            ],
+            format="json",
+        )
+        assert (
+            client.post(reverse("evaluate"), data=request, format="json").data["result"]
+            == "APPROVED"
+        )
+
+
+class RuleImportExportCommandTest(RuleSetupTestCase):
+    def test_export_then_import_upserts_by_name(self) -> None:
+        self.create_rule("Pet", {"field": "pet", "operator": "==", "value": "dog"})
+        self.create_rule("Off", {"AND": []}, is_active=False)
+        out = StringIO()
+        call_command("export_rules", stdout=out, stderr=StringIO())
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["Pet", "Off"]
+
+        Rule.objects.filter(name="Pet").update(condition={})
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as stream:
+            stream.write("\n".join(lines))
+            new = {
+                "name": "New",
+                "condition": {"field": "a", "operator": "==", "value": 1},
+            }
+            stream.write(f"\n{json.dumps(new)}\n")
+        call_command(
+            "import_rules",
+            stream.name,
+            created_by=self.client.username,
+            chunk_size=2,
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+        Path(stream.name).unlink()
+
+        assert Rule.objects.get(name="Pet").fields == ["pet"]
+        new_rule = Rule.objects.get(name="New")
+        assert new_rule.is_active
+        assert new_rule.created_by == self.client
+        assert Rule.objects.get(name="Off").created_by == self.admin
+
+    def test_import_reports_invalid_lines(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as stream:
+            stream.write('{"name": "Ok", "condition": {"AND": []}}\n')
+            stream.write('not json\n{"condition": {}}\n')
+        err = StringIO()
+        with self.assertRaisesMessage(CommandError, "skipped 2"):
+            call_command(
+                "import_rules",
+                stream.name,
+                created_by=self.admin.username,
+                stdout=StringIO(),
+                stderr=err,
+            )
+        Path(stream.name).unlink()
+        assert Rule.objects.filter(name="Ok").exists()
+        assert "Line 2" in err.getvalue()
+        assert "Line 3" in err.getvalue()
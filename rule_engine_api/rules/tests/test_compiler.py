@@ -0,0 +1,198 @@
+import typing as typ
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.api.serializers import EvaluateRulesRequestSerializer
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.compiler import resolve_ruleset
+from rule_engine_api.rules.models import Decision
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.models import RuleSet
+from rule_engine_api.rules.models import RuleSetMembership
+from rule_engine_api.rules.stats import compute_failure_rates
+from rule_engine_api.rules.stats import failure_rates
+from rule_engine_api.rules.tasks import refresh_failure_rates_task
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import RESIDENT
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+
+
+class PayloadProjectionTest(RuleSetupTestCase):
+    def test_payload_projected_to_referenced_fields(self) -> None:
+        self.create_rule("Adult", ADULT)
+        self.create_rule(
+            "Tagged",
+            {"field": "tags", "operator": "contains", "value": "vip"},
+        )
+        payload: dict[str, typ.Any] = {
+            f"noise{i}": {"deep": list(range(10))} for i in range(100)
+        }
+        payload.update({"age": 30, "tags": ["vip"]})
+        serializer = EvaluateRulesRequestSerializer(
+            data={"rules": ["Adult", "Tagged"], "payload": payload},
+        )
+        assert serializer.is_valid()
+        assert serializer.validated_data["payload"] == {"age": 30, "tags": ["vip"]}
+        assert serializer.compiled_ruleset.referenced_fields == {"age", "tags"}
+
+    def test_inactive_rule_name_is_valid_but_not_evaluated(self) -> None:
+        self.create_rule("Off", is_active=False)
+        client = self.api(self.client)
+        res = client.post(
+            reverse("evaluate"),
+            data={"rules": ["Off"], "payload": {}},
+            format="json",
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["passed_rules"] == []
+        assert res.data["failed_rules"] == []
+
+
+class RuleSetEvaluateTest(RuleSetupTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.adult = self.create_rule("Adult", ADULT)
+        self.resident = self.create_rule("Resident", RESIDENT)
+        self.ruleset = RuleSet.objects.create(name="kyc_v3", created_by=self.admin)
+        RuleSetMembership.objects.create(
+            ruleset=self.ruleset,
+            rule=self.resident,
+            position=0,
+        )
+        RuleSetMembership.objects.create(
+            ruleset=self.ruleset,
+            rule=self.adult,
+            position=1,
+        )
+
+    def evaluate(self, data):
+        return self.api(self.client).post(reverse("evaluate"), data=data, format="json")
+
+    def test_evaluate_ruleset(self) -> None:
+        res = self.evaluate(
+            {"ruleset": "kyc_v3", "payload": {"age": 30, "country": "US"}},
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data == {
+            "result": "REJECTED",
+            "passed_rules": ["Adult"],
+            "failed_rules": ["Resident"],
+        }
+        assert Decision.objects.get().rules == ["Resident", "Adult"]
+
+    def test_cached_until_membership_changes(self) -> None:
+        self.evaluate({"ruleset": "kyc_v3", "payload": {"age": 1}})
+        with CaptureQueriesContext(connection) as queries:
+            resolve_ruleset("kyc_v3")
+        assert len(queries) == 0
+
+        self.ruleset.rules.remove(self.resident)
+        res = self.evaluate({"ruleset": "kyc_v3", "payload": {"age": 30}})
+        assert res.data["result"] == "APPROVED"
+        assert res.data["passed_rules"] == ["Adult"]
+
+    def test_unknown_ruleset(self) -> None:
+        res = self.evaluate({"ruleset": "nope", "payload": {}})
+        assert res.data["ruleset"] == ["Unknown ruleset: nope"]
+
+    def test_rules_or_ruleset(self) -> None:
+        res = self.evaluate({"ruleset": "kyc_v3", "rules": ["Adult"], "payload": {}})
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert self.evaluate({"payload": {}}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+class FailFastTest(RuleSetupTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        failure_rates.clear()
+        self.addCleanup(failure_rates.clear)
+        self.create_rule("Adult", ADULT)
+        self.create_rule("Resident", RESIDENT)
+        self.create_rule(
+            "Wealthy",
+            {
+                "AND": [
+                    {"field": "income", "operator": ">", "value": 1000},
+                    {"field": "assets", "operator": ">", "value": 1000},
+                ],
+            },
+        )
+
+    def test_failure_rates_count_evaluated_rules(self) -> None:
+        Decision.objects.create(
+            rules=["Adult", "Resident"],
+            result="REJECTED",
+            failed_rules=["Resident"],
+        )
+        Decision.objects.create(
+            rules=["Adult", "Resident"],
+            result="REJECTED",
+            passed_rules=["Adult"],
+            failed_rules=["Resident"],
+        )
+        assert compute_failure_rates(10) == {"Adult": 1 / 3, "Resident": 3 / 4}
+
+    def test_requests_only_read_the_cached_rates(self) -> None:
+        Decision.objects.create(
+            rules=["Adult", "Resident"],
+            result="REJECTED",
+            failed_rules=["Resident"],
+        )
+        with CaptureQueriesContext(connection) as queries:
+            assert failure_rates.get() == {}
+        assert not queries.captured_queries
+
+        refresh_failure_rates_task()
+        # Still the local copy until it expires.
+        assert failure_rates.get() == {}
+        failure_rates.clear()
+        assert failure_rates.get() == {"Resident": 2 / 3}
+
+    def test_cheapest_per_failure_first(self) -> None:
+        compiled = CompiledRuleSet(
+            Rule.objects.order_by("name").values_list("name", "condition"),
+        )
+        order = compiled.fail_fast_order(
+            {"Adult": 0.1, "Resident": 0.2, "Wealthy": 0.9},
+        )
+        assert [name for name, _ in order] == ["Wealthy", "Resident", "Adult"]
+        assert compiled.evaluate_fail_fast({"country": "US", "age": 30}, {}) == (
+            ["Adult"],
+            ["Resident"],
+        )
+
+    def test_fail_fast_request(self) -> None:
+        Decision.objects.create(
+            rules=["Adult", "Resident"],
+            result="REJECTED",
+            failed_rules=["Resident"],
+        )
+        assert refresh_failure_rates_task() == 1
+        res = self.api(self.client).post(
+            reverse("evaluate"),
+            data={
+                "rules": ["Adult", "Resident", "Wealthy"],
+                "payload": {"age": 1},
+                "mode": "fail_fast",
+            },
+            format="json",
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data == {
+            "result": "REJECTED",
+            "passed_rules": [],
+            "failed_rules": ["Resident"],
+        }
+
+        res = self.api(self.client).post(
+            reverse("evaluate"),
+            data={"rules": ["Adult", "Resident", "Wealthy"], "payload": {"age": 1}},
+            format="json",
+        )
+        assert res.data["failed_rules"] == ["Adult", "Resident", "Wealthy"]
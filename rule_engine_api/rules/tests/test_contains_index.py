@@ -0,0 +1,56 @@
+import typing as typ
+
+from django.test import SimpleTestCase
+
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.contains_index import AUTOMATON_MIN_PATTERNS
+from rule_engine_api.rules.contains_index import AhoCorasick
+from rule_engine_api.rules.contains_index import ContainsIndex
+from rule_engine_api.rules.rule_engine import evaluate_condition
+from rule_engine_api.rules.tests.base import ADULT
+
+
+class ContainsIndexTest(SimpleTestCase):
+    def test_aho_corasick_finds_overlapping_patterns(self) -> None:
+        automaton = AhoCorasick(["he", "she", "his", "hers", "x"])
+        assert automaton.search("ushers") == {"he", "she", "hers"}
+
+    def test_index_matches_string_and_list_fields(self) -> None:
+        keywords = [f"word{i}" for i in range(AUTOMATON_MIN_PATTERNS)]
+        conditions: list[typ.Any] = [
+            {"field": "text", "operator": "contains", "value": keyword}
+            for keyword in keywords
+        ]
+        conditions.append(
+            {
+                "OR": [
+                    {"field": "tags", "operator": "contains", "value": "vip"},
+                    {"field": "tags", "operator": "contains", "value": "staff"},
+                ],
+            },
+        )
+        index = ContainsIndex(conditions)
+        hits = index.search({"text": "a word3 and word5", "tags": ["vip", {"x": 1}]})
+        assert hits == {("text", "word3"), ("text", "word5"), ("tags", "vip")}
+
+    def test_compiled_ruleset_agrees_with_evaluate_condition(self) -> None:
+        rules: list[tuple[str, typ.Any]] = [
+            (f"rule{i}", {"field": "bio", "operator": "contains", "value": f"k{i}"})
+            for i in range(20)
+        ]
+        rules.append(
+            (
+                "mixed",
+                {
+                    "AND": [
+                        {"field": "bio", "operator": "contains", "value": "k1"},
+                        ADULT,
+                    ],
+                },
+            ),
+        )
+        payload = {"bio": "k1 k12 k7", "age": 20}
+        passed, failed = CompiledRuleSet(rules).evaluate(payload)
+        expected = [name for name, cond in rules if evaluate_condition(cond, payload)]
+        assert passed == expected
+        assert len(passed) + len(failed) == len(rules)
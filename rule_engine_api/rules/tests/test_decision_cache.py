@@ -0,0 +1,60 @@
+import threading
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from rule_engine_api.rules.decision_cache import decision_key
+from rule_engine_api.rules.decision_cache import get_or_compute_decision
+from rule_engine_api.rules.versioning import bump_ruleset_version
+
+
+class DecisionCacheTest(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return ["A"], []
+
+    def test_cached_decision_is_reused(self) -> None:
+        assert get_or_compute_decision(["A"], {"age": 1}, self.compute) == (["A"], [])
+        assert get_or_compute_decision(["A"], {"age": 1}, self.compute) == (["A"], [])
+        assert self.calls == 1
+        get_or_compute_decision(["A"], {"age": 2}, self.compute)
+        assert self.calls == 2  # noqa: PLR2004
+
+    def test_key_changes_with_ruleset_version(self) -> None:
+        key = decision_key(["B", "A"], {"x": 1})
+        assert key == decision_key(["A", "B"], {"x": 1})
+        bump_ruleset_version()
+        assert key != decision_key(["A", "B"], {"x": 1})
+
+    @override_settings(RULES_DECISION_CACHE_WAIT=5)
+    def test_concurrent_request_waits_for_in_flight_result(self) -> None:
+        key = decision_key(["A"], {"age": 1})
+        cache.add(f"{key}:lock", 1)
+        timer = threading.Timer(0.05, cache.set, args=(key, (["A"], [])))
+        timer.start()
+        try:
+            assert get_or_compute_decision(["A"], {"age": 1}, self.compute) == (
+                ["A"],
+                [],
+            )
+        finally:
+            timer.join()
+        assert self.calls == 0
+
+    @override_settings(RULES_DECISION_CACHE_WAIT=0.01)
+    def test_computes_when_in_flight_request_does_not_finish(self) -> None:
+        key = decision_key(["A"], {"age": 1})
+        cache.add(f"{key}:lock", 1)
+        assert get_or_compute_decision(["A"], {"age": 1}, self.compute) == (["A"], [])
+        assert self.calls == 1
+
+    @override_settings(RULES_DECISION_CACHE_ENABLED=False)
+    def test_disabled(self) -> None:
+        get_or_compute_decision(["A"], {"age": 1}, self.compute)
+        get_or_compute_decision(["A"], {"age": 1}, self.compute)
+        assert self.calls == 2  # noqa: PLR2004
@@ -0,0 +1,140 @@
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.incremental import IncrementalSession
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.normalize import canonicalize_condition
+from rule_engine_api.rules.normalize import referenced_fields
+from rule_engine_api.rules.partial import partially_evaluate
+from rule_engine_api.rules.rule_engine import compile_condition
+from rule_engine_api.rules.rule_engine import condition_errors
+from rule_engine_api.rules.rule_engine import evaluate_condition
+from rule_engine_api.rules.tests.base import DECISION_TABLE
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+
+
+class DecisionTableTest(SimpleTestCase):
+    table = DECISION_TABLE
+
+    def test_lookup(self) -> None:
+        predicate = compile_condition(self.table)
+        assert predicate(
+            {"country": "TH", "product": "loan", "channel": {"name": "web"}},
+            None,
+        )
+        assert not predicate(
+            {"country": "TH", "product": "loan", "channel": {"name": "app"}},
+            None,
+        )
+        assert not predicate(
+            {"country": "TH", "product": "card", "channel": {"name": "web"}},
+            None,
+        )
+        assert not predicate({"country": "US", "product": "card"}, None)
+        assert not predicate(
+            {"country": ["US"], "product": "card", "channel": {"name": "web"}},
+            None,
+        )
+        denied = {"table": {**self.table["table"], "default": True}}
+        assert evaluate_condition(
+            {"AND": [denied, {"field": "age", "operator": ">", "value": 1}]},
+            {"age": 2},
+        )
+
+    def test_fields_and_canonical_form(self) -> None:
+        assert referenced_fields(self.table) == ["channel.name", "country", "product"]
+        shuffled = {
+            "table": {
+                **self.table["table"],
+                "rows": self.table["table"]["rows"][::-1] * 2,
+            },
+        }
+        assert canonicalize_condition(shuffled) == canonicalize_condition(self.table)
+
+    def test_errors(self) -> None:
+        assert condition_errors(self.table) == []
+        assert condition_errors({"table": {"columns": [], "rows": []}}) == [
+            "table: 'columns' must be a non-empty list of field names",
+        ]
+        errors = condition_errors(
+            {
+                "table": {
+                    "columns": ["a"],
+                    "rows": [["x", True], ["x", False], ["y"], [["z"], True]],
+                },
+            },
+        )
+        assert errors == [
+            "table: row 2 contradicts an earlier row",
+            "table: row 3 must hold one value per column and an outcome",
+            "table: row 4 values must be strings, numbers, booleans or null",
+        ]
+        # The compiled dicts cannot tell equal values of different types apart.
+        errors = condition_errors(
+            {"table": {"columns": ["a"], "rows": [[1, True], [True, False]]}},
+        )
+        assert errors == ["table: row 2 contradicts an earlier row"]
+        assert (
+            condition_errors(
+                {"table": {"columns": ["a"], "rows": [[1, True], [1.0, True]]}},
+            )
+            == []
+        )
+
+    def test_partial_and_incremental(self) -> None:
+        assert partially_evaluate(self.table, {"country": "TH"}) == (None, self.table)
+        session = IncrementalSession(
+            [("Allowed", self.table)],
+            {"country": "TH", "product": "loan"},
+        )
+        assert session.apply({"channel": {"name": "web"}}) == {"Allowed": True}
+        assert session.apply({"product": "card"}) == {"Allowed": False}
+
+
+class DecisionTableApiTest(RuleSetupTestCase):
+    def test_create_and_evaluate(self) -> None:
+        api = self.api()
+        condition = DECISION_TABLE
+        res = api.post(
+            reverse("api:rules-list"),
+            data={
+                "name": "Allowed products",
+                "condition": condition,
+                "is_active": True,
+            },
+            format="json",
+        )
+        assert res.status_code == status.HTTP_201_CREATED
+        assert Rule.objects.get().fields == ["channel.name", "country", "product"]
+
+        res = api.post(
+            reverse("evaluate"),
+            data={
+                "rules": ["Allowed products"],
+                "payload": {
+                    "country": "US",
+                    "product": "card",
+                    "channel": {"name": "web"},
+                    "noise": 1,
+                },
+            },
+            format="json",
+        )
+        assert res.data["result"] == "APPROVED"
+
+    def test_invalid_table(self) -> None:
+        api = self.api()
+        res = api.post(
+            reverse("api:rules-list"),
+            data={
+                "name": "Bad",
+                "condition": {"table": {"columns": ["a"], "rows": [["x"]]}},
+                "is_active": True,
+            },
+            format="json",
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert res.data["condition"] == [
+            "table: row 1 must hold one value per column and an outcome",
+        ]
@@ -0,0 +1,170 @@
+import json
+import random
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from config.websocket import CLOSE_UNAUTHORIZED
+from config.websocket import websocket_application
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.incremental import IncrementalSession
+from rule_engine_api.rules.models import Decision
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import ELIGIBLE
+from rule_engine_api.rules.tests.base import RESIDENT
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+from rule_engine_api.users.api.serializers import RoleTokenObtainPairSerializer
+
+
+class IncrementalSessionTest(SimpleTestCase):
+    rules = [
+        ("Adult", ELIGIBLE),
+        ("Named", {"field": "profile.name", "operator": "exists"}),
+        ("Always", {"AND": []}),
+    ]
+
+    def test_reports_only_flipped_rules(self) -> None:
+        session = IncrementalSession(self.rules, {"age": 20, "country": "US"})
+        assert session.outcomes() == {"Adult": False, "Named": False, "Always": True}
+        assert session.apply({"income": 5000}) == {"Adult": True}
+        assert session.apply({"country": "TH"}) == {}
+        assert session.apply({"profile": {"name": "Ann"}}) == {"Named": True}
+        assert session.all_passed
+        assert session.apply({}, ["age", "unknown"]) == {"Adult": False}
+        assert not session.all_passed
+
+    def test_flip_and_back_within_a_delta(self) -> None:
+        session = IncrementalSession(self.rules, {"age": 20, "income": 5000})
+        assert session.apply({"age": 10, "income": 6000}) == {"Adult": False}
+        assert session.apply({"age": 30, "income": 0}) == {}
+
+    def test_matches_full_evaluation(self) -> None:
+        rng = random.Random(7)  # noqa: S311
+        fields = ["a", "b", "c", "d"]
+
+        def tree(depth):
+            if depth == 0 or rng.random() < 0.3:  # noqa: PLR2004
+                return {
+                    "field": rng.choice(fields),
+                    "operator": ">",
+                    "value": rng.randint(0, 9),
+                }
+            return {
+                rng.choice(["AND", "OR"]): [
+                    tree(depth - 1) for _ in range(rng.randint(0, 3))
+                ],
+            }
+
+        rules = [(f"r{i}", tree(4)) for i in range(20)]
+        payload = {field: rng.randint(0, 9) for field in fields}
+        session = IncrementalSession(rules, payload)
+        for _ in range(200):
+            expected = session.outcomes()
+            delta = {rng.choice(fields): rng.randint(0, 9)}
+            removed = [rng.choice(fields)] if rng.random() < 0.2 else []  # noqa: PLR2004
+            flipped = session.apply(delta, removed)
+            payload.update(delta)
+            for key in removed:
+                payload.pop(key, None)
+            outcomes = dict.fromkeys(CompiledRuleSet(rules).evaluate(payload)[0], True)
+            outcomes = {name: name in outcomes for name, _ in rules}
+            assert session.outcomes() == outcomes
+            assert flipped == {
+                name: value
+                for name, value in outcomes.items()
+                if expected[name] != value
+            }
+            assert session.all_passed == all(outcomes.values())
+
+
+class WebsocketSessionTest(RuleSetupTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.create_rule("Adult", ADULT)
+        self.create_rule("Resident", RESIDENT)
+
+    def converse(self, user, messages):
+        token = RoleTokenObtainPairSerializer.get_token(user).access_token
+
+        async def run():
+            communicator = ApplicationCommunicator(
+                websocket_application,
+                {"type": "websocket", "query_string": f"token={token}".encode()},
+            )
+            await communicator.send_input({"type": "websocket.connect"})
+            replies = [await communicator.receive_output()]
+            if replies[0]["type"] == "websocket.accept":
+                for message in messages:
+                    await communicator.send_input(
+                        {"type": "websocket.receive", "text": json.dumps(message)},
+                    )
+                    replies.append(
+                        json.loads((await communicator.receive_output())["text"]),
+                    )
+                await communicator.send_input(
+                    {"type": "websocket.disconnect", "code": 1000},
+                )
+            await communicator.wait()
+            return replies
+
+        return async_to_sync(run)()
+
+    def test_session(self) -> None:
+        replies = self.converse(
+            self.client,
+            [
+                {
+                    "type": "open",
+                    "rules": ["Adult", "Resident"],
+                    "payload": {"age": 30},
+                },
+                {"type": "delta", "set": {"country": "TH", "noise": 1}},
+                {"type": "delta", "set": {"age": 31}},
+                {"type": "delta", "unset": ["age"]},
+                {"type": "delta", "set": []},
+            ],
+        )
+        assert replies[0] == {"type": "websocket.accept"}
+        assert replies[1] == {
+            "type": "opened",
+            "result": "REJECTED",
+            "passed_rules": ["Adult"],
+            "failed_rules": ["Resident"],
+        }
+        assert replies[2] == {
+            "type": "changed",
+            "result": "APPROVED",
+            "passed_rules": ["Resident"],
+            "failed_rules": [],
+        }
+        assert replies[3]["passed_rules"] == replies[3]["failed_rules"] == []
+        assert replies[4]["failed_rules"] == ["Adult"]
+        assert replies[5]["type"] == "error"
+        decision = Decision.objects.get()
+        assert decision.payload == {"country": "TH"}
+        assert decision.failed_rules == ["Adult"]
+
+    def test_invalid_open(self) -> None:
+        replies = self.converse(
+            self.client,
+            [{"type": "open", "rules": ["Nope"], "payload": {}}],
+        )
+        assert replies[1]["type"] == "error"
+        assert "rules" in replies[1]["errors"]
+
+    def test_rejects_bad_token(self) -> None:
+        async def run():
+            communicator = ApplicationCommunicator(
+                websocket_application,
+                {"type": "websocket", "query_string": b"token=bad"},
+            )
+            await communicator.send_input({"type": "websocket.connect"})
+            return await communicator.receive_output()
+
+        assert async_to_sync(run)() == {
+            "type": "websocket.close",
+            "code": CLOSE_UNAUTHORIZED,
+        }
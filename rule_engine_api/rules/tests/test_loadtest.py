@@ -0,0 +1,88 @@
+import asyncio
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from rule_engine_api.rules.loadtest import LatencyHistogram
+from rule_engine_api.rules.loadtest import RunResult
+from rule_engine_api.rules.loadtest import recorded_requests
+from rule_engine_api.rules.loadtest import run_load
+from rule_engine_api.rules.loadtest import synthetic_requests
+
+
+class LoadTestHarnessTest(SimpleTestCase):
+    def test_histogram_percentiles_within_one_percent(self) -> None:
+        histogram = LatencyHistogram()
+        for value in range(1, 100_001):
+            histogram.record(value)
+        for percentile in (50, 95, 99):
+            expected = percentile * 1000
+            assert (
+                abs(histogram.value_at_percentile(percentile) - expected)
+                <= expected / 100
+            )
+        assert histogram.value_at_percentile(100) >= 100_000  # noqa: PLR2004
+        restored = LatencyHistogram.from_dict(
+            json.loads(json.dumps(histogram.to_dict())),
+        )
+        assert restored.value_at_percentile(99) == histogram.value_at_percentile(99)
+
+    def test_run_counts_errors_and_queueing(self) -> None:
+        async def transport(body):
+            await asyncio.sleep(0.01)
+            return 500 if b'"bad"' in body else 200
+
+        bodies = [{"rules": ["A"], "payload": {}}, {"rules": ["bad"], "payload": {}}]
+        result = run_load(transport, bodies, rps=200, duration=0.1, concurrency=1)
+        assert result.requests == 20  # noqa: PLR2004
+        assert result.errors == 10  # noqa: PLR2004
+        assert result.statuses == {"200": 10, "500": 10}
+        # One request in flight at a time: later ones wait and it shows.
+        assert result.histogram.value_at_percentile(100) > 50_000  # noqa: PLR2004
+        restored = RunResult.from_dict(json.loads(json.dumps(result.to_dict())))
+        assert restored.summary() == result.summary()
+
+    def test_recorded_and_synthetic_requests(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "traffic.jsonl"
+            path.write_text(
+                '{"rules": ["A"], "payload": {"age": 1}, "result": "APPROVED"}\n\n'
+                '{"ruleset": "Onboarding", "payload": {"age": 2}}\n',
+                encoding="utf-8",
+            )
+            assert recorded_requests(path) == [
+                {"rules": ["A"], "payload": {"age": 1}},
+                {"ruleset": "Onboarding", "payload": {"age": 2}},
+            ]
+            path.write_text(
+                '{"rules": ["A"], "ruleset": "Onboarding", "payload": {}}\n',
+                encoding="utf-8",
+            )
+            with self.assertRaisesMessage(ValueError, "Line 1: expected"):
+                recorded_requests(path)
+        rules = [
+            ("A", {"field": "age", "operator": ">", "value": 18}),
+            ("B", {"field": "tier", "operator": "in", "value": ["gold"]}),
+        ]
+        bodies = synthetic_requests(rules, count=5, rules_per_request=2, seed=1)
+        assert bodies == synthetic_requests(rules, count=5, rules_per_request=2, seed=1)
+        assert all(body["payload"]["age"] in (17, 18, 19) for body in bodies)
+        assert all(body["payload"]["tier"] == "gold" for body in bodies)
+
+    def test_compare_command(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, latency in (("a", 1000), ("b", 2000)):
+                result = RunResult(target_rps=10)
+                result.elapsed = 1.0
+                result.record(latency, 200)
+                paths.append(Path(directory) / f"{name}.json")
+                paths[-1].write_text(json.dumps(result.to_dict()), encoding="utf-8")
+            out = StringIO()
+            call_command("loadtest", "compare", *map(str, paths), stdout=out)
+        assert "p99" in out.getvalue()
+        assert "worse" in out.getvalue()
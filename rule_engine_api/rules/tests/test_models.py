@@ -0,0 +1,121 @@
+from django.db import connection
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+
+
+class RuleDerivedFieldsTest(RuleSetupTestCase):
+    def test_derived_fields_maintained_on_save(self) -> None:
+        rule = self.create_rule(
+            "Adult in Thailand",
+            {
+                "AND": [
+                    {"field": "country", "operator": "==", "value": "Thailand"},
+                    {"OR": [ADULT]},
+                ],
+            },
+        )
+        assert rule.fields == ["age", "country"]
+        assert rule.node_count == 3  # noqa: PLR2004
+        assert rule.max_depth == 2  # noqa: PLR2004
+        assert rule.canonical_condition == {
+            "AND": [
+                ADULT,
+                {"field": "country", "operator": "==", "value": "Thailand"},
+            ],
+        }
+
+        rule.condition = {"field": "age", "operator": ">=", "value": 21}
+        rule.save(update_fields=["condition"])
+        rule.refresh_from_db()
+        assert rule.fields == ["age"]
+        assert rule.node_count == 1
+
+    def test_lookup_by_field_and_duplicates(self) -> None:
+        self.create_rule(
+            "Weight 60-80",
+            {
+                "AND": [
+                    {"field": "weight", "operator": ">=", "value": 60},
+                    {"field": "weight", "operator": "<=", "value": 80},
+                ],
+            },
+        )
+        self.create_rule("Pet", {"field": "pet", "operator": "==", "value": "dog"})
+        assert list(
+            Rule.objects.referencing("weight").values_list("name", flat=True),
+        ) == [
+            "Weight 60-80",
+        ]
+        reordered = {
+            "AND": [
+                {"field": "weight", "operator": "<=", "value": 80},
+                {"field": "weight", "operator": ">=", "value": 60},
+            ],
+        }
+        assert Rule.objects.duplicates_of(reordered).get().name == "Weight 60-80"
+
+    def test_evaluates_condition_as_written(self) -> None:
+        # Canonically ``age > 5`` comes first, and raises without an age.
+        rule = self.create_rule(
+            "Zip or age",
+            {
+                "OR": [
+                    {"field": "zip", "operator": "==", "value": 1},
+                    {"field": "age", "operator": ">", "value": 5},
+                ],
+            },
+        )
+        client = self.api(self.client)
+        data = {"rules": ["Zip or age"], "payload": {"zip": 1}}
+        res = client.post(reverse("evaluate"), data=data, format="json")
+        assert res.data["result"] == "APPROVED"
+
+        rule.condition = {"OR": rule.condition["OR"][::-1]}
+        rule.save(update_fields=["condition"])
+        res = client.post(reverse("evaluate"), data=data, format="json")
+        assert res.data["result"] == "REJECTED"
+
+
+class RuleIndexUsageTest(RuleSetupTestCase):
+    """The planner must keep using the indexes declared on ``Rule.Meta``."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        Rule.objects.bulk_create(
+            Rule(
+                name=f"Rule {i}",
+                condition={"field": f"f{i % 7}", "operator": "==", "value": i},
+                fields=[f"f{i % 7}"],
+                is_active=bool(i % 2),
+                created_by=self.admin,
+            )
+            for i in range(200)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE rules_rule")
+            # Tiny test tables would otherwise always be scanned sequentially.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def test_evaluate_lookup_uses_partial_covering_index(self) -> None:
+        plan = (
+            Rule.objects.filter(name__in=["Rule 1", "Rule 3"], is_active=True)
+            .order_by("name")
+            .values_list("name", "updated_at")
+            .explain()
+        )
+        assert "rule_active_name_idx" in plan
+
+    def test_sync_uses_updated_at_index(self) -> None:
+        plan = (
+            Rule.objects.filter(updated_at__gte="2024-01-01T00:00:00Z")
+            .order_by("updated_at", "id")[:100]
+            .explain()
+        )
+        assert "rule_updated_at_id_idx" in plan
+
+    def test_referencing_uses_gin_index(self) -> None:
+        plan = Rule.objects.referencing("f3").explain()
+        assert "rule_fields_gin_idx" in plan
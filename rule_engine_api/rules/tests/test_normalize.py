@@ -0,0 +1,171 @@
+import random
+import typing as typ
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.normalize import is_always_false
+from rule_engine_api.rules.normalize import is_always_true
+from rule_engine_api.rules.normalize import normalize_condition
+from rule_engine_api.rules.rule_engine import compile_condition
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+from rule_engine_api.rules.versioning import get_ruleset_version
+
+
+class NormalizeConditionTest(SimpleTestCase):
+    def test_flattens_and_deduplicates(self) -> None:
+        leaf = {"field": "pet", "operator": "==", "value": "dog"}
+        condition = {"AND": [{"AND": [leaf]}, {"AND": [leaf, {"OR": [leaf]}]}]}
+        assert normalize_condition(condition) == leaf
+
+    def test_merges_ranges_into_interval(self) -> None:
+        condition = {
+            "AND": [
+                {"field": "weight", "operator": ">=", "value": 60},
+                {"field": "pet", "operator": "==", "value": "dog"},
+                {"field": "weight", "operator": ">", "value": 50},
+                {"field": "weight", "operator": "<=", "value": 80},
+                {"field": "weight", "operator": "<", "value": 95},
+            ],
+        }
+        assert normalize_condition(condition) == {
+            "AND": [
+                {"field": "weight", "operator": ">=", "value": 60},
+                {"field": "weight", "operator": "<=", "value": 80},
+                {"field": "pet", "operator": "==", "value": "dog"},
+            ],
+        }
+
+    def test_detects_contradictions_and_tautologies(self) -> None:
+        empty_range = {
+            "AND": [
+                {"field": "age", "operator": ">", "value": 60},
+                {"field": "age", "operator": "<=", "value": 60},
+            ],
+        }
+        assert is_always_false(normalize_condition(empty_range))
+        either = {
+            "OR": [
+                {"field": "pet", "operator": "==", "value": "dog"},
+                {"field": "pet", "operator": "!=", "value": "dog"},
+            ],
+        }
+        assert is_always_true(normalize_condition(either))
+        assert is_always_false(normalize_condition({"AND": [empty_range, either]}))
+
+    def test_keeps_sub_conditions_that_raise(self) -> None:
+        # Without a number, ``age > 60`` raises and fails the rule before
+        # ``pet == "dog"`` is reached: the contradiction keeps a bound.
+        age_over_60 = {"field": "age", "operator": ">", "value": 60}
+        dog = {"field": "pet", "operator": "==", "value": "dog"}
+        empty_range = {
+            "AND": [age_over_60, {"field": "age", "operator": "<", "value": 50}],
+        }
+        assert normalize_condition({"OR": [empty_range, dog]}) == {
+            "OR": [{"AND": [age_over_60, {"OR": []}]}, dog],
+        }
+        # Neither moved across a leaf that may raise.
+        cat = {"field": "pet", "operator": "==", "value": "cat"}
+        assert normalize_condition({"OR": [dog, age_over_60, cat]}) == {
+            "OR": [dog, age_over_60, cat],
+        }
+        score = {"field": "score", "operator": ">", "value": 1}
+        spaced = {
+            "AND": [age_over_60, score, {"field": "age", "operator": "<", "value": 90}],
+        }
+        assert normalize_condition(spaced) == spaced
+
+    def test_outcomes_unchanged(self) -> None:
+        rng = random.Random(7)  # noqa: S311
+
+        def leaf():
+            operator = rng.choice([">", "<=", "==", "!=", "in", "contains", "~"])
+            if operator == "in":
+                value: typ.Any = [rng.choice([1, "x", None])]
+            else:
+                value = rng.choice([1, 2, 3, "x", None])
+            return {"field": rng.choice("ab"), "operator": operator, "value": value}
+
+        def condition(depth=0):
+            if depth > 2 or rng.random() < 0.4:  # noqa: PLR2004
+                return leaf()
+            return {
+                rng.choice(["AND", "OR"]): [
+                    condition(depth + 1) for _ in range(rng.randint(1, 4))
+                ],
+            }
+
+        def outcome(predicate, payload):
+            try:
+                return predicate(payload, None)
+            except Exception:  # noqa: BLE001
+                return False
+
+        payloads = [
+            {},
+            {"a": 1},
+            {"a": 2, "b": "x"},
+            {"a": "x", "b": 3},
+            {"a": None, "b": 1},
+        ]
+        for _ in range(500):
+            original = condition()
+            normalized = compile_condition(normalize_condition(original))
+            original_predicate = compile_condition(original)
+            for payload in payloads:
+                assert outcome(normalized, payload) == outcome(
+                    original_predicate,
+                    payload,
+                ), original
+
+
+class RuleNormalizationTest(RuleSetupTestCase):
+    def test_post_stores_normalized_condition(self) -> None:
+        client = self.api()
+        url = reverse("api:rules-list")
+        payload = {
+            "name": "Weight over 70",
+            "condition": {
+                "AND": [
+                    {"AND": [{"field": "weight", "operator": ">=", "value": 60}]},
+                    {"field": "weight", "operator": ">=", "value": 70},
+                ],
+            },
+            "is_active": True,
+        }
+        res = client.post(url, data=payload, format="json")
+        assert res.status_code == status.HTTP_201_CREATED
+        rule = Rule.objects.get(name="Weight over 70")
+        assert rule.condition == {"field": "weight", "operator": ">=", "value": 70}
+
+    def test_command_rewrites_existing_rows(self) -> None:
+        rule = self.create_rule(
+            "Nested",
+            {"AND": [{"OR": [{"field": "a", "operator": "==", "value": 1}]}]},
+        )
+        updated_at = rule.updated_at
+        version = get_ruleset_version()
+        out = StringIO()
+        call_command("normalize_rules", stdout=out)
+        rule.refresh_from_db()
+        assert rule.condition == {"field": "a", "operator": "==", "value": 1}
+        assert rule.updated_at > updated_at
+        assert get_ruleset_version() == version + 1
+        assert "Normalized 1 rule(s)." in out.getvalue()
+
+    def test_command_backfills_derived_fields(self) -> None:
+        self.create_rule("Adult", {"field": "age", "operator": ">=", "value": 18})
+        Rule.objects.update(canonical_condition={}, condition_hash="", fields=[])
+        out = StringIO()
+        call_command("normalize_rules", stdout=out)
+        rule = Rule.objects.get(name="Adult")
+        assert rule.fields == ["age"]
+        assert rule.condition_hash
+        assert "Normalized 1 rule(s)." in out.getvalue()
+
+        call_command("normalize_rules", stdout=out)
+        assert "Normalized 0 rule(s)." in out.getvalue()
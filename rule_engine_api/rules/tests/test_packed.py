@@ -0,0 +1,141 @@
+import typing as typ
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.footprint import measure
+from rule_engine_api.rules.footprint import synthetic_rules
+from rule_engine_api.rules.packed import PackedRuleSet
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import DECISION_TABLE
+
+
+class PackedRuleSetTest(SimpleTestCase):
+    rules = [
+        ("Adult", ADULT),
+        ("Big", {"field": "amount", "operator": ">", "value": 2**60}),
+        ("Thai", {"field": "applicant.country", "operator": "==", "value": "TH"}),
+        ("Tier", {"field": "tier", "operator": "in", "value": list(range(20))}),
+        (
+            "Channel",
+            {"field": "channel", "operator": "not_in", "value": ["web", {"x": 1}]},
+        ),
+        ("Band", {"field": "age", "operator": "between", "value": [20, 40]}),
+        ("Name", {"field": "name", "operator": "regex", "value": "^a"}),
+        (
+            "Either",
+            {
+                "OR": [
+                    {"field": "age", "operator": "<", "value": 18},
+                    {"field": "vip", "operator": "==", "value": True},
+                ],
+            },
+        ),
+        ("Empty", {"AND": []}),
+        ("Table", DECISION_TABLE),
+        ("Unknown operator", {"field": "age", "operator": "~", "value": 1}),
+        ("Bad path", {"field": "a..b", "operator": "exists", "value": True}),
+        (
+            "Bad group",
+            {"OR": [{"field": "vip", "operator": "==", "value": True}, {"AND": "x"}]},
+        ),
+    ]
+    payloads: list[dict[str, typ.Any]] = [
+        {},
+        {
+            "age": 30,
+            "amount": 2**60 + 1,
+            "applicant": {"country": "TH"},
+            "tier": 7,
+            "channel": "app",
+            "name": "ann",
+        },
+        {
+            "age": 12,
+            "vip": True,
+            "tier": 30,
+            "channel": {"x": 1},
+            "name": 5,
+            "country": "TH",
+            "product": "loan",
+        },
+        {
+            "age": "old",
+            "channel": ["web"],
+            "country": "US",
+            "product": "card",
+            "channel.name": "web",
+        },
+    ]
+
+    def setUp(self) -> None:
+        # Deeper than CLOSURE_MAX_DEPTH, so compiled as a program too.
+        deep = ADULT
+        for depth in range(40):
+            deep = {
+                "AND" if depth % 2 else "OR": [
+                    deep,
+                    {"field": "vip", "operator": "==", "value": depth},
+                ],
+            }
+        self.rules = [*self.rules, ("Deep", deep)]
+
+    def test_outcomes_match_compiled_ruleset(self) -> None:
+        packed = PackedRuleSet(self.rules)
+        compiled = CompiledRuleSet(self.rules)
+        for payload in self.payloads:
+            passed, failed = compiled.evaluate(payload)
+            assert packed.evaluate(payload) == (sorted(passed), sorted(failed)), payload
+
+    def test_evaluate_named_rules(self) -> None:
+        packed = PackedRuleSet(self.rules)
+        assert len(packed) == len(self.rules)
+        assert packed.name(packed.index("Thai")) == "Thai"
+        assert packed.evaluate({"age": 30}, ["Band", "Adult", "Adult"]) == (
+            ["Adult", "Band"],
+            [],
+        )
+        with pytest.raises(KeyError):
+            packed.index("Nope")
+
+    def test_shares_leaves_and_literals(self) -> None:
+        leaf = {"field": "country", "operator": "in", "value": ["TH", "VN"]}
+        packed = PackedRuleSet(
+            [
+                ("A", {"AND": [leaf, {"field": "age", "operator": ">", "value": 18}]}),
+                (
+                    "B",
+                    {
+                        "OR": [
+                            dict(leaf),
+                            {"field": "score", "operator": ">", "value": 18.0},
+                        ],
+                    },
+                ),
+            ],
+        )
+        assert len(packed.leaf_kinds) == 3  # noqa: PLR2004
+        assert list(packed.numbers) == [18.0]
+        assert packed.constants == [("TH", "VN")]
+        assert packed.fields == ["country", "age", "score"]
+
+    def test_footprint(self) -> None:
+        rules = synthetic_rules(200, seed=1)
+        compiled = measure("compiled", rules)
+        packed = measure("packed", rules)
+        assert packed.rules == compiled.rules == 200  # noqa: PLR2004
+        assert 0 < packed.bytes < compiled.bytes
+        out = StringIO()
+        call_command(
+            "memory_footprint",
+            "--synthetic",
+            "20",
+            "--representation",
+            "packed",
+            stdout=out,
+        )
+        assert "packed" in out.getvalue()
+        assert "compiled" not in out.getvalue()
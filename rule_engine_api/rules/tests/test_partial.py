@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from rule_engine_api.rules.models import Decision
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.partial import evaluate_partially
+from rule_engine_api.rules.partial import partially_evaluate
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import RESIDENT
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+from rule_engine_api.rules.versioning import bump_ruleset_version
+
+
+class PartialEvaluationTest(SimpleTestCase):
+    condition = {
+        "AND": [
+            ADULT,
+            {
+                "OR": [
+                    RESIDENT,
+                    {"field": "income", "operator": ">", "value": 1000},
+                ],
+            },
+        ],
+    }
+
+    def test_residual_keeps_only_undecided_leaves(self) -> None:
+        assert partially_evaluate(self.condition, {"age": 20, "country": "US"}) == (
+            None,
+            {"field": "income", "operator": ">", "value": 1000},
+        )
+        assert partially_evaluate(self.condition, {"country": "TH"}) == (
+            None,
+            ADULT,
+        )
+
+    def test_decided_without_every_field(self) -> None:
+        assert partially_evaluate(self.condition, {"age": 10})[0] is False
+        assert (
+            partially_evaluate(self.condition, {"age": 20, "country": "TH"})[0] is True
+        )
+
+    def test_residual_continues_with_more_fields(self) -> None:
+        rules = [
+            ("Adult", self.condition),
+            ("Named", {"field": "name", "operator": "exists"}),
+        ]
+        first = evaluate_partially(rules, {"age": 20, "country": "US"})
+        assert first.passed == [] and first.failed == []  # noqa: PT018
+        assert first.missing_fields == ["income", "name"]
+        second = evaluate_partially(first.residuals.items(), {"income": 5000})
+        assert second.passed == ["Adult"]
+        assert second.missing_fields == ["name"]
+
+    def test_raising_leaf_waits_for_undecided_siblings(self) -> None:
+        condition = {
+            "OR": [
+                {"field": "a", "operator": "==", "value": 1},
+                {"field": "b", "operator": ">", "value": 5},
+            ],
+        }
+        first = evaluate_partially([("r", condition)], {"b": None})
+        assert first.failed == []
+        assert first.residuals == {"r": condition}
+        assert evaluate_partially(
+            first.residuals.items(),
+            {"a": 1, "b": None},
+        ).passed == ["r"]
+        assert evaluate_partially(
+            first.residuals.items(),
+            {"a": 2, "b": None},
+        ).failed == ["r"]
+        # Nothing undecided before it: the rule fails straight away.
+        reordered = {"OR": condition["OR"][::-1]}
+        assert evaluate_partially([("r", reordered)], {"b": None}).failed == ["r"]
+
+
+class PartialEvaluateApiTest(RuleSetupTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.create_rule("Adult", ADULT)
+        self.create_rule("Resident", RESIDENT)
+
+    def post(self, data):
+        return self.api(self.client).post(
+            reverse("evaluate-partial"),
+            data=data,
+            format="json",
+        )
+
+    def test_steps_until_decided(self) -> None:
+        res = self.post(
+            {"rules": ["Adult", "Resident"], "payload": {"age": 30, "noise": 1}},
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["result"] == "PENDING"
+        assert res.data["passed_rules"] == ["Adult"]
+        assert res.data["missing_fields"] == ["country"]
+        assert list(res.data["residuals"]) == ["Resident"]
+
+        res = self.post({"state": res.data["state"], "payload": {"country": "TH"}})
+        assert res.data["result"] == "APPROVED"
+        assert res.data["passed_rules"] == ["Adult", "Resident"]
+        assert res.data["state"] is None
+        assert Decision.objects.get().payload == {"age": 30, "country": "TH"}
+
+    def test_rules_edited_between_steps(self) -> None:
+        res = self.post({"rules": ["Adult", "Resident"], "payload": {"age": 30}})
+        Rule.objects.filter(name="Adult").update(
+            condition={"field": "age", "operator": ">=", "value": 40},
+            updated_at=timezone.now(),
+        )
+        bump_ruleset_version()
+        res = self.post({"state": res.data["state"], "payload": {"country": "TH"}})
+        assert res.data["result"] == "REJECTED"
+        assert res.data["failed_rules"] == ["Adult"]
+
+    def test_complete_decides_absent_fields(self) -> None:
+        res = self.post({"rules": ["Resident"], "payload": {}, "complete": True})
+        assert res.data["result"] == "REJECTED"
+        assert res.data["state"] is None
+
+    def test_unknown_state(self) -> None:
+        assert (
+            self.post({"state": "nope", "payload": {}}).status_code
+            == status.HTTP_404_NOT_FOUND
+        )
+        assert self.post({"payload": {}}).status_code == status.HTTP_400_BAD_REQUEST
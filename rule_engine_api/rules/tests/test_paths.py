@@ -0,0 +1,58 @@
+import typing as typ
+
+import pytest
+from django.test import SimpleTestCase
+
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.paths import MISSING
+from rule_engine_api.rules.paths import make_accessor
+from rule_engine_api.rules.paths import parse_field_path
+from rule_engine_api.rules.rule_engine import evaluate_condition
+
+
+class FieldPathTest(SimpleTestCase):
+    payload: dict[str, typ.Any] = {
+        "applicant": {"address": {"country": "TH"}},
+        "items": [{"price": 10}, {"price": 25}],
+    }
+
+    def test_parse_field_path(self) -> None:
+        assert parse_field_path("age") == ("age",)
+        assert parse_field_path("items[1].price") == ("items", 1, "price")
+        assert parse_field_path("/a~1b/0/c~0") == ("a/b", "0", "c~")
+        for invalid in ("a..b", "a.", ".a", "a[x]", ""):
+            with pytest.raises(ValueError, match="[Ff]ield path"):
+                parse_field_path(invalid)
+
+    def test_accessors_resolve_missing_without_raising(self) -> None:
+        assert make_accessor("applicant.address.country")(self.payload) == "TH"
+        assert make_accessor("/items/1/price")(self.payload) == 25  # noqa: PLR2004
+        assert make_accessor("items[0].price")(self.payload) == 10  # noqa: PLR2004
+        assert make_accessor("items[5].price")(self.payload) is MISSING
+        assert make_accessor("applicant.phone.number")(self.payload) is MISSING
+        assert make_accessor("applicant.address.country.code")(self.payload) is MISSING
+        assert make_accessor("a.b")({"a.b": 1}) == 1
+
+    def test_evaluate_nested_conditions(self) -> None:
+        condition = {
+            "AND": [
+                {"field": "applicant.address.country", "operator": "==", "value": "TH"},
+                {"field": "items[1].price", "operator": ">", "value": 20},
+                {"field": "applicant.tags", "operator": "contains", "value": "vip"},
+            ],
+        }
+        assert not evaluate_condition(condition, self.payload)
+        payload = {
+            **self.payload,
+            "applicant": {**self.payload["applicant"], "tags": ["vip"]},
+        }
+        assert evaluate_condition(condition, payload)
+        compiled = CompiledRuleSet([("nested", condition)])
+        assert compiled.referenced_fields == {
+            "applicant",
+            "items",
+            "applicant.address.country",
+            "items[1].price",
+            "applicant.tags",
+        }
+        assert compiled.evaluate(compiled.project(payload)) == (["nested"], [])
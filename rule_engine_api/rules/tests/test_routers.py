@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from rule_engine_api.rules.api.viewsets import EvaluateRulesView
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.routers import ReplicaRouter
+from rule_engine_api.rules.routers import replica_reads
+from rule_engine_api.rules.versioning import bump_ruleset_version
+
+
+class ReplicaRoutingTest(SimpleTestCase):
+    router = ReplicaRouter()
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    @override_settings(RULES_READ_DATABASE="replica")
+    def test_reads_routed_inside_block_only(self) -> None:
+        with replica_reads():
+            assert self.router.db_for_read(Rule) == "replica"
+            assert self.router.db_for_write(Rule) is None
+        assert self.router.db_for_read(Rule) is None
+        assert self.router.allow_migrate("replica", "rules") is False
+
+    @override_settings(RULES_READ_DATABASE="replica")
+    def test_rule_write_pins_reads_to_primary(self) -> None:
+        bump_ruleset_version()
+        with replica_reads():
+            assert self.router.db_for_read(Rule) is None
+
+    def test_no_replica_configured(self) -> None:
+        with replica_reads():
+            assert self.router.db_for_read(Rule) is None
+
+    def test_evaluate_is_not_atomic(self) -> None:
+        assert "default" in EvaluateRulesView.as_view()._non_atomic_requests  # type: ignore[attr-defined]  # noqa: SLF001
@@ -0,0 +1,374 @@
+import random
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from rule_engine_api.rules import rule_engine
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.rules.normalize import normalize_condition
+from rule_engine_api.rules.rule_engine import compile_condition
+from rule_engine_api.rules.rule_engine import condition_errors
+from rule_engine_api.rules.rule_engine import evaluate_condition
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+from rule_engine_api.rules.tests.base import nested_condition
+from rule_engine_api.users.tests.test_user_roles import UserSetupTestCase
+
+
+class RuleEngineTest(UserSetupTestCase):
+    def test_evaluate_condition_happy_path(self) -> None:
+        condition = {
+            "field": "age",
+            "operator": ">=",
+            "value": 18,
+        }
+        payload = {
+            "age": 21,
+        }
+        # No error raises
+        evaluate_condition(condition, payload)
+
+    def test_evaluate_condition_sad_path(self) -> None:
+        condition = {
+            "field": "age",
+            "operator": ">=",
+            "value": 18,
+        }
+        payload = {
+            "age": 8,
+        }
+        # No error raises
+        res = evaluate_condition(condition, payload)
+        assert not res
+
+    def test_multiple_rules_happy_path(self) -> None:
+        Rule.objects.create(
+            name="Minimum Age Check",
+            condition={
+                "field": "age",
+                "operator": ">=",
+                "value": 18,
+            },
+            created_by=self.admin,
+        )
+        Rule.objects.create(
+            name="Country Check",
+            condition={
+                "field": "country",
+                "operator": "==",
+                "value": "Thailand",
+            },
+            created_by=self.admin,
+        )
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = reverse("evaluate")
+        payload = {
+            "rules": ["Minimum Age Check", "Country Check"],
+            "payload": {
+                "age": 21,
+                "country": "Thailand",
+            },
+        }
+        res = client.post(url, data=payload, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["result"] == "APPROVED"
+        assert len(res.data["passed_rules"]) == 2  # noqa: PLR2004
+        assert len(res.data["failed_rules"]) == 0
+
+    def test_multiple_rules_sad_path(self) -> None:
+        Rule.objects.create(
+            name="Minimum Age Check",
+            condition={
+                "field": "age",
+                "operator": ">=",
+                "value": 18,
+            },
+            created_by=self.admin,
+        )
+        Rule.objects.create(
+            name="Country Check",
+            condition={
+                "field": "country",
+                "operator": "==",
+                "value": "Vietnam",
+            },
+            created_by=self.admin,
+        )
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = reverse("evaluate")
+        payload = {
+            "rules": ["Minimum Age Check", "Country Check"],
+            "payload": {
+                "age": 21,
+                "country": "Thailand",
+            },
+        }
+        res = client.post(url, data=payload, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["result"] == "REJECTED"
+        assert len(res.data["passed_rules"]) == 1
+        assert len(res.data["failed_rules"]) == 1
+
+    def test_multiple_rules_invalid_rule_name_sad_path(self) -> None:
+        """If the error raises at serializer level use DRF exception handler."""
+        Rule.objects.create(
+            name="Minimum Age Check",
+            condition={
+                "field": "age",
+                "operator": ">=",
+                "value": 18,
+            },
+            created_by=self.admin,
+        )
+        Rule.objects.create(
+            name="Country Check",
+            condition={
+                "field": "country",
+                "operator": "==",
+                "value": "Vietnam",
+            },
+            created_by=self.admin,
+        )
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = reverse("evaluate")
+        payload = {
+            "rules": ["Minimum Age Check XXX", "Country Check XXX"],
+            "payload": {
+                "age": 21,
+                "country": "Thailand",
+            },
+        }
+        res = client.post(url, data=payload, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert (
+            str(res.data["rules"][0])
+            == "Invalid rule names: ['Minimum Age Check XXX', 'Country Check XXX']"
+        )
+
+
+class ExtendedOperatorTest(SimpleTestCase):
+    payload = {"country": "TH", "age": 34, "email": "jo@example.com", "nickname": None}
+
+    def _check(self, operator, value, field, expected) -> None:
+        condition = {"field": field, "operator": operator, "value": value}
+        assert evaluate_condition(condition, self.payload) is expected, condition
+
+    def test_operators(self) -> None:
+        self._check("in", ["TH", "VN"], "country", expected=True)
+        self._check("in", ["SG"], "country", expected=False)
+        self._check("not_in", ["SG"], "country", expected=True)
+        self._check("in", [{"a": 1}, "TH"], "country", expected=True)
+        self._check("between", [30, 40], "age", expected=True)
+        self._check("between", [35, 40], "age", expected=False)
+        self._check("startswith", "jo@", "email", expected=True)
+        self._check("endswith", ".org", "email", expected=False)
+        self._check("regex", r"^[a-z]+@example\.com$", "email", expected=True)
+        self._check("regex", r"^\d+$", "age", expected=False)
+        self._check("exists", None, "nickname", expected=True)
+        self._check("exists", None, "phone", expected=False)
+        self._check("exists", value=False, field="phone", expected=True)
+        self._check("is_null", value=True, field="nickname", expected=True)
+        self._check("is_null", value=True, field="phone", expected=True)
+        self._check("is_null", value=False, field="email", expected=True)
+
+    def test_condition_errors(self) -> None:
+        assert condition_errors({"field": "a", "operator": "in", "value": 1})
+        assert condition_errors({"field": "a", "operator": "between", "value": [1]})
+        assert condition_errors({"field": "a", "operator": "regex", "value": "("})
+        assert condition_errors(
+            {"OR": [{"field": "a..b", "operator": "==", "value": 1}]},
+        )
+        assert condition_errors({"field": "a", "operator": "~", "value": 1})
+        assert not condition_errors({"field": "a", "operator": "exists"})
+        assert not condition_errors([{"field": "legacy list"}])
+
+    def test_or_of_equalities_normalizes_to_in(self) -> None:
+        condition = {
+            "OR": [
+                {"field": "pet", "operator": "==", "value": "dog"},
+                {"field": "pet", "operator": "==", "value": "cat"},
+                {"field": "age", "operator": ">", "value": 3},
+            ],
+        }
+        assert normalize_condition(condition) == {
+            "OR": [
+                {"field": "pet", "operator": "in", "value": ["dog", "cat"]},
+                {"field": "age", "operator": ">", "value": 3},
+            ],
+        }
+
+
+class ExtendedOperatorApiTest(RuleSetupTestCase):
+    def test_invalid_operator_rejected_on_save(self) -> None:
+        client = self.api()
+        res = client.post(
+            reverse("api:rules-list"),
+            data={
+                "name": "Bad regex",
+                "condition": {"field": "email", "operator": "regex", "value": "("},
+                "is_active": True,
+            },
+            format="json",
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert "condition" in res.data
+
+
+class EvaluateConditionCacheTest(SimpleTestCase):
+    def test_compiles_each_condition_once(self) -> None:
+        condition = {
+            "OR": [
+                {"field": "cached", "operator": "==", "value": 1},
+                {"field": "cached", "operator": "??"},
+            ],
+        }
+        with mock.patch.object(
+            rule_engine,
+            "compile_condition",
+            wraps=rule_engine.compile_condition,
+        ) as compile_mock:
+            assert evaluate_condition(condition, {"cached": 1})
+            # Same condition, keys in another order.
+            assert evaluate_condition({"OR": condition["OR"]}, {"cached": 1})
+            for _ in range(2):
+                with self.assertRaisesMessage(ValueError, "Unsupported operator"):
+                    evaluate_condition(condition, {"cached": 2})
+            assert compile_mock.call_count == 1
+            # Not JSON: compiled on every call.
+            not_json = {"field": "cached", "operator": "==", "value": {1}}
+            assert not evaluate_condition(not_json, {"cached": 1})
+            assert not evaluate_condition(not_json, {"cached": 1})
+            assert compile_mock.call_count == 3  # noqa: PLR2004
+
+
+class IterativeEvaluatorTest(SimpleTestCase):
+    def test_deep_condition_evaluates_without_recursion(self) -> None:
+        condition = nested_condition(20_000)
+        assert evaluate_condition(condition, {"x": 1})
+        assert not evaluate_condition(condition, {"x": 3})
+
+    def test_program_matches_closures(self) -> None:
+        rng = random.Random(7)  # noqa: S311
+
+        def generate(depth):
+            if depth == 0 or rng.random() < 0.3:  # noqa: PLR2004
+                return {
+                    "field": rng.choice("abc"),
+                    "operator": rng.choice(["==", ">"]),
+                    "value": rng.randint(0, 2),
+                }
+            children = [generate(depth - 1) for _ in range(rng.randint(0, 3))]
+            return {rng.choice(["AND", "OR"]): children}
+
+        for _ in range(300):
+            condition = generate(5)
+            payload = {key: rng.randint(0, 2) for key in "abc"}
+            expected = compile_condition(condition)(payload, None)
+            with mock.patch.object(rule_engine, "CLOSURE_MAX_DEPTH", 0):
+                assert compile_condition(condition)(payload, None) == expected
+
+    def test_program_only_raises_for_reached_leaves(self) -> None:
+        condition = {
+            "OR": [
+                {"field": "x", "operator": "==", "value": 1},
+                {"field": "x", "operator": "??"},
+            ],
+        }
+        with mock.patch.object(rule_engine, "CLOSURE_MAX_DEPTH", 0):
+            predicate = compile_condition(condition)
+        assert predicate({"x": 1}, None)
+        with self.assertRaisesMessage(ValueError, "Unsupported operator"):
+            predicate({"x": 2}, None)
+
+    def test_size_limits(self) -> None:
+        condition = nested_condition(5)
+        assert condition_errors(condition, max_depth=5) == []
+        assert condition_errors(condition, max_depth=4) == [
+            "Condition is nested deeper than 4 levels",
+        ]
+        assert condition_errors(condition, max_nodes=3) == [
+            "Condition has more than 3 nodes",
+        ]
+
+
+class ConditionLimitApiTest(RuleSetupTestCase):
+    @override_settings(RULES_MAX_CONDITION_DEPTH=3)
+    def test_too_deep_condition_rejected_on_save(self) -> None:
+        client = self.api()
+        res = client.post(
+            reverse("api:rules-list"),
+            data={"name": "Deep", "condition": nested_condition(4), "is_active": True},
+            format="json",
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert res.data["condition"] == ["Condition is nested deeper than 3 levels"]
+
+
+class MergedProgramTest(SimpleTestCase):
+    def test_shared_subexpression_computed_once(self) -> None:
+        calls = []
+        shared = {
+            "OR": [
+                {"field": "a", "operator": ">", "value": 1},
+                {"field": "b", "operator": "exists"},
+            ],
+        }
+        rules = [
+            ("One", {"AND": [shared, {"field": "c", "operator": "==", "value": 1}]}),
+            ("Two", {"AND": [{"field": "d", "operator": "exists"}, shared]}),
+            ("Three", shared),
+        ]
+        compiled = CompiledRuleSet(rules)
+        assert compiled.merged is not None
+        original = rule_engine._compile_leaf  # noqa: SLF001
+
+        def counting(field, operator, value):
+            test = original(field, operator, value)
+
+            def leaf(payload, contains_hits):
+                calls.append(field)
+                return test(payload, contains_hits)
+
+            return leaf
+
+        with mock.patch.object(rule_engine, "_compile_leaf", counting):
+            merged = rule_engine.compile_merged(rules)
+        assert merged({"a": 5, "c": 1, "d": 0}, None) == (["One", "Two", "Three"], [])
+        assert calls == ["a", "c", "d"]
+
+    def test_matches_separate_predicates(self) -> None:
+        rng = random.Random(3)  # noqa: S311
+        fields = ["a", "b", "c"]
+        pool = [
+            {"field": field, "operator": ">", "value": value}
+            for field in fields
+            for value in range(3)
+        ]
+
+        def tree(depth):
+            if depth == 0 or rng.random() < 0.3:  # noqa: PLR2004
+                return rng.choice(pool)
+            return {
+                rng.choice(["AND", "OR"]): [
+                    tree(depth - 1) for _ in range(rng.randint(0, 3))
+                ],
+            }
+
+        for _ in range(50):
+            rules = [(f"r{i}", tree(3)) for i in range(8)]
+            compiled = CompiledRuleSet(rules)
+            payload = {
+                field: rng.randint(0, 3)
+                for field in fields
+                if rng.random() < 0.8  # noqa: PLR2004
+            }
+            compiled.merged = None
+            expected = compiled.evaluate(payload)
+            assert rule_engine.compile_merged(rules)(payload, None) == expected
@@ -0,0 +1,146 @@
+import json
+import os
+import signal
+import tempfile
+import typing as typ
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+import pytest
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from rule_engine_api.rules.compiler import CompiledRuleSet
+from rule_engine_api.rules.footprint import synthetic_rules
+from rule_engine_api.rules.packed import PackedRuleSet
+from rule_engine_api.rules.sharding import HashRing
+from rule_engine_api.rules.sharding import ShardedRuleSet
+from rule_engine_api.rules.sharding import partition
+from rule_engine_api.rules.tests.base import DECISION_TABLE
+
+
+class ShardedRuleSetTest(SimpleTestCase):
+    rules = [
+        *synthetic_rules(150, fields=10, seed=2),
+        ("Unknown operator", {"field": "field_1", "operator": "~", "value": 1}),
+        ("Table", DECISION_TABLE),
+    ]
+    payloads: list[dict[str, typ.Any]] = [
+        {},
+        {f"field_{index}": index * 97 % 1000 for index in range(10)},
+        {
+            "field_1": 5,
+            "field_2": "v7",
+            "applicant": {"field_0": "v3", "field_5": 500},
+            "country": "TH",
+        },
+    ]
+
+    def test_ring_only_moves_keys_to_an_added_shard(self) -> None:
+        keys = [f"rule-{index}" for index in range(1000)]
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+        moved = [key for key in keys if before.shard_for(key) != after.shard_for(key)]
+        assert {after.shard_for(key) for key in moved} == {"d"}
+        assert 100 < len(moved) < 400  # noqa: PLR2004
+
+    def test_partition_by_field(self) -> None:
+        ring = HashRing(["a", "b", "c"])
+        rules = [
+            (
+                f"{name}-{index}",
+                {"field": f"{name}.x{index}", "operator": ">", "value": index},
+            )
+            for name in ("age", "income", "country", "score")
+            for index in range(5)
+        ]
+        shards = partition(rules, ring, by="field")
+        assert sum(map(len, shards.values())) == len(rules)
+        for name in ("age", "income", "country", "score"):
+            placed = {
+                shard
+                for shard, members in shards.items()
+                for rule, _ in members
+                if rule.startswith(name)
+            }
+            assert len(placed) == 1
+
+    def test_outcomes_match_compiled_ruleset(self) -> None:
+        compiled = CompiledRuleSet(self.rules)
+        names = [name for name, _ in self.rules[::7]]
+        with ShardedRuleSet(self.rules, shards=3, by="field") as sharded:
+            assert len(sharded) == len(self.rules)
+            for payload in self.payloads:
+                passed, failed = compiled.evaluate(payload)
+                assert sharded.evaluate(payload) == (sorted(passed), sorted(failed))
+                subset = PackedRuleSet(self.rules).evaluate(payload, names)
+                assert sharded.evaluate(payload, names) == subset
+            with pytest.raises(KeyError):
+                sharded.evaluate({}, ["Nope"])
+
+    def test_partial_failures(self) -> None:
+        expected = PackedRuleSet(self.rules).evaluate(self.payloads[1])
+        with ShardedRuleSet(self.rules, shards=2, replicas=2) as sharded:
+            first, second = sharded.groups["shard-0"]
+            first.process.kill()
+            first.process.join()
+            result = sharded.scatter(self.payloads[1])
+            assert (result.passed, result.failed, result.unavailable) == (*expected, [])
+
+            # A shard without live workers: its rules are failed.
+            second.process.kill()
+            second.process.join()
+            result = sharded.scatter(self.payloads[1])
+            assert result.unavailable == sharded.shard_rules["shard-0"]
+            assert set(result.errors) == {"shard-0"}
+            assert (
+                sorted(result.passed + result.failed) == sharded.shard_rules["shard-1"]
+            )
+            passed, failed = sharded.evaluate(self.payloads[1])
+            assert sorted(passed + failed) == sorted(name for name, _ in self.rules)
+            assert set(result.unavailable) <= set(failed)
+
+    @skipUnless(hasattr(signal, "SIGSTOP"), "Needs SIGSTOP")
+    def test_timed_out_shard(self) -> None:
+        with ShardedRuleSet(self.rules, shards=2) as sharded:
+            (worker,) = sharded.groups["shard-1"]
+            os.kill(worker.process.pid, signal.SIGSTOP)
+            try:
+                result = sharded.scatter(self.payloads[0], timeout=0.2)
+            finally:
+                os.kill(worker.process.pid, signal.SIGCONT)
+            assert result.unavailable == sharded.shard_rules["shard-1"]
+            assert result.errors == {"shard-1": "Timed out"}
+            # The late reply is not taken for the next request's.
+            result = sharded.scatter(self.payloads[1])
+            assert (result.passed, result.failed) == PackedRuleSet(self.rules).evaluate(
+                self.payloads[1],
+            )
+            assert not result.unavailable
+
+    def test_command(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "payloads.jsonl"
+            path.write_text(
+                "\n".join(json.dumps(payload) for payload in self.payloads),
+                encoding="utf-8",
+            )
+            out = StringIO()
+            call_command(
+                "evaluate_sharded",
+                str(path),
+                "--synthetic",
+                "50",
+                "--seed",
+                "1",
+                "--check",
+                stdout=out,
+                stderr=StringIO(),
+            )
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(lines) == len(self.payloads)
+        counts = {
+            len(line["passed_rules"]) + len(line["failed_rules"]) for line in lines
+        }
+        assert counts == {50}
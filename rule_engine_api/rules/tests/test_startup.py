@@ -0,0 +1,74 @@
+from django.test import SimpleTestCase
+
+from rule_engine_api.rules.startup import StartupProfile
+from rule_engine_api.rules.startup import parse_importtime
+
+
+class StartupProfileTest(SimpleTestCase):
+    output = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:       300 |        300 |   _io",
+        "startup-phase: setup",
+        "import time:      2000 |       2000 |       django.contrib.postgres.fields",
+        "import time:       100 |        100 |       rule_engine_api.rules.paths",
+        "import time:       500 |       2600 |     rule_engine_api.rules.normalize",
+        "import time:       400 |       3000 |   rule_engine_api.rules.models",
+        "import time:        50 |         50 | json",
+        "startup-phase: first_request",
+        "import time:      9000 |       9000 |   drf_spectacular.utils",
+        "import time:      1000 |      10000 | rule_engine_api.rules.api.viewsets",
+    ]
+
+    def test_parse_importtime(self) -> None:
+        records = {record.module: record for record in parse_importtime(self.output)}
+        assert records["_io"].phase == "interpreter"
+        assert records["_io"].importer is None
+        assert (
+            records["django.contrib.postgres.fields"].importer
+            == "rule_engine_api.rules.normalize"
+        )
+        assert (
+            records["rule_engine_api.rules.paths"].importer
+            == "rule_engine_api.rules.normalize"
+        )
+        assert (
+            records["rule_engine_api.rules.normalize"].importer
+            == "rule_engine_api.rules.models"
+        )
+        assert records["rule_engine_api.rules.models"].phase == "setup"
+        assert records["json"].importer is None
+        assert (
+            records["drf_spectacular.utils"].importer
+            == "rule_engine_api.rules.api.viewsets"
+        )
+        assert records["drf_spectacular.utils"].phase == "first_request"
+
+    def test_report_ranks_imports(self) -> None:
+        profile = StartupProfile("config.wsgi")
+        timings = {
+            "interpreter": 0.01,
+            "setup": 0.5,
+            "import": 0.02,
+            "first_request": 0.1,
+            "process": 0.7,
+        }
+        profile.record(timings, 401, parse_importtime(self.output))
+        profile.record({**timings, "setup": 0.3}, 401, parse_importtime(self.output))
+        assert profile.phase_median("setup") == 0.4  # noqa: PLR2004
+        report = profile.report(top=2)
+        assert "First request status: 401" in report
+        own, caused = report.split("Slowest imports made by project modules")
+        assert own.index("drf_spectacular.utils") < own.index(
+            "django.contrib.postgres.fields",
+        )
+        assert "rule_engine_api.rules.models" not in own
+        # Outside imports only, with the project module that made them.
+        lines = caused.splitlines()[2:]
+        assert lines[0].split()[-2:] == [
+            "drf_spectacular.utils",
+            "rule_engine_api.rules.api.viewsets",
+        ]
+        assert lines[1].split()[-2:] == [
+            "django.contrib.postgres.fields",
+            "rule_engine_api.rules.normalize",
+        ]
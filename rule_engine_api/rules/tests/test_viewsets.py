@@ -1,9 +1,12 @@
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from rule_engine_api.rules.models import Rule
-from rule_engine_api.rules.rule_engine import evaluate_condition
+from rule_engine_api.rules.tests.base import ADULT
+from rule_engine_api.rules.tests.base import RuleSetupTestCase
+from rule_engine_api.users.api.serializers import RoleTokenObtainPairSerializer
 from rule_engine_api.users.tests.test_user_roles import UserSetupTestCase
 
 
@@ -43,7 +46,7 @@ class RuleViewSetTest(UserSetupTestCase):
         url = reverse("api:rules-list")
         res = client.get(url)
         assert res.status_code == status.HTTP_200_OK
-        assert len(res.data) == 0
+        assert len(res.data["results"]) == 0
 
     def test_admin_list_non_empty_list(self) -> None:
         Rule.objects.create(
@@ -61,7 +64,42 @@ class RuleViewSetTest(UserSetupTestCase):
         url = reverse("api:rules-list")
         res = client.get(url)
         assert res.status_code == status.HTTP_200_OK
-        assert len(res.data) == 2  # noqa: PLR2004
+        assert len(res.data["results"]) == 2  # noqa: PLR2004
+
+    def test_admin_list_pages_with_cursor(self) -> None:
+        for i in range(5):
+            Rule.objects.create(name=f"Rule {i}", condition={}, created_by=self.admin)
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = reverse("api:rules-list")
+        names = []
+        pages = 0
+        while url:
+            res = client.get(url, {"page_size": 2} if pages == 0 else None)
+            assert res.status_code == status.HTTP_200_OK
+            names += [row["name"] for row in res.data["results"]]
+            url = res.data["next"]
+            pages += 1
+        assert names == [f"Rule {i}" for i in range(5)]
+        assert pages == 3  # noqa: PLR2004
+
+    def test_admin_list_summary_updated_since(self) -> None:
+        old = Rule.objects.create(name="Old", condition={}, created_by=self.admin)
+        Rule.objects.filter(pk=old.pk).update(updated_at="2020-01-01T00:00:00Z")
+        Rule.objects.create(name="New", condition={}, created_by=self.admin)
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = reverse("api:rules-list")
+        res = client.get(
+            url,
+            {"view": "summary", "updated_since": "2024-01-01T00:00:00"},
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert [row["name"] for row in res.data["results"]] == ["New"]
+        assert "condition" not in res.data["results"][0]
+
+        res = client.get(url, {"updated_since": "yesterday"})
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_admin_get(self) -> None:
         first_rule = Rule.objects.create(
@@ -148,140 +186,6 @@ class RuleViewSetTest(UserSetupTestCase):
         assert res.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-class RuleEngineTest(UserSetupTestCase):
-    def test_evaluate_condition_happy_path(self) -> None:
-        condition = {
-            "field": "age",
-            "operator": ">=",
-            "value": 18,
-        }
-        payload = {
-            "age": 21,
-        }
-        # No error raises
-        evaluate_condition(condition, payload)
-
-    def test_evaluate_condition_sad_path(self) -> None:
-        condition = {
-            "field": "age",
-            "operator": ">=",
-            "value": 18,
-        }
-        payload = {
-            "age": 8,
-        }
-        # No error raises
-        res = evaluate_condition(condition, payload)
-        assert not res
-
-    def test_multiple_rules_happy_path(self) -> None:
-        Rule.objects.create(
-            name="Minimum Age Check",
-            condition={
-                "field": "age",
-                "operator": ">=",
-                "value": 18,
-            },
-            created_by=self.admin,
-        )
-        Rule.objects.create(
-            name="Country Check",
-            condition={
-                "field": "country",
-                "operator": "==",
-                "value": "Thailand",
-            },
-            created_by=self.admin,
-        )
-        client = APIClient()
-        client.force_authenticate(user=self.admin)
-        url = reverse("evaluate")
-        payload = {
-            "rules": ["Minimum Age Check", "Country Check"],
-            "payload": {
-                "age": 21,
-                "country": "Thailand",
-            },
-        }
-        res = client.post(url, data=payload, format="json")
-        assert res.status_code == status.HTTP_200_OK
-        assert res.data["result"] == "APPROVED"
-        assert len(res.data["passed_rules"]) == 2  # noqa: PLR2004
-        assert len(res.data["failed_rules"]) == 0
-
-    def test_multiple_rules_sad_path(self) -> None:
-        Rule.objects.create(
-            name="Minimum Age Check",
-            condition={
-                "field": "age",
-                "operator": ">=",
-                "value": 18,
-            },
-            created_by=self.admin,
-        )
-        Rule.objects.create(
-            name="Country Check",
-            condition={
-                "field": "country",
-                "operator": "==",
-                "value": "Vietnam",
-            },
-            created_by=self.admin,
-        )
-        client = APIClient()
-        client.force_authenticate(user=self.admin)
-        url = reverse("evaluate")
-        payload = {
-            "rules": ["Minimum Age Check", "Country Check"],
-            "payload": {
-                "age": 21,
-                "country": "Thailand",
-            },
-        }
-        res = client.post(url, data=payload, format="json")
-        assert res.status_code == status.HTTP_200_OK
-        assert res.data["result"] == "REJECTED"
-        assert len(res.data["passed_rules"]) == 1
-        assert len(res.data["failed_rules"]) == 1
-
-    def test_multiple_rules_invalid_rule_name_sad_path(self) -> None:
-        """If the error raises at serializer level use DRF exception handler."""
-        Rule.objects.create(
-            name="Minimum Age Check",
-            condition={
-                "field": "age",
-                "operator": ">=",
-                "value": 18,
-            },
-            created_by=self.admin,
-        )
-        Rule.objects.create(
-            name="Country Check",
-            condition={
-                "field": "country",
-                "operator": "==",
-                "value": "Vietnam",
-            },
-            created_by=self.admin,
-        )
-        client = APIClient()
-        client.force_authenticate(user=self.admin)
-        url = reverse("evaluate")
-        payload = {
-            "rules": ["Minimum Age Check XXX", "Country Check XXX"],
-            "payload": {
-                "age": 21,
-                "country": "Thailand",
-            },
-        }
-        res = client.post(url, data=payload, format="json")
-        assert res.status_code == status.HTTP_400_BAD_REQUEST
-        assert (
-            str(res.data["rules"][0])
-            == "Invalid rule names: ['Minimum Age Check XXX', 'Country Check XXX']"
-        )
-
-
 class RuleViewSetClientTest(UserSetupTestCase):
     def test_client_post(self) -> None:
         client = APIClient()
@@ -549,3 +453,27 @@ class RuleViewSetClientTest(UserSetupTestCase):
         assert res.data["result"] == "REJECTED"
         assert res.data["failed_rules"] == ["Apple or Durian"]
         assert res.data["passed_rules"] == []
+
+
+@override_settings(
+    ROOT_URLCONF="config.urls_evaluate",
+    MIDDLEWARE=["django.middleware.security.SecurityMiddleware"],
+    TEMPLATES=[],
+)
+class SlimEvaluateAppTest(RuleSetupTestCase):
+    def test_evaluate_with_bearer_token(self) -> None:
+        self.create_rule("Adult", ADULT)
+        token = RoleTokenObtainPairSerializer.get_token(self.client).access_token
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        res = api.post(
+            reverse("evaluate"),
+            data={"rules": ["Adult"], "payload": {"age": 30}},
+            format="json",
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["result"] == "APPROVED"
+
+    def test_serves_evaluation_only(self) -> None:
+        api = self.api()
+        assert api.get("/api/rules/").status_code == status.HTTP_404_NOT_FOUND
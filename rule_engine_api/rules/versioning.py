@@ -0,0 +1,65 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+
+from rule_engine_api.rules.routers import pin_primary_reads
+
+RULESET_VERSION_KEY = "rules:ruleset-version"
+
+_state = threading.local()
+
+
+def get_ruleset_version() -> int:
+    """
+    Version of the rule table, shared by every process through the cache.
+    Anything derived from rules can be cached under it.
+    """
+    version = cache.get(RULESET_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a flushed cache never revisits old versions.
+        cache.add(RULESET_VERSION_KEY, time.time_ns() // 1000)
+        version = cache.get(RULESET_VERSION_KEY)
+    return version
+
+
+def bump_ruleset_version() -> None:
+    pin_primary_reads()
+    try:
+        cache.incr(RULESET_VERSION_KEY)
+    except ValueError:
+        cache.add(RULESET_VERSION_KEY, time.time_ns() // 1000)
+
+
+def schedule_version_bump() -> None:
+    """
+    Bump the version for a rule write, unless inside ``batched_version_bump``.
+
+    The version is bumped straight away and again once the transaction
+    commits, so a reader that cached pre-commit rows under the first bump
+    does not keep serving them.
+    """
+    if getattr(_state, "depth", 0):
+        return
+    bump_ruleset_version()
+    transaction.on_commit(bump_ruleset_version)
+
+
+@contextmanager
+def batched_version_bump():
+    """
+    Bump the version once for all rule writes made inside the block, even
+    when it raises: writes committed before the error, like the chunks of
+    ``import_rules``, must not stay hidden behind the old version.
+    """
+    depth = getattr(_state, "depth", 0)
+    _state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _state.depth = depth
+        if depth == 0:
+            bump_ruleset_version()
+            transaction.on_commit(bump_ruleset_version)
@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from rule_engine_api.users.authentication import AUTH_TIME_CLAIM
+from rule_engine_api.users.authentication import ROLE_CLAIM
 from rule_engine_api.users.models import User
 
 
@@ -11,3 +14,14 @@ class UserSerializer(serializers.ModelSerializer[User]):
         extra_kwargs = {
             "url": {"view_name": "api:user-detail", "lookup_field": "username"},
         }
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the claims ``StatelessRoleJWTAuthentication`` authorizes from."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[ROLE_CLAIM] = user.user_role
+        token[AUTH_TIME_CLAIM] = int(token.current_time.timestamp())
+        return token
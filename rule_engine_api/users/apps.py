@@ -1,6 +1,7 @@
 import contextlib
 
 from django.apps import AppConfig
+from django.apps import apps
 from django.utils.translation import gettext_lazy as _
 
 
@@ -10,4 +11,8 @@ class UsersConfig(AppConfig):
 
     def ready(self):
         with contextlib.suppress(ImportError):
-            import rule_engine_api.users.signals  # noqa: F401, PLC0415
+            import rule_engine_api.users.signals  # noqa: PLC0415
+        # Registers the OpenAPI extension of the stateless JWT authenticator,
+        # where a schema can be served: evaluation-only processes skip it.
+        if apps.is_installed("drf_spectacular"):
+            import rule_engine_api.users.schema  # noqa: F401, PLC0415
@@ -0,0 +1,107 @@
+import threading
+import time
+import typing as typ
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+# Claims added to every token by ``RoleTokenObtainPairSerializer``. Both are
+# copied from a refresh token into the access tokens it issues.
+ROLE_CLAIM = "user_role"
+# When the credentials were checked, in epoch seconds. Unlike ``iat`` it
+# does not move forward when an access token is refreshed.
+AUTH_TIME_CLAIM = "auth_time"
+
+REVOKED_BEFORE_KEY = "auth:revoked-before:{user_id}"
+
+
+class RoleTokenUser(TokenUser):
+    """A ``TokenUser`` that also carries the role claim."""
+
+    @property
+    def user_role(self) -> str:
+        return self.token[ROLE_CLAIM]
+
+
+class _RevocationCache:
+    """
+    Process-local copy of the per-user revocation marks kept in the shared
+    cache, so most requests do not leave the process to check them.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[typ.Any, tuple[int | None, float]] = {}
+        self._lock = threading.Lock()
+
+    def revoked_before(self, user_id: typ.Any) -> int | None:
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        revoked_before = cache.get(REVOKED_BEFORE_KEY.format(user_id=user_id))
+        with self._lock:
+            self._entries[user_id] = (
+                revoked_before,
+                now + settings.AUTH_REVOCATION_CACHE_TTL,
+            )
+        return revoked_before
+
+    def forget(self, user_id: typ.Any) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+revocations = _RevocationCache()
+
+
+def revoke_user_tokens(user_id: typ.Any) -> None:
+    """
+    Reject the tokens issued to ``user_id`` so far by
+    ``StatelessRoleJWTAuthentication``. Other processes notice within
+    ``AUTH_REVOCATION_CACHE_TTL`` seconds.
+    """
+    cache.set(
+        REVOKED_BEFORE_KEY.format(user_id=user_id),
+        int(time.time()),
+        timeout=int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
+    )
+    revocations.forget(user_id)
+
+
+class StatelessRoleJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds the user from the token claims instead
+    of loading it from the database.
+
+    Tokens carrying the role claim become a ``RoleTokenUser``; they are
+    rejected when credentials were checked no later than the user's last
+    revocation (role change, deactivation, password change). Tokens issued
+    before the claim existed fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token: Token):
+        if ROLE_CLAIM not in validated_token or AUTH_TIME_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user = RoleTokenUser(validated_token)
+        # Second resolution: a token obtained in the same second as the
+        # revocation is rejected too, and the client simply logs in again.
+        revoked_before = revocations.revoked_before(user.id)
+        if (
+            revoked_before is not None
+            and validated_token[AUTH_TIME_CLAIM] <= revoked_before
+        ):
+            raise AuthenticationFailed(
+                _("Token has been revoked"),
+                code="token_revoked",
+            )
+        return user
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.11 on 2026-10-19 15:40
+
+from django.db import migrations
+
+import rule_engine_api.users.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_user_role"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", rule_engine_api.users.models.UserManager()),
+            ],
+        ),
+    ]
@@ -1,8 +1,54 @@
+import typing as typ
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as DjangoUserManager
+from django.db import models
 from django.db.models import CharField
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
-from django.db import models
+
+# Changing any of these invalidates the claims of tokens already issued.
+TOKEN_FIELDS = ("user_role", "is_active", "password")
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Revoke the tokens of the updated users when a token field changes,
+        which the ``pre_save`` signal does not see on bulk updates.
+        """
+        if not any(field in kwargs for field in TOKEN_FIELDS):
+            return super().update(**kwargs)
+        from rule_engine_api.users.authentication import (  # noqa: PLC0415
+            revoke_user_tokens,
+        )
+
+        user_ids = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        for user_id in user_ids:
+            revoke_user_tokens(user_id)
+        return rows
+
+    update.alters_data = True  # type: ignore[attr-defined]
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        if any(field in fields for field in TOKEN_FIELDS):
+            from rule_engine_api.users.authentication import (  # noqa: PLC0415
+                revoke_user_tokens,
+            )
+
+            for obj in objs:
+                revoke_user_tokens(obj.pk)
+        return rows
+
+    bulk_update.alters_data = True  # type: ignore[attr-defined]
+
+
+class UserManager(DjangoUserManager):
+    def get_queryset(self) -> UserQuerySet:
+        return UserQuerySet(self.model, using=self._db)
 
 
 class User(AbstractUser):
@@ -11,6 +57,7 @@ class User(AbstractUser):
     If adding fields that need to be filled at user signup,
     check forms.SignupForm and forms.SocialSignupForms accordingly.
     """
+
     class RoleChoice(models.TextChoices):
         ADMIN = "ADMIN", _("Admin")
         CLIENT = "CLIENT", _("Client")
@@ -21,6 +68,8 @@ class User(AbstractUser):
     last_name = None  # type: ignore[assignment]
     user_role = CharField(max_length=10, choices=RoleChoice, default=RoleChoice.CLIENT)
 
+    objects: typ.ClassVar[UserManager] = UserManager()
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
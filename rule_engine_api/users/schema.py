@@ -0,0 +1,8 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessRoleJWTScheme(SimpleJWTScheme):
+    """Documents ``StatelessRoleJWTAuthentication`` as the usual bearer JWT."""
+
+    target_class = "rule_engine_api.users.authentication.StatelessRoleJWTAuthentication"
+    name = "jwtRoleAuth"
@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from rule_engine_api.users.authentication import revoke_user_tokens
+from rule_engine_api.users.models import TOKEN_FIELDS
+from rule_engine_api.users.models import User
+
+
+@receiver(pre_save, sender=User)
+def revoke_tokens_on_change(
+    sender,
+    instance,
+    raw=False,  # noqa: FBT002
+    update_fields=None,
+    **kwargs,
+):
+    if raw or instance.pk is None:
+        return
+    fields = (
+        TOKEN_FIELDS
+        if update_fields is None
+        else [f for f in TOKEN_FIELDS if f in update_fields]
+    )
+    if not fields:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if previous is None:
+        return
+    if any(previous[field] != getattr(instance, field) for field in fields):
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    # Stateless tokens do not look the user up, so would outlive it.
+    revoke_user_tokens(instance.pk)
@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from rule_engine_api.rules.models import Rule
+from rule_engine_api.users.api.serializers import RoleTokenObtainPairSerializer
+from rule_engine_api.users.authentication import AUTH_TIME_CLAIM
+from rule_engine_api.users.authentication import ROLE_CLAIM
+from rule_engine_api.users.authentication import revocations
+from rule_engine_api.users.models import User
+from rule_engine_api.users.tests.test_user_roles import UserSetupTestCase
+
+
+class StatelessRoleJWTAuthenticationTest(UserSetupTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        revocations.clear()
+        Rule.objects.create(
+            name="Adult",
+            condition={"field": "age", "operator": ">=", "value": 18},
+            created_by=self.admin,
+        )
+
+    def token(self, user, auth_time=None) -> str:
+        refresh = RoleTokenObtainPairSerializer.get_token(user)
+        if auth_time is not None:
+            refresh[AUTH_TIME_CLAIM] = auth_time
+        return str(refresh.access_token)
+
+    def evaluate(self, token: str):
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return api.post(
+            reverse("evaluate"),
+            data={"rules": ["Adult"], "payload": {"age": 20}},
+            format="json",
+        )
+
+    def test_token_carries_role(self) -> None:
+        token = RoleTokenObtainPairSerializer.get_token(self.client)
+        assert token[ROLE_CLAIM] == "CLIENT"
+        assert token.access_token[AUTH_TIME_CLAIM] == token[AUTH_TIME_CLAIM]
+
+    def test_evaluate_makes_no_user_query(self) -> None:
+        token = self.token(self.client)
+        self.evaluate(token)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.evaluate(token)
+        assert res.status_code == status.HTTP_200_OK
+        assert not [q for q in ctx.captured_queries if "users_user" in q["sql"]]
+
+    def test_role_change_revokes_tokens(self) -> None:
+        token = self.token(self.client, auth_time=0)
+        assert self.evaluate(token).status_code == status.HTTP_200_OK
+        self.client.user_role = "OTHER"
+        self.client.save()
+        res = self.evaluate(token)
+        assert res.status_code == status.HTTP_401_UNAUTHORIZED
+        assert res.data["detail"].code == "token_revoked"
+
+    def test_deleting_user_revokes_tokens(self) -> None:
+        token = self.token(self.client, auth_time=0)
+        User.objects.filter(username="Jones").delete()
+        assert self.evaluate(token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_bulk_deactivation_revokes_tokens(self) -> None:
+        token = self.token(self.client, auth_time=0)
+        admin = User.objects.get(username="David")
+        User.objects.filter(username="Jones").update(is_active=False)
+        assert revocations.revoked_before(admin.pk) is None
+        assert self.evaluate(token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_unrelated_change_keeps_tokens(self) -> None:
+        token = self.token(self.client, auth_time=0)
+        self.client.name = "Jones Jr."
+        self.client.save()
+        assert self.evaluate(token).status_code == status.HTTP_200_OK
+
+    def test_token_without_role_claim_falls_back_to_database(self) -> None:
+        token = str(RefreshToken.for_user(self.client).access_token)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.evaluate(token)
+        assert res.status_code == status.HTTP_200_OK
+        assert [q for q in ctx.captured_queries if "users_user" in q["sql"]]